@@ -1,16 +1,23 @@
 import streamlit as st
-import random
 import time
-import requests
+RUN_STARTED = time.perf_counter()  # 本次 rerun 的起点 (服务端耗时预算见文末)
 import datetime
-import json
+import hmac
 import os
-import io
-from PIL import Image, ImageDraw, ImageFont
+from planner import NORMALIZER, NutritionPlanner, WeeklyPlanner, build_index, drop_index, empty_menu, history_names, planner_for
+from planner.nutrition import NUTRIENT_NAMES, goal_fields, nutrient_matrix, nutrition_report
+from planner.pantry import FridgeQuery, pantry_postings
+from planner.recommend import feature_matrix
+from ocr import OcrWorker
+from push import PushDispatcher, PushJob, PushPlusSender, PushService, build_message
+from render import card_banner, card_menu, dish_label, font_health, ingredient_pills, menu_card_png
+from render.export import cards_pdf, week_jobs
+from storage import HistoryStore, ProfileStore, apply_ops
+import telemetry
 
 # 🌟 导入数据
 try:
-    from recipe_data import RECIPES_DB, FRIDGE_CATEGORIES
+    from recipe_data import LIVE, FRIDGE_CATEGORIES
 except ImportError:
     st.error("❌ 找不到 recipe_data.py！")
     st.stop()
@@ -27,53 +34,78 @@ st.set_page_config(
 
 # 📂 文件路径
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-HISTORY_FILE = os.path.join(BASE_DIR, "menu_history.json")
-USER_DATA_FILE = os.path.join(BASE_DIR, "user_data.json")
-FONT_FILE = os.path.join(BASE_DIR, "SimHei.ttf")
+HISTORY_FILE = os.path.join(BASE_DIR, "menu_history.jsonl")
+LEGACY_HISTORY_FILE = os.path.join(BASE_DIR, "menu_history.json")
+USER_DATA_FILE = os.path.join(BASE_DIR, "user_data.json")  # 旧版单用户档案，首次启动时导入
+PROFILE_DB = os.path.join(BASE_DIR, "profiles.db")
+RECENT_HISTORY = 30  # 口味模型参考最近多少条收藏
+PANTRY_TOP_K = 8     # "冰箱能做什么"列出几道
+RERUN_BUDGET_MS = float(os.environ.get("UUKITCHEN_RERUN_BUDGET_MS", "150"))  # 整页 rerun 的服务端耗时预算
+TELEMETRY_DIR = os.environ.get("UUKITCHEN_TELEMETRY_DIR")  # 设置后每次 rerun 导出 metrics.prom / reruns.jsonl / 慢 rerun 的 .folded
+DEBUG_KEY = os.environ.get("UUKITCHEN_DEBUG_KEY")  # 管理员口令；不设置则 ?debug 不生效
+
+def debug_mode():
+    """?debug=1&key=口令 为本会话打开埋点与性能面板，?debug=profile 再加采样剖析；只影响本会话的 rerun"""
+    key = st.query_params.get("key", "")
+    if not DEBUG_KEY or not hmac.compare_digest(key.encode(), DEBUG_KEY.encode()): return None
+    return st.query_params.get("debug")
+
+DEBUG = debug_mode()
+
+@st.cache_resource
+def get_profiler():
+    return telemetry.SamplingProfiler(interval=0.005, keep=5)
+
+telemetry.begin_rerun(RUN_STARTED, get_profiler() if DEBUG == "profile" or os.environ.get("UUKITCHEN_PROFILE") else None, scoped=bool(DEBUG))
 
 # ==========================================
 # 2. 核心资源引擎
 # ==========================================
 @st.cache_resource
-def load_custom_font():
-    if not os.path.exists(FONT_FILE):
-        url = "https://github.com/StellarCN/scp_zh/raw/master/fonts/SimHei.ttf"
-        try:
-            r = requests.get(url, timeout=30)
-            with open(FONT_FILE, "wb") as f: f.write(r.content)
-        except: return ImageFont.load_default()
-    return FONT_FILE
-
-def get_pil_font(size):
-    try: return ImageFont.truetype(load_custom_font(), size)
-    except: return ImageFont.load_default()
+def init_fonts():
+    """每个进程启动时解析并预热字体 (纯本地)，顺带量一下首张卡片的渲染耗时"""
+    return font_health()
+
+DEFAULT_PROFILE = {
+    "nickname": "Bingo", "age": "2岁", "height": "90", "weight": "13",
+    "nutrition_goals": ["补钙"], "allergens": ["牛奶", "牛肉"], 
+    "fridge_items": ["鸡蛋", "西红柿", "土豆"], 
+    "pushplus_token": "", "dislikes": [], "likes": []
+}
+
+@st.cache_resource
+def get_profile_store():
+    return ProfileStore(PROFILE_DB, defaults=DEFAULT_PROFILE, legacy_path=USER_DATA_FILE)
+
+def current_user():
+    return st.query_params.get("uid", "default")
 
 def load_user_data():
-    default = {
-        "nickname": "Bingo", "age": "2岁", "height": "90", "weight": "13",
-        "nutrition_goals": ["补钙"], "allergens": ["牛奶", "牛肉"], 
-        "fridge_items": ["鸡蛋", "西红柿", "土豆"], 
-        "pushplus_token": "", "dislikes": [], "likes": []
-    }
-    if os.path.exists(USER_DATA_FILE):
-        try:
-            with open(USER_DATA_FILE, "r", encoding="utf-8") as f:
-                saved = json.load(f); default.update(saved)
-        except: pass
-    return default
-
-def save_user_data():
-    with open(USER_DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(st.session_state.user_data, f, ensure_ascii=False, indent=2)
-
-def load_history():
-    if os.path.exists(HISTORY_FILE):
-        try: with open(HISTORY_FILE, "r", encoding="utf-8") as f: return json.load(f)
-        except: return []
-    return []
+    return get_profile_store().load(current_user())[0]
+
+def save_user_data(*fields):
+    """把 user_data 的指定字段 (默认全部) 排队写入档案库"""
+    u = st.session_state.user_data
+    with telemetry.span("app.save_user_data"): get_profile_store().queue(current_user(), *[("set", k, u[k]) for k in (fields or u)])
+
+def update_user_data(*ops):
+    """局部修改：先改本会话，再排队写库 (库里基于最新数据重放，不覆盖其他窗口的修改)"""
+    apply_ops(st.session_state.user_data, ops)
+    get_profile_store().queue(current_user(), *ops)
+
+@st.cache_resource
+def get_history_store():
+    return HistoryStore(HISTORY_FILE, legacy_path=LEGACY_HISTORY_FILE)
+
+def load_history(n=5):
+    try: return get_history_store().latest(n)
+    except OSError: return []
+
+def load_history_names(n=RECENT_HISTORY):
+    """最近收藏过的菜名 (旧 -> 新)，给口味模型当作弱正反馈"""
+    return history_names(load_history(n))
 
 def save_history_item(menu_state):
-    history = load_history()
     item = {
         "date": datetime.datetime.now().strftime("%Y-%m-%d"),
         "menu": {
@@ -83,25 +115,25 @@ def save_history_item(menu_state):
             "fruit": menu_state['fruit']
         }
     }
-    history.insert(0, item)
-    with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-        json.dump(history, f, ensure_ascii=False, indent=2)
+    get_history_store().append(item)
     st.toast("已收藏到历史", icon="✅")
 
 if 'user_data' not in st.session_state: st.session_state.user_data = load_user_data()
 if 'menu_state' not in st.session_state:
-    st.session_state.menu_state = {
-        "breakfast": None, "lunch_meat": None, "lunch_veg": None, "lunch_soup": None,
-        "dinner_meat": None, "dinner_veg": None, "dinner_soup": None, "fruit": None,
-        "shopping_list": []
-    }
+    st.session_state.menu_state = empty_menu()
 if 'view_mode' not in st.session_state: st.session_state.view_mode = "dashboard"
 if 'focus_dish' not in st.session_state: st.session_state.focus_dish = None
+if 'week_plan' not in st.session_state: st.session_state.week_plan = None
+if 'week_pdf' not in st.session_state: st.session_state.week_pdf = None  # (昵称, PDF 字节)，生成新周计划时清空
+if 'shopping' not in st.session_state: st.session_state.shopping = None
+if 'pantry' not in st.session_state: st.session_state.pantry = None
+if 'ocr_merged' not in st.session_state: st.session_state.ocr_merged = {}  # 照片哈希 -> 识别出的食材 (已并入冰箱)
+if 'push_future' not in st.session_state: st.session_state.push_future = None
 
 # ==========================================
 # 3. 像素级 CSS 锁定 (Mobile Lock-in)
 # ==========================================
-st.markdown("""
+with telemetry.span("app.css"): st.markdown("""
 <style>
     /* 1. 强制页面不出现横向滚动条 */
     .stApp { background-color: #F2F2F7; overflow-x: hidden; }
@@ -165,16 +197,6 @@ st.markdown("""
         line-height: 2.2; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; padding-left: 5px;
     }
     
-    /* 迷你按钮 */
-    .mini-icon-btn button {
-        background: transparent !important; border: none !important;
-        font-size: 20px !important; width: 32px !important; height: 32px !important; 
-        padding: 0 !important; margin: 0 auto !important;
-        box-shadow: none !important; color: #8E8E93 !important;
-    }
-    .btn-red button { color: #FF3B30 !important; transform: scale(1.1); }
-    .btn-blue button { color: #007AFF !important; font-weight: bold !important; }
-
     /* 食材条 */
     .ing-scroll { 
         display: flex; overflow-x: auto; gap: 6px; padding: 5px 15px 15px 15px; 
@@ -194,135 +216,110 @@ st.markdown("""
 # 4. 业务逻辑
 # ==========================================
 
-SYNONYM_MAP = {"番茄": "西红柿", "洋柿子": "西红柿", "洋芋": "土豆", "马铃薯": "土豆", "大虾": "虾仁", "基围虾": "虾仁", "花菜": "西兰花", "圆白菜": "青菜", "白菜": "青菜", "娃娃菜": "青菜", "牛腩": "牛肉", "肥牛": "牛肉", "肉末": "猪肉", "里脊": "猪肉", "排骨": "猪肉", "鸡腿": "鸡肉", "鸡翅": "鸡肉", "龙利鱼": "鱼", "巴沙鱼": "鱼", "鳕鱼": "鱼"}
-RED_MEAT = ["牛肉", "猪肉", "排骨", "羊肉", "猪肝"]
-
-def normalize_ingredient(name):
-    return SYNONYM_MAP.get(name.strip(), name.strip())
-
-def mock_ocr_process(img):
-    time.sleep(0.8)
-    return ["西红柿", "基围虾", "娃娃菜"]
+@st.cache_resource
+def get_ocr():
+    """每个进程一个后台识别线程池 + 按照片哈希的结果缓存"""
+    return OcrWorker()
+
+def merge_ocr_result(key):
+    """识别完成后把结果并入冰箱 (每张照片只并一次)；还在识别返回 False"""
+    res = get_ocr().poll(key)
+    if res is None: return False
+    st.session_state.ocr_merged[key] = res['items']
+    if res['items']:
+        update_user_data(*[("add", "fridge_items", x) for x in res['items']]); update_shopping_list()
+    return True
+
+def ocr_status(key):
+    if merge_ocr_result(key): st.rerun()
+    st.caption("🔍 正在识别照片…")
+if hasattr(st, "fragment"): ocr_status = st.fragment(run_every=1)(ocr_status)  # 只重跑这一小块来轮询，页面不阻塞
 
 def toggle_feedback(dish_name, action):
-    likes = st.session_state.user_data['likes']
-    dislikes = st.session_state.user_data['dislikes']
-    if action == 'like':
-        if dish_name in likes: likes.remove(dish_name)
-        else: 
-            if dish_name not in likes: likes.append(dish_name)
-            if dish_name in dislikes: dislikes.remove(dish_name)
-    elif action == 'dislike':
-        if dish_name in dislikes: dislikes.remove(dish_name)
-        else:
-            if dish_name not in dislikes: dislikes.append(dish_name)
-            if dish_name in likes: likes.remove(dish_name)
-    save_user_data()
+    u = st.session_state.user_data
+    on, off = ('likes', 'dislikes') if action == 'like' else ('dislikes', 'likes')
+    if dish_name in u[on]: update_user_data(("remove", on, dish_name))
+    else: update_user_data(("add", on, dish_name), ("remove", off, dish_name))
 
 def restock_from_shopping_list():
     needed = st.session_state.menu_state['shopping_list']
     if needed:
-        cur = set(st.session_state.user_data['fridge_items'])
-        cur.update(needed)
-        st.session_state.user_data['fridge_items'] = list(cur)
-        save_user_data()
+        update_user_data(*[("add", "fridge_items", x) for x in needed])
         update_shopping_list()
         st.success("已入库！")
         time.sleep(0.5)
         st.rerun()
 
-def get_random_dish(pool, fridge, allergens, exclude_names=[], prefer_type=None):
-    safe = []
-    norm_fridge = set([normalize_ingredient(i) for i in fridge] + fridge)
-    for d in pool:
-        if d['name'] in exclude_names: continue
-        is_safe = True
-        for ing in d['ingredients']:
-            if any(alg in ing for alg in allergens):
-                is_safe = False
-                break
-        if not is_safe: continue
-        if prefer_type == "white_meat":
-            if any(ing in RED_MEAT for ing in d['ingredients']): continue
-            
-        miss = sum(1 for ing in d['ingredients'] if normalize_ingredient(ing) not in norm_fridge)
-        dc = d.copy(); dc['missing_count'] = miss
-        safe.append(dc)
-    
-    if not safe: return None
-    tier0 = [d for d in safe if d['missing_count'] == 0]
-    final = tier0 if tier0 else safe # 只推荐全匹配的，除非没有
-    
-    likes = st.session_state.user_data['likes']
-    dislikes = st.session_state.user_data['dislikes']
-    weighted = []
-    for d in final:
-        score = 10
-        if d.get('missing_count') == 0: score += 50
-        if d['name'] in likes: score += 100
-        if d['name'] in dislikes: score = 1
-        weighted.extend([d] * score)
-    return random.choice(weighted) if weighted else None
+# ---- Streamlit 适配层：规划逻辑在 planner 包里，这里只负责读写 session_state ----
+@st.cache_resource
+def get_live_catalog():
+    """每个进程一份：后台轮询菜谱文件，新版本的索引建好后再切换，旧版本的索引/抽样器随即丢弃"""
+    LIVE.prepare.append(lambda snap: build_index(snap.db))
+    LIVE.prepare.append(lambda snap: (feature_matrix(build_index(snap.db)), nutrient_matrix(build_index(snap.db)),
+                                      pantry_postings(build_index(snap.db))))  # 口味/营养矩阵、冰箱查询的倒排也在切换前建好
+    LIVE.on_retire.append(lambda snap: drop_index(snap.db))
+    LIVE.watch()
+    return LIVE
+
+def get_planner():
+    """有营养目标时按目标配餐，否则按口味随机"""
+    db = get_live_catalog().db  # 当前版本；会话里旧版本的菜照常可用
+    return planner_for(db, st.session_state.user_data, index=build_index(db), history=load_history_names())
+
+def get_pantry():
+    """本会话的"冰箱能做什么"查询；菜谱库换了版本才重建，平时勾选冰箱只做增量更新"""
+    index = build_index(get_live_catalog().db)
+    q = st.session_state.get('pantry')
+    if q is None or q.index is not index: q = st.session_state.pantry = FridgeQuery(index)
+    return q
+
+def get_shopping():
+    """本会话的增量缺货清单 (ShoppingList)；没有时按当前菜单建一份"""
+    if st.session_state.get('shopping') is None:
+        st.session_state.shopping = get_planner().new_shopping(st.session_state.menu_state)
+    return st.session_state.shopping
 
 def generate_full_menu():
-    fridge = st.session_state.user_data['fridge_items']; allergies = st.session_state.user_data['allergens']; ms = st.session_state.menu_state
-    ms['breakfast'] = get_random_dish(RECIPES_DB['breakfast'], fridge, allergies)
-    ms['lunch_meat'] = get_random_dish(RECIPES_DB['lunch_meat'], fridge, allergies)
-    ms['lunch_veg'] = get_random_dish(RECIPES_DB['lunch_veg'], fridge, allergies)
-    ms['lunch_soup'] = get_random_dish(RECIPES_DB['soup'], fridge, allergies)
-    
-    lunch_ings = ms['lunch_meat']['ingredients'] if ms['lunch_meat'] else []
-    is_red = any(normalize_ingredient(i) in RED_MEAT for i in lunch_ings)
-    pool_dm = RECIPES_DB.get('dinner_meat', []) or RECIPES_DB['lunch_meat']
-    pool_dv = RECIPES_DB.get('dinner_veg', []) or RECIPES_DB['lunch_veg']
-    pref = "white_meat" if is_red else None
-    
-    ms['dinner_meat'] = get_random_dish(pool_dm, fridge, allergies, [ms['lunch_meat']['name']], pref) or get_random_dish(pool_dm, fridge, allergies, [ms['lunch_meat']['name']])
-    ms['dinner_veg'] = get_random_dish(pool_dv, fridge, allergies)
-    ms['dinner_soup'] = get_random_dish(RECIPES_DB['soup'], fridge, allergies, [ms['lunch_soup']['name']])
-    ms['fruit'] = random.choice(RECIPES_DB['fruit'])
-    update_shopping_list(); st.session_state.view_mode = "dashboard"
+    planner = get_planner(); ms = planner.generate_menu()
+    st.session_state.menu_state = ms; st.session_state.shopping = planner.new_shopping(ms)
+    st.session_state.view_mode = "dashboard"
 
 def update_shopping_list():
-    norm_fridge = set([normalize_ingredient(i) for i in st.session_state.user_data['fridge_items']])
-    needed = set()
-    ms = st.session_state.menu_state
-    for k, d in ms.items():
-        if isinstance(d, dict):
-            for ing in d.get('ingredients', []):
-                if normalize_ingredient(ing) not in norm_fridge: needed.add(ing)
-    st.session_state.menu_state['shopping_list'] = list(needed)
+    """冰箱变动后只翻转受影响的食材"""
+    sl = get_shopping(); sl.set_fridge(st.session_state.user_data['fridge_items'])
+    st.session_state.menu_state['shopping_list'] = sl.items()
 
 def swap_dish(key, pool_key):
-    fridge = st.session_state.user_data['fridge_items']; allergies = st.session_state.user_data['allergens']
-    curr = st.session_state.menu_state[key]; exclude = [curr['name']] if curr else []
-    pool = RECIPES_DB.get(pool_key, [])
-    if 'meat' in pool_key and not pool: pool = RECIPES_DB['lunch_meat']
-    if 'veg' in pool_key and not pool: pool = RECIPES_DB['lunch_veg']
-    new_d = get_random_dish(pool, fridge, allergies, exclude)
-    if new_d: st.session_state.menu_state[key] = new_d; update_shopping_list()
-
-def create_menu_card_image(menu, nickname):
-    width, height = 800, 1200
-    img = Image.new('RGB', (width, height), color='#FFFDF5')
-    draw = ImageDraw.Draw(img)
-    title_font = get_pil_font(60); header_font = get_pil_font(40); text_font = get_pil_font(30); small_font = get_pil_font(24)
-    draw.rectangle([30, 30, 770, 1170], outline="#FF9500", width=5)
-    draw.text((400, 120), f"{nickname} 的今日食谱", font=title_font, fill='#FF9500', anchor="mm")
-    y = 260
-    def add_sec(title, dishes):
-        nonlocal y
-        draw.text((400, y), f"• {title} •", font=header_font, fill='#333', anchor="mm"); y += 75
-        for d in dishes: draw.text((400, y), d, font=text_font, fill='#555', anchor="mm"); y += 55
-        y += 40
-    add_sec("早餐", [menu['breakfast']['name'], "🥛 热牛奶"])
-    add_sec("午餐", [menu['lunch_meat']['name'], menu['lunch_veg']['name'], menu['lunch_soup']['name']])
-    add_sec("晚餐", [menu['dinner_meat']['name'], menu['dinner_veg']['name'], menu['dinner_soup']['name']])
-    add_sec("今日水果", [menu['fruit']])
-    buf = io.BytesIO(); img.save(buf, format="PNG"); return buf.getvalue()
-
-def send_to_wechat(): st.toast("✅ 已推送到微信")
-def generate_weekly(): st.toast("✅ 周计划已生成")
+    get_planner().swap(st.session_state.menu_state, key, pool_key, shopping=get_shopping())
+
+@st.cache_resource
+def get_push_service():
+    """每个进程一个推送队列 (后台事件循环 + 共享连接池)"""
+    return PushService(PushDispatcher(PushPlusSender(pool_size=4), concurrency=4))
+
+def send_to_wechat():
+    u = st.session_state.user_data
+    if not u.get('pushplus_token'): st.toast("⚠️ 请先在档案里填写 PushPlus Token"); return
+    msg = build_message(st.session_state.menu_state, u['nickname'])
+    st.session_state.push_future = get_push_service().submit(PushJob(current_user(), u['pushplus_token'], msg))
+    st.toast("📤 已加入发送队列")
+
+def report_push_result():
+    """上一次推送有结果了就提示一次"""
+    fut = st.session_state.push_future
+    if fut is None or not fut.done(): return
+    st.session_state.push_future = None
+    res = fut.result()
+    st.toast("✅ 已推送到微信" if res.ok else f"❌ 推送失败：{res.error}")
+def generate_weekly():
+    db = get_live_catalog().db; u = st.session_state.user_data
+    if u.get('nutrition_goals'): plan = NutritionPlanner(db, u, index=build_index(db), history=load_history_names()).plan_week()
+    else: plan = WeeklyPlanner(db, u, index=build_index(db), history=load_history_names()).plan_week()
+    st.session_state.week_plan = plan; st.session_state.week_pdf = None
+    st.toast("✅ 周计划已生成")
+def make_week_pdf():  # 点了才渲染，生成周计划的那次重跑不用等 7 张卡片
+    nick = st.session_state.user_data['nickname']
+    st.session_state.week_pdf = (nick, cards_pdf(week_jobs(st.session_state.week_plan, nick)))
 def enter_cook_mode(dish): st.session_state.focus_dish = dish; st.session_state.view_mode = "cook"
 def exit_cook_mode(): st.session_state.view_mode = "dashboard"
 
@@ -332,6 +329,8 @@ def exit_cook_mode(): st.session_state.view_mode = "dashboard"
 
 # 侧边栏
 with st.sidebar:
+    if not init_fonts()['cjk']: st.warning("⚠️ 未找到中文字体，菜单图片无法显示中文。请运行 `python -m render --download` 或设置 UUKITCHEN_FONT")
+    if get_live_catalog().error: st.warning(f"⚠️ 菜谱更新失败，仍在使用 v{LIVE.version}：{LIVE.error}")
     st.image("https://upload.wikimedia.org/wikipedia/en/1/17/Bluey_Heeler.png", width=100) # 使用稳定公网图片
     with st.expander("📝 档案与过敏原", expanded=True):
         u = st.session_state.user_data
@@ -351,15 +350,19 @@ with st.sidebar:
             final = sel_al
             if cust_al: final.extend([x.strip() for x in cust_al.split(',') if x.strip()])
             st.session_state.user_data['allergens'] = list(set(final))
-            save_user_data()
+            save_user_data('nickname', 'height', 'weight', 'allergens', 'pushplus_token')
             st.success("已保存")
 
     with st.expander("🧊 冰箱管理"):
         img = st.camera_input("拍照", label_visibility="collapsed")
-        if img: 
-            items = mock_ocr_process(img)
-            cur = set(st.session_state.user_data['fridge_items']); cur.update(items)
-            st.session_state.user_data['fridge_items'] = list(cur); save_user_data(); st.rerun()
+        if img and get_ocr().backend == "none": st.caption("📷 OCR 未安装 (pip install rapidocr-onnxruntime)，认不出照片，请在下面手动添加")
+        elif img:
+            key = get_ocr().submit(img.getvalue())
+            if key in st.session_state.ocr_merged:
+                found = st.session_state.ocr_merged[key]
+                st.caption(f"📷 识别到：{'、'.join(found)}" if found else "📷 没认出食材，可以在下面手动添加")
+            elif not merge_ocr_result(key): ocr_status(key)
+            else: st.rerun()
         
         cur_f = st.session_state.user_data['fridge_items']
         new_f_std = []
@@ -373,8 +376,8 @@ with st.sidebar:
         new_in = st.text_input("新增")
         if st.button("更新库存"):
             final = new_f_std + kept_cust
-            if new_in: final.extend([x.strip() for x in new_in.split(',') if x.strip()])
-            st.session_state.user_data['fridge_items'] = list(set(final)); save_user_data(); st.rerun()
+            if new_in: final.extend(NORMALIZER.parse_items(new_in))
+            st.session_state.user_data['fridge_items'] = list(set(final)); save_user_data('fridge_items'); update_shopping_list(); st.rerun()
 
 # 烹饪模式
 if st.session_state.view_mode == "cook" and st.session_state.focus_dish:
@@ -392,6 +395,7 @@ if st.session_state.view_mode == "cook" and st.session_state.focus_dish:
 
 # 仪表盘
 else:
+    report_push_result()
     # 1. Header (强制 4.5:1.5:1.5:1.5 布局)
     # 左侧：头像+昵称
     # 右侧：三个图标
@@ -410,64 +414,57 @@ else:
     with c2:
         st.markdown('<div class="icon-btn">', unsafe_allow_html=True)
         if st.session_state.menu_state['breakfast']:
-            st.download_button("📥", data=create_menu_card_image(st.session_state.menu_state, st.session_state.user_data['nickname']), file_name="menu.png", key="dl_btn")
+            st.download_button("📥", data=menu_card_png(card_menu(st.session_state.menu_state), st.session_state.user_data['nickname']), file_name="menu.png", key="dl_btn")
         else: st.button("📥", disabled=True, key="dl_btn")
         st.markdown('</div>', unsafe_allow_html=True)
     with c3:
         st.markdown('<div class="icon-btn">', unsafe_allow_html=True)
-        st.button("💬", on_click=lambda: st.toast("✅ 已发送"), key="wx_btn")
+        st.button("💬", on_click=send_to_wechat, key="wx_btn")
         st.markdown('</div>', unsafe_allow_html=True)
     with c4:
         st.markdown('<div class="icon-btn">', unsafe_allow_html=True)
-        st.button("📅", on_click=lambda: st.toast("📅 计划已生成"), key="pl_btn")
+        st.button("📅", on_click=generate_weekly, key="pl_btn")
         st.markdown('</div>', unsafe_allow_html=True)
 
     # 3. 生成按钮
     st.markdown('<div class="gen-btn">', unsafe_allow_html=True)
     if st.button("✨ 生成今日菜单", key="gen_btn"):
-        with st.spinner("魔法规划中..."): time.sleep(0.5); generate_full_menu()
+        with st.spinner("魔法规划中..."): generate_full_menu()
     st.markdown('</div>', unsafe_allow_html=True)
 
-    # 4. 卡片渲染
+    # 4. 卡片渲染：每道菜一行是一个 fragment，点喜欢/不喜欢只重跑这一行；换菜/做菜会改到别处，整页重跑
+    def dish_row(k, pool_key, fridge_ids, last):
+        d = st.session_state.menu_state[k]
+        u = st.session_state.user_data
+        is_l, is_dl = d['name'] in u['likes'], d['name'] in u['dislikes']
+        cn, b1, b2, b3, b4 = st.columns([3.5, 1.2, 1.2, 1.2, 1.2])
+        cn.markdown(dish_label(d['name']), unsafe_allow_html=True)
+        b1.button("❤️" if is_l else "🙂", key=f"lk_{k}", on_click=toggle_feedback, args=(d['name'], 'like'))
+        b2.button("⚫" if is_dl else "😐", key=f"dl_{k}", on_click=toggle_feedback, args=(d['name'], 'dislike'))
+        if b3.button("🍳", key=f"ck_{k}"): enter_cook_mode(d); st.rerun()
+        if b4.button("🔄", key=f"sw_{k}"): swap_dish(k, pool_key); st.rerun()
+        st.markdown(ingredient_pills(tuple(d['ingredients']), fridge_ids, not last), unsafe_allow_html=True)
+    if hasattr(st, "fragment"): dish_row = st.fragment(dish_row)
+
     def render_card(title, bg_class, keys, pool_keys):
-        st.markdown(f'<div class="dish-card-ios"><div class="card-banner {bg_class}">{title}</div>', unsafe_allow_html=True)
-        for idx, k in enumerate(keys):
-            d = st.session_state.menu_state[k]
-            if not d: continue
-            is_l = d['name'] in st.session_state.user_data['likes']
-            is_dl = d['name'] in st.session_state.user_data['dislikes']
-            
-            # Row Layout: Name(3.5) + 4 Buttons (1.2 each)
-            cn, b1, b2, b3, b4 = st.columns([3.5, 1.2, 1.2, 1.2, 1.2])
-            with cn: st.markdown(f'<div class="name-label">{d["name"]}</div>', unsafe_allow_html=True)
-            with b1: 
-                st.markdown(f'<div class="mini-icon-btn {"btn-red" if is_l else ""}">', unsafe_allow_html=True)
-                if st.button("❤️" if is_l else "🙂", key=f"lk_{k}"): toggle_feedback(d['name'], 'like'); st.rerun()
-                st.markdown('</div>', unsafe_allow_html=True)
-            with b2:
-                st.markdown('<div class="mini-icon-btn">', unsafe_allow_html=True)
-                label = "⚫" if is_dl else "😐"
-                if st.button(label, key=f"dl_{k}"): toggle_feedback(d['name'], 'dislike'); st.rerun()
-                st.markdown('</div>', unsafe_allow_html=True)
-            with b3:
-                st.markdown('<div class="mini-icon-btn btn-blue">', unsafe_allow_html=True)
-                if st.button("🍳", key=f"ck_{k}"): enter_cook_mode(d); st.rerun()
-                st.markdown('</div>', unsafe_allow_html=True)
-            with b4:
-                st.markdown('<div class="mini-icon-btn">', unsafe_allow_html=True)
-                if st.button("🔄", key=f"sw_{k}"): swap_dish(k, pool_keys[idx]); st.rerun()
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            nf = [normalize_ingredient(i) for i in st.session_state.user_data['fridge_items']]
-            ing_html = "".join([f'<span class="pill {"pill-hit" if normalize_ingredient(i) in nf else ""}">{i}</span>' for i in d['ingredients']])
-            st.markdown(f'<div class="ing-scroll">{ing_html}</div>', unsafe_allow_html=True)
-            if k != keys[-1]: st.markdown("<hr style='margin:0 15px; border:0; border-top:1px solid #F2F2F7;'>", unsafe_allow_html=True)
+        st.markdown(card_banner(title, bg_class), unsafe_allow_html=True)
+        for k, pool_key in zip(keys, pool_keys):
+            if st.session_state.menu_state[k]: dish_row(k, pool_key, fridge_ids, k == keys[-1])
         st.markdown('</div>', unsafe_allow_html=True)
 
+    def nutrition_caption():
+        """今日菜单对营养目标的达标情况 (家里三餐应提供的部分)"""
+        u = st.session_state.user_data
+        report = nutrition_report(st.session_state.menu_state, build_index(get_live_catalog().db), u)
+        fields = ["energy", "protein"] + [f for f in goal_fields(u.get('nutrition_goals')) if f not in ("energy", "protein")]
+        st.caption("🥗 营养达标：" + " · ".join(f"{NUTRIENT_NAMES[f]} {report[f]:.0%}" for f in fields))
+
+    fridge_ids = NORMALIZER.ids(st.session_state.user_data['fridge_items'])
     if st.session_state.menu_state['breakfast']:
         render_card("早 餐", "bg-orange", ['breakfast'], ['breakfast'])
         render_card("午 餐", "bg-blue", ['lunch_meat', 'lunch_veg', 'lunch_soup'], ['lunch_meat', 'lunch_veg', 'soup'])
         render_card("晚 餐", "bg-purple", ['dinner_meat', 'dinner_veg', 'dinner_soup'], ['dinner_meat', 'dinner_veg', 'soup'])
+        nutrition_caption()
         
         missing = st.session_state.menu_state['shopping_list']
         if missing:
@@ -475,5 +472,65 @@ else:
             if st.button("📦 一键入库", use_container_width=True): restock_from_shopping_list()
         
         with st.expander("📜 历史收藏"):
-            for h in load_history()[:5]:
-                st.markdown(f'<div class="hist-card"><div class="hist-head">📅 {h["date"]}</div><div class="hist-txt">🌅 {h["menu"]["breakfast"]}<br>☀️ {h["menu"]["lunch"][0]}...</div></div>', unsafe_allow_html=True)
\ No newline at end of file
+            for h in load_history(5):
+                st.markdown(f'<div class="hist-card"><div class="hist-head">📅 {h["date"]}</div><div class="hist-txt">🌅 {h["menu"]["breakfast"]}<br>☀️ {h["menu"]["lunch"][0]}...</div></div>', unsafe_allow_html=True)
+
+    if st.session_state.week_plan:
+        with st.expander("📅 本周计划", expanded=True):
+            for i, m in enumerate(st.session_state.week_plan['days']):
+                day = (datetime.date.today() + datetime.timedelta(days=i)).strftime("%m-%d")
+                names = lambda ks: "、".join(m[k]['name'] for k in ks if m[k])
+                st.markdown(f'<div class="hist-item"><b>📅 {day}</b><br>🌅 {names(["breakfast"])}<br>☀️ {names(["lunch_meat", "lunch_veg", "lunch_soup"])}<br>🌙 {names(["dinner_meat", "dinner_veg", "dinner_soup"])}</div>', unsafe_allow_html=True)
+            pdf = st.session_state.week_pdf
+            if pdf is None or pdf[0] != st.session_state.user_data['nickname']: st.button("🖨️ 生成本周卡片 PDF", on_click=make_week_pdf, key="week_pdf_make")
+            else: st.download_button("📥 下载本周卡片 PDF", data=pdf[1], file_name="week.pdf", mime="application/pdf", key="week_pdf_btn")
+            week_missing = st.session_state.week_plan['quantities']
+            if week_missing: st.markdown(f"""<div class="receipt-card"><div style="font-weight:bold; margin-bottom:5px;">🛒 本周采购</div><div style="font-size:13px; color:#555;">{'、'.join(f"{k} {v}" for k, v in week_missing.items())}</div></div>""", unsafe_allow_html=True)
+
+    with st.expander("🧊 冰箱能做什么"):
+        found = get_pantry().top(st.session_state.user_data, k=PANTRY_TOP_K, history=load_history_names())
+        if not found: st.caption("冰箱里的食材还凑不出菜，先去 🧊 冰箱管理 添点吧")
+        for i, r in enumerate(found):
+            cn, cb = st.columns([5, 1])
+            cn.markdown(dish_label(r['dish']['name']), unsafe_allow_html=True)
+            if cb.button("🍳", key=f"pt_{i}"): enter_cook_mode(r['dish']); st.rerun()
+            st.caption(f"已有 {len(r['matched'])}/{len(r['matched']) + len(r['missing'])}" + (f" · 还缺：{'、'.join(r['missing'])}" if r['missing'] else " · 食材齐全"))
+
+# ==========================================
+# 6. 渲染预算：记录整页 rerun 的服务端耗时 (行级 fragment 重跑不经过这里)
+# ==========================================
+rerun_ms = st.session_state.setdefault('rerun_ms', [])
+rerun_ms.append((time.perf_counter() - RUN_STARTED) * 1000); del rerun_ms[:-50]
+if DEBUG:
+    recent = sorted(rerun_ms)
+    st.sidebar.caption(f"⏱️ 本次 {rerun_ms[-1]:.0f} ms · 最近 {len(recent)} 次 p50 {recent[len(recent) // 2]:.0f} ms · 预算 {RERUN_BUDGET_MS:.0f} ms")
+    if rerun_ms[-1] > RERUN_BUDGET_MS: st.sidebar.warning("⚠️ 本次渲染超出预算")
+
+def export_telemetry(run):
+    """本次 rerun 追加到 reruns.jsonl，刷新 metrics.prom；进了最慢榜的 rerun 另存火焰图数据"""
+    try:
+        os.makedirs(TELEMETRY_DIR, exist_ok=True)
+        telemetry.append_jsonl(os.path.join(TELEMETRY_DIR, "reruns.jsonl"), run)
+        telemetry.write_prometheus(os.path.join(TELEMETRY_DIR, "metrics.prom"))
+        if run.get('folded'):
+            name = f"rerun-{time.strftime('%Y%m%d-%H%M%S', time.localtime(run['time']))}-{run['ms']:.0f}ms.folded"
+            with open(os.path.join(TELEMETRY_DIR, name), "w", encoding="utf-8") as f: f.write(run['folded'])
+    except OSError: pass  # 导出失败不影响页面
+
+def debug_panel(run):
+    with st.sidebar.expander("🛠 性能面板", expanded=False):
+        st.caption(f"本次 rerun {run['ms']:.1f} ms (面板本身不计入)")
+        spans = sorted(run['spans'].items(), key=lambda kv: -kv[1]['ms'])
+        if spans: st.table([{"span": k, "次数": v['n'], "ms": round(v['ms'], 2)} for k, v in spans])
+        if run['counters']: st.table([{"计数": k, "值": v} for k, v in sorted(run['counters'].items())])
+        snap = telemetry.snapshot()
+        st.caption("进程累计")
+        st.table([{"span": k, "次数": v['n'], "总 ms": v['total_ms'], "最大 ms": v['max_ms']} for k, v in sorted(snap['spans'].items())])
+        if snap['gauges']: st.table([{"仪表": k, "值": v} for k, v in sorted(snap['gauges'].items())])
+        for i, r in enumerate(get_profiler().slowest_reruns()):
+            st.download_button(f"🔥 {r['ms']:.0f} ms · {r.get('samples', 0)} 次采样", r['folded'], file_name=f"rerun-{r['ms']:.0f}ms.folded", key=f"flame_{i}")
+
+run = telemetry.end_rerun(budget_ms=RERUN_BUDGET_MS)
+if run is not None:
+    if TELEMETRY_DIR: export_telemetry(run)
+    if DEBUG: debug_panel(run)
@@ -0,0 +1 @@
+# bench: 无界面的性能基准 (python -m bench)
@@ -0,0 +1,117 @@
+# python -m bench [--sizes 100,1000,10000,100000] [--seed 0] [--out results.json] [--compare old.json]
+#
+# 对每个规模的合成菜谱库测以下阶段：ops/sec、p50/p99 延迟 (ms)、峰值内存 (tracemalloc)
+#   build_index / get_random_dish / generate_full_menu / update_shopping_list / create_menu_card_image
+# 计时与测内存分两遍跑，tracemalloc 的开销不会混进延迟数据。结果写成 JSON，可与上次提交对比。
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from bench.synthetic import synthetic_catalog, synthetic_profiles
+from planner.engine import MenuPlanner, build_index
+from planner.index import RecipeIndex
+from planner.normalize import NORMALIZER
+from render.card import create_menu_card_image
+
+
+def _stages(db, profiles, seed):
+    index = build_index(db)
+    rng = random.Random(seed)
+    planners = [MenuPlanner(db, p, index=index, rng=rng) for p in profiles]
+    menus = [pl.generate_menu() for pl in planners[:16]]
+    state = {"i": 0}
+
+    def nxt():
+        state["i"] += 1
+        return planners[state["i"] % len(planners)]
+
+    return {
+        "build_index": (lambda: RecipeIndex(db, NORMALIZER), 3),
+        "get_random_dish": (lambda: nxt().pick('lunch_meat'), 2000),
+        "generate_full_menu": (lambda: nxt().generate_menu(), 500),
+        "update_shopping_list": (lambda: nxt().shopping_list(menus[state["i"] % len(menus)]), 2000),
+        "create_menu_card_image": (lambda: create_menu_card_image(menus[state["i"] % len(menus)], "Bingo"), 20),
+    }
+
+
+def _pct(sorted_vals, q):
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * len(sorted_vals)))]
+
+
+def measure(fn, n, budget):
+    lat = []
+    t_end = time.perf_counter() + budget
+    for i in range(n):
+        t = time.perf_counter(); fn(); lat.append(time.perf_counter() - t)
+        if i >= 2 and time.perf_counter() > t_end: break  # 大规模下慢阶段提前收工
+    lat.sort()
+    tracemalloc.start()
+    for _ in range(min(len(lat), 20)): fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "n": len(lat),
+        "ops_per_sec": round(len(lat) / sum(lat), 2),
+        "p50_ms": round(_pct(lat, 0.50) * 1000, 4),
+        "p99_ms": round(_pct(lat, 0.99) * 1000, 4),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def _git_rev():
+    try: return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError): return None
+
+
+def run(sizes, seed, budget, only=None):
+    results = {"meta": {"commit": _git_rev(), "seed": seed, "python": platform.python_version(),
+                        "time": time.strftime("%Y-%m-%d %H:%M:%S")}, "results": {}}
+    profiles = synthetic_profiles(64, seed)
+    for size in sizes:
+        random.seed(seed)
+        db = synthetic_catalog(size, seed)
+        row = results["results"][str(size)] = {}
+        for name, (fn, n) in _stages(db, profiles, seed).items():
+            if only and name not in only: continue
+            row[name] = r = measure(fn, n, budget)
+            print(f"{size:>7}  {name:<24} {r['ops_per_sec']:>10.1f} ops/s  p50 {r['p50_ms']:>9.3f} ms  "
+                  f"p99 {r['p99_ms']:>9.3f} ms  peak {r['peak_kb']:>9.1f} KB", file=sys.stderr)
+    return results
+
+
+def compare(old, new):
+    """打印与旧结果相比的 p50 变化 (正数 = 变慢)"""
+    for size, row in new["results"].items():
+        for name, r in row.items():
+            o = old.get("results", {}).get(size, {}).get(name)
+            if not o or not o["p50_ms"]: continue
+            delta = (r["p50_ms"] - o["p50_ms"]) / o["p50_ms"] * 100
+            print(f"{size:>7}  {name:<24} p50 {o['p50_ms']:.3f} -> {r['p50_ms']:.3f} ms ({delta:+.1f}%)")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m bench", description="菜单规划流水线基准测试")
+    ap.add_argument("--sizes", default="100,1000,10000,100000", help="菜谱库规模，逗号分隔")
+    ap.add_argument("--seed", type=int, default=0, help="固定随机种子，结果可复现")
+    ap.add_argument("--budget", type=float, default=5.0, help="每个阶段最多计时几秒")
+    ap.add_argument("--only", default="", help="只跑这些阶段，逗号分隔")
+    ap.add_argument("--out", help="结果 JSON 路径")
+    ap.add_argument("--compare", help="与之前的结果 JSON 对比")
+    args = ap.parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    only = {s.strip() for s in args.only.split(',') if s.strip()}
+    results = run(sizes, args.seed, args.budget, only)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f: json.dump(results, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f: compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
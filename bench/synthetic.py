@@ -0,0 +1,42 @@
+# bench/synthetic.py
+# 合成数据：按 RECIPES_DB 的结构放大菜谱库，生成随机冰箱与过敏原组合
+
+import random
+
+from recipe_data import FRIDGE_CATEGORIES, RECIPES_DB
+
+ALLERGENS = ["牛奶", "奶粉", "牛肉", "鸡蛋", "虾", "鱼", "花生", "麦麸"]
+
+
+def synthetic_catalog(n, seed=0):
+    """约 n 道菜，各课程比例与 RECIPES_DB 相同；菜名唯一，食材在真实食材之外混入一批合成食材"""
+    rng = random.Random(seed)
+    courses = {k: v for k, v in RECIPES_DB.items() if k != 'fruit'}
+    base_total = sum(len(v) for v in courses.values())
+    extra = [f"食材{i:05d}" for i in range(max(n // 20, 1))]
+    db = {}
+    for course, pool in courses.items():
+        size = max(1, round(n * len(pool) / base_total))
+        out = []
+        for i in range(size):
+            d = dict(pool[i % len(pool)])
+            if i >= len(pool):
+                d['name'] = f"{d['name']} #{i}"
+                ings = list(d['ingredients'])
+                if rng.random() < 0.5: ings[rng.randrange(len(ings))] = rng.choice(extra)
+                if rng.random() < 0.3: ings.append(rng.choice(extra))
+                d['ingredients'] = ings
+            out.append(d)
+        db[course] = out
+    db['fruit'] = list(RECIPES_DB['fruit'])
+    return db
+
+
+def synthetic_profiles(n, seed=0):
+    rng = random.Random(seed)
+    vocab = [x for items in FRIDGE_CATEGORIES.values() for x in items]
+    return [{
+        "fridge_items": rng.sample(vocab, rng.randint(3, 15)),
+        "allergens": rng.sample(ALLERGENS, rng.randint(0, 2)),
+        "likes": [], "dislikes": [],
+    } for _ in range(n)]
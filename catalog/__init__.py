@@ -0,0 +1,8 @@
+# catalog: 菜谱库的存储格式与加载 (data/recipes.jsonl -> 共享的 .seg 段)，支持热更新
+from catalog.live import LiveCatalog, Snapshot
+from catalog.segment import Segment, SegmentError
+from catalog.store import (HOT_FIELDS, Catalog, CatalogDB, Postings, Recipe, build_segment, is_dish, is_stale, load_catalog,
+                           segment_path, write_jsonl)
+
+__all__ = ["HOT_FIELDS", "Catalog", "CatalogDB", "LiveCatalog", "Postings", "Recipe", "Segment", "SegmentError", "Snapshot",
+           "build_segment", "is_dish", "is_stale", "load_catalog", "segment_path", "write_jsonl"]
@@ -0,0 +1,25 @@
+# python -m catalog [--recipes data/recipes.jsonl]
+# 部署/改完菜谱后由一个进程重建 .seg 段 (原子替换)，各 Streamlit 进程下次加载时直接 attach
+
+import argparse
+import os
+import time
+
+from catalog.segment import Segment
+from catalog.store import build_segment
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m catalog", description="把菜谱 JSONL 编译成共享只读段")
+    ap.add_argument("--recipes", default=os.environ.get("UUKITCHEN_RECIPES", os.path.join("data", "recipes.jsonl")))
+    args = ap.parse_args(argv)
+    t = time.perf_counter()
+    out = build_segment(args.recipes)
+    sg = Segment(out)
+    print(f"{out}: {sg.n} 道菜, {len(sg.vocab)} 种食材, {len(sg.fruit)} 种水果, "
+          f"{os.path.getsize(out) / 1e6:.1f} MB, {(time.perf_counter() - t) * 1000:.0f} ms")
+    sg.close()
+    return 0
+
+
+raise SystemExit(main())
@@ -0,0 +1,85 @@
+# catalog/live.py
+# 可热更新的菜谱库：新版本在后台线程加载、预建索引，准备好后一次性切换
+#
+# 调用方每次请求取一次 snapshot()，整个请求都用同一个版本；版本号写在段里，每次重建 +1。
+# 会话里还挂着旧版本的菜 (focus_dish / menu_state) 时，这些 Recipe 引用着旧段，照样能读冷字段，
+# 没人引用后随垃圾回收一起释放。以版本为 key 的缓存在 on_retire 回调里清理。
+# 触发方式：watch() 轮询文件 (改 JSONL 或别的进程 `python -m catalog` 换了段)，或直接调 reload()。
+
+import threading
+import time
+from collections import namedtuple
+
+from catalog.store import is_stale, load_catalog, _stamp
+
+Snapshot = namedtuple("Snapshot", "version catalog db")
+
+
+class LiveCatalog:
+    def __init__(self, path):
+        self.path = path
+        self.prepare = []      # 切换前在后台线程调用 fn(新 snapshot)，如预建索引
+        self.on_retire = []    # 切换后调用 fn(旧 snapshot)，清理旧版本的缓存
+        self.error = None      # 最近一次重建失败的原因 (失败时继续用旧版本)
+        self._lock = threading.Lock()
+        self._reloading = None
+        self._watcher = None
+        self._failed = None    # 重建失败时的源文件戳，文件没再改就不反复重试
+        self._snap = self._load(None)
+
+    def snapshot(self):
+        return self._snap
+
+    @property
+    def version(self):
+        return self._snap.version
+
+    @property
+    def db(self):
+        return self._snap.db
+
+    def _load(self, prev):
+        cat = load_catalog(self.path)
+        if prev is not None and cat.version <= prev.version: cat.version = prev.version + 1  # 段只在内存里时
+        return Snapshot(cat.version, cat, cat.as_db())
+
+    def changed(self):
+        return is_stale(self._snap.catalog)
+
+    def reload(self, wait=False):
+        """后台加载新版本；已经有一个在跑时不重复开"""
+        with self._lock:
+            t = self._reloading
+            if t is None or not t.is_alive():
+                t = self._reloading = threading.Thread(target=self._reload, name="catalog-reload", daemon=True)
+                t.start()
+        if wait: t.join()
+        return t
+
+    def _reload(self):
+        old = self._snap; stamp = None
+        try:
+            stamp = _stamp(self.path)
+            new = self._load(old)
+            for fn in self.prepare: fn(new)
+        except Exception as e:  # 菜谱文件写坏了等：保留旧版本，等文件再变
+            self.error, self._failed = e, stamp
+            return
+        self._snap = new; self.error = self._failed = None
+        for fn in self.on_retire: fn(old)
+
+    def watch(self, interval=2.0):
+        """启动轮询线程 (不依赖 inotify)；重复调用只有一个线程"""
+        with self._lock:
+            if self._watcher is None:
+                self._watcher = threading.Thread(target=self._watch, args=(interval,), name="catalog-watch", daemon=True)
+                self._watcher.start()
+        return self._watcher
+
+    def _watch(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                if self.changed() and _stamp(self.path) != self._failed: self.reload(wait=True)
+            except OSError:  # 文件正被替换
+                pass
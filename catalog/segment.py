@@ -0,0 +1,184 @@
+# catalog/segment.py
+# 菜谱库的只读二进制段：一个进程写，多个进程 mmap 共享
+#
+# 多个 Streamlit 进程各自解析 JSONL、各建一份记录和索引，内存随进程数线性增长。
+# 段文件把热字段 (字符串表 + 定长整数数组)、冷字段、按原始食材/课程预先算好的菜品位图放进同一个文件；
+# 各进程 mmap 后用 memoryview.cast 直接在页缓存上读，不拷贝、不解析，只有用到的菜才解码。
+# 重建时先写临时文件再 os.replace：已经 attach 的进程继续读旧 inode，之后 attach 的拿到新段。
+#
+# 布局: 头 (magic, 目录偏移, 目录长度) | 各数组 (8 字节对齐) | 目录 (marshal，含源文件戳与版本号)
+# rid 只编给菜；水果只有菜名，单独存一张表。
+
+import json
+import marshal
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b"UUKSEG01"
+FORMAT = 2  # 段的布局变了就 +1，旧段自动作废重建
+FRUIT = "fruit"
+_HEAD = struct.Struct("<8sQQ")
+_ALIGN = 8
+
+
+class SegmentError(ValueError):
+    pass
+
+
+class _Strings:
+    def __init__(self):
+        self.pos = {}; self.blob = bytearray(); self.end = array("I")
+
+    def ref(self, s):
+        i = self.pos.get(s)
+        if i is None:
+            i = self.pos[s] = len(self.end)
+            self.blob += s.encode("utf-8"); self.end.append(len(self.blob))
+        return i
+
+
+def _bitmap(rids, nb):
+    bits = 0
+    for r in rids: bits |= 1 << r
+    return bits.to_bytes(nb, "little")
+
+
+def pack(records, stamp=None, version=1):
+    """records: [(course, name, ingredients, tags, cold dict)] -> 段文件内容 (bytes)"""
+    st = _Strings()
+    course, name, tag, tag_end = array("I"), array("I"), array("I"), array("I")
+    ing, ing_end = array("I"), array("I")
+    cold, cold_end = bytearray(), array("Q")
+    vocab, vocab_pos, ing_rids = array("I"), {}, []
+    tag_rids = {}
+    course_keys, course_rids = [], {}
+    fruit = array("I")
+    for c, n, ings, tags, extra in records:
+        if c == FRUIT: fruit.append(st.ref(n)); continue
+        rid = len(name)
+        course.append(st.ref(c)); name.append(st.ref(n))
+        if c not in course_rids: course_keys.append(c); course_rids[c] = []
+        course_rids[c].append(rid)
+        for s in ings:
+            v = vocab_pos.get(s)
+            if v is None:
+                v = vocab_pos[s] = len(vocab); vocab.append(st.ref(s)); ing_rids.append([])
+            ing.append(v); ing_rids[v].append(rid)
+        ing_end.append(len(ing))
+        tag.extend(st.ref(t) for t in tags); tag_end.append(len(tag))
+        for t in tags: tag_rids.setdefault(t, []).append(rid)
+        cold += json.dumps(extra, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        cold_end.append(len(cold))
+
+    n = len(name); nb = (n + 7) // 8
+    names = [bytes(st.blob[st.end[i - 1] if i else 0:st.end[i]]) for i in name]
+    by_name = array("I", sorted(range(n), key=names.__getitem__))
+    courses, course_post, course_flat, course_end = array("I"), bytearray(), array("I"), array("I")
+    for c in course_keys:
+        courses.append(st.ref(c)); course_post += _bitmap(course_rids[c], nb)
+        course_flat.extend(course_rids[c]); course_end.append(len(course_flat))
+    post = bytearray()
+    for rids in ing_rids: post += _bitmap(rids, nb)
+    tag_keys, tag_post = array("I"), bytearray()
+    for t, rids in tag_rids.items(): tag_keys.append(st.ref(t)); tag_post += _bitmap(rids, nb)
+
+    sections = {
+        "str_blob": ("B", bytes(st.blob)), "str_end": ("I", st.end),
+        "course": ("I", course), "name": ("I", name), "by_name": ("I", by_name),
+        "ing": ("I", ing), "ing_end": ("I", ing_end), "tag": ("I", tag), "tag_end": ("I", tag_end),
+        "cold": ("B", bytes(cold)), "cold_end": ("Q", cold_end),
+        "vocab": ("I", vocab), "post": ("B", bytes(post)),
+        "tag_keys": ("I", tag_keys), "tag_post": ("B", bytes(tag_post)),
+        "courses": ("I", courses), "course_post": ("B", bytes(course_post)),
+        "course_rids": ("I", course_flat), "course_end": ("I", course_end),
+        "fruit": ("I", fruit),
+    }
+    out = bytearray(_HEAD.size); toc = {}
+    for key, (tc, data) in sections.items():
+        out += b"\0" * (-len(out) % _ALIGN)
+        raw = data.tobytes() if isinstance(data, array) else data
+        toc[key] = (tc, len(out), len(raw)); out += raw
+    meta = marshal.dumps({"format": FORMAT, "byteorder": sys.byteorder, "stamp": stamp, "version": version, "n": n, "sections": toc})
+    _HEAD.pack_into(out, 0, MAGIC, len(out), len(meta))
+    return bytes(out + meta)
+
+
+def write(path, data):
+    """原子写入：正在读旧段的进程不受影响"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data); f.flush(); os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try: os.remove(tmp)
+        except OSError: pass
+        raise
+
+
+class Segment:
+    """attach 一个段 (文件路径或内存中的 bytes)；各数组是 memoryview，按 rid 下标读取"""
+
+    def __init__(self, source):
+        self.path = self.inode = None; self._mm = None
+        if isinstance(source, (bytes, bytearray)):
+            buf = memoryview(source)
+        else:
+            self.path = source
+            with open(source, "rb") as f:
+                self.inode = os.fstat(f.fileno()).st_ino
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            buf = memoryview(self._mm)
+        self._views = []
+        try:
+            magic, toc_off, toc_len = _HEAD.unpack_from(buf, 0)
+            if magic != MAGIC: raise SegmentError("not a recipe segment")
+            meta = marshal.loads(buf[toc_off:toc_off + toc_len])
+            if meta.get("format", 1) != FORMAT: raise SegmentError("segment format changed")
+            if meta["byteorder"] != sys.byteorder: raise SegmentError("byte order mismatch")
+            self.stamp, self.version, self.n = meta["stamp"], meta.get("version", 0), meta["n"]
+            self.nb = (self.n + 7) // 8
+            for key, (tc, off, ln) in meta["sections"].items():
+                v = buf[off:off + ln]
+                if tc != "B": v = v.cast(tc)
+                self._views.append(v); setattr(self, key, v)
+        except (struct.error, EOFError, ValueError, TypeError, KeyError) as e:
+            self._buf = buf; self.close()
+            raise e if isinstance(e, SegmentError) else SegmentError(str(e)) from e
+        self._buf = buf
+
+    def string(self, i):
+        end = self.str_end
+        return sys.intern(str(self.str_blob[end[i - 1] if i else 0:end[i]], "utf-8"))
+
+    def span(self, ends, i):
+        return (ends[i - 1] if i else 0), ends[i]
+
+    def bitmap(self, blob, k):
+        return int.from_bytes(blob[k * self.nb:(k + 1) * self.nb], "little")
+
+    def find_name(self, name):
+        """同名菜的 rid (按菜名字节序二分)"""
+        key = name.encode("utf-8"); order = self.by_name
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._name_bytes(order[mid]) < key: lo = mid + 1
+            else: hi = mid
+        out = []
+        while lo < len(order) and self._name_bytes(order[lo]) == key:
+            out.append(order[lo]); lo += 1
+        return out
+
+    def _name_bytes(self, rid):
+        i = self.name[rid]; end = self.str_end
+        return bytes(self.str_blob[end[i - 1] if i else 0:end[i]])
+
+    def close(self):
+        for v in getattr(self, "_views", ()): v.release()
+        self._views = []
+        if getattr(self, "_buf", None) is not None: self._buf.release(); self._buf = None
+        if self._mm is not None: self._mm.close(); self._mm = None
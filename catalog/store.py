@@ -0,0 +1,314 @@
+# catalog/store.py
+# 流式加载菜谱库，常驻内存的只有选菜要用的热字段
+#
+# 数据文件是 JSON Lines，一行一道菜 (水果只有 course + name)，便于手工编辑和 diff。
+# 加载时逐行读取，编译成同名 .seg 二进制段 (见 catalog.segment)，之后各进程直接 mmap 这个段：
+# course / name / ingredients / tags 按需解码成 __slots__ 记录，做法、描述、用量等冷字段进烹饪模式时才解析。
+# 段里记着源文件的 size + mtime_ns，源文件没变时启动不再逐行解析 JSON。
+
+import json
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+
+from catalog import segment as seg
+from catalog.segment import FRUIT, Segment, SegmentError
+
+HOT_FIELDS = ("course", "name", "ingredients", "tags")
+_COLD_CACHE = 64
+
+
+def is_dish(d):
+    """菜单槽位里放的是菜 (dict 或 Recipe)，而不是 None / 水果字符串"""
+    return isinstance(d, Mapping)
+
+
+class Recipe(Mapping):
+    """一道菜的热字段；按 dict 的方式取值，冷字段第一次访问时才从段里读取"""
+    __slots__ = ("rid", "course", "name", "ingredients", "tags", "_catalog", "__weakref__")
+
+    def __init__(self, rid, course, name, ingredients, tags, catalog):
+        self.rid, self.course, self.name = rid, course, name
+        self.ingredients, self.tags, self._catalog = ingredients, tags, catalog
+
+    def __getitem__(self, key):
+        if key in HOT_FIELDS: return getattr(self, key)
+        return self._catalog.cold(self.rid)[key]
+
+    def get(self, key, default=None):
+        if key in HOT_FIELDS: return getattr(self, key)
+        return self._catalog.cold(self.rid).get(key, default)
+
+    def __contains__(self, key):
+        return key in HOT_FIELDS or key in self._catalog.cold(self.rid)
+
+    def __iter__(self):
+        yield from HOT_FIELDS
+        yield from self._catalog.cold(self.rid)
+
+    def __len__(self):
+        return len(HOT_FIELDS) + len(self._catalog.cold(self.rid))
+
+    # Mapping 默认按内容比较，会把冷字段全读出来；同一份库里的菜按身份比较即可
+    def __eq__(self, other):
+        return self is other
+
+    def __hash__(self):
+        return id(self)
+
+    def __repr__(self):
+        return f"Recipe({self.rid}, {self.course!r}, {self.name!r})"
+
+    # 跨进程 (进程池、pickle) 只传 (库, rid)，对端 attach 同一个段
+    def __reduce__(self):
+        return _recipe, (self._catalog, self.rid, self.name)
+
+
+class _Recipes(Sequence):
+    """rid -> Recipe，按需解码"""
+
+    def __init__(self, catalog, rids=None):
+        self._catalog, self._rids = catalog, rids
+
+    def __len__(self):
+        return len(self._catalog) if self._rids is None else len(self._rids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice): return [self[j] for j in range(*i.indices(len(self)))]
+        if self._rids is None:
+            if i < 0: i += len(self)
+            if not 0 <= i < len(self): raise IndexError(i)
+            return self._catalog.recipe(i)
+        return self._catalog.recipe(self._rids[i])
+
+
+class CatalogDB(dict):
+    """RECIPES_DB：{course: [Recipe, ...]}，水果为菜名字符串；.catalog 指回菜谱库，供索引直接读段"""
+
+    def __init__(self, catalog, pools):
+        super().__init__(pools)
+        self.catalog = catalog
+
+    def __reduce__(self):
+        return _as_db, (self.catalog,)
+
+
+class Postings(Mapping):
+    """键 -> 菜品位图，取值时从段里解码 (多个段内下标按位或)，位图不在各进程里各存一整份。
+
+    cache_bytes > 0 时把解码结果留在进程里，总量到上限就不再新增 (整表扫描时不会像 LRU 那样互相挤掉)；
+    小菜库全部放得下，和直接用 dict 一样快，大菜库每个进程的常驻量有上限。
+    """
+    __slots__ = ("segment", "blob", "slots", "cache_bytes", "_cache", "_cached")
+
+    def __init__(self, segment, blob, slots, cache_bytes=0):
+        self.segment, self.blob, self.slots = segment, blob, slots  # slots: 键 -> 段内位图下标元组
+        self.cache_bytes = cache_bytes
+        self._cache = {}; self._cached = 0
+
+    def __getitem__(self, key):
+        bits = self._cache.get(key)
+        if bits is not None: return bits
+        bitmap, blob = self.segment.bitmap, self.blob
+        bits = 0
+        for k in self.slots[key]: bits |= bitmap(blob, k)
+        if self._cached < self.cache_bytes:
+            self._cache[key] = bits; self._cached += self.segment.nb
+        return bits
+
+    def __iter__(self):
+        return iter(self.slots)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def regroup(self, key, cache_bytes=0):
+        """按 key(原键) 合并成新的映射 (如原始写法 -> 标准化食材 ID)"""
+        slots = {}
+        for k, ks in self.slots.items(): slots.setdefault(key(k), []).extend(ks)
+        return Postings(self.segment, self.blob, {k: tuple(ks) for k, ks in slots.items()}, cache_bytes)
+
+
+class Catalog:
+    def __init__(self, segment, path=None):
+        self.path = path
+        self.segment = segment
+        self.version = segment.version  # 每次重建段 +1；热更新时以它为缓存 key
+        self._live = weakref.WeakValueDictionary()  # 同一 rid 在进程内只有一个 Recipe 对象
+        self._cold = OrderedDict()
+        self._lock = threading.Lock()
+        self.recipes = _Recipes(self)
+
+    def __len__(self):
+        return self.segment.n
+
+    def recipe(self, rid):
+        r = self._live.get(rid)
+        if r is None:
+            sg = self.segment; string = sg.string
+            a, b = sg.span(sg.ing_end, rid); vocab = sg.vocab
+            ings = tuple(string(vocab[v]) for v in sg.ing[a:b])
+            a, b = sg.span(sg.tag_end, rid)
+            tags = tuple(string(t) for t in sg.tag[a:b])
+            r = Recipe(rid, string(sg.course[rid]), string(sg.name[rid]), ings, tags, self)
+            with self._lock: r = self._live.setdefault(rid, r)
+        return r
+
+    def cold(self, rid):
+        """冷字段 dict (不含热字段)"""
+        with self._lock:
+            hit = self._cold.get(rid)
+            if hit is not None:
+                self._cold.move_to_end(rid); return hit
+        sg = self.segment; a, b = sg.span(sg.cold_end, rid)
+        rec = json.loads(bytes(sg.cold[a:b]))
+        with self._lock:
+            self._cold[rid] = rec
+            while len(self._cold) > _COLD_CACHE: self._cold.popitem(last=False)
+        return rec
+
+    # ---- 给索引用：直接从段里读，不逐道菜解码 ----
+    def ingredients(self):
+        """出现过的原始食材写法 (首次出现顺序)"""
+        sg = self.segment
+        return [sg.string(v) for v in sg.vocab]
+
+    def ingredient_slots(self, rid):
+        """这道菜的食材在 ingredients() 里的下标"""
+        sg = self.segment; a, b = sg.span(sg.ing_end, rid)
+        return sg.ing[a:b]
+
+    def raw_postings(self):
+        """原始食材写法 -> 菜品位图 (按需解码，见 Postings)"""
+        sg = self.segment
+        return Postings(sg, sg.post, {sg.string(v): (k,) for k, v in enumerate(sg.vocab)})
+
+    def tag_postings(self):
+        """标签 -> 菜品位图 (按需解码)"""
+        sg = self.segment
+        return Postings(sg, sg.tag_post, {sg.string(t): (k,) for k, t in enumerate(sg.tag_keys)})
+
+    def course_bits(self):
+        sg = self.segment
+        return {sg.string(c): sg.bitmap(sg.course_post, k) for k, c in enumerate(sg.courses)}
+
+    def rids_named(self, name):
+        return self.segment.find_name(name)
+
+    def fruits(self):
+        sg = self.segment
+        return [sg.string(i) for i in sg.fruit]
+
+    def as_db(self):
+        sg = self.segment; pools = {}
+        for k, c in enumerate(sg.courses):
+            a, b = sg.span(sg.course_end, k)
+            pools[sg.string(c)] = _Recipes(self, sg.course_rids[a:b])
+        if len(sg.fruit): pools[FRUIT] = self.fruits()
+        return CatalogDB(self, pools)
+
+    def close(self):
+        self.segment.close()
+
+    def __reduce__(self):
+        return _reopen, (self.path,)
+
+
+_OPEN = weakref.WeakValueDictionary()  # 路径 -> 本进程已加载的库，反序列化时复用
+
+
+def _reopen(path):
+    cat = _OPEN.get(path)
+    return cat if cat is not None else load_catalog(path)
+
+
+def _recipe(catalog, rid, name):
+    """对端的库可能已热更新到新版本，rid 对不上时按菜名找"""
+    if rid < len(catalog):
+        r = catalog.recipe(rid)
+        if r.name == name: return r
+    rids = catalog.rids_named(name)
+    return catalog.recipe(rids[0]) if rids else None
+
+
+def _as_db(catalog):
+    return catalog.as_db()
+
+
+def _scan(path):
+    """逐行读 JSONL -> (course, name, ingredients, tags, 冷字段 dict)"""
+    with open(path, "rb") as f:
+        for raw in f:
+            line = raw.strip()
+            if not line: continue
+            rec = json.loads(line)
+            hot = [rec.pop(k, ()) for k in HOT_FIELDS]
+            yield hot[0], hot[1], tuple(hot[2]), tuple(hot[3]), rec
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def segment_path(path):
+    return path + ".seg"
+
+
+def _pack(path, out):
+    """逐行解析 JSONL 编成段，版本号接着旧段 +1"""
+    try:
+        old = Segment(out); version = old.version + 1; old.close()
+    except (OSError, SegmentError): version = 1
+    return seg.pack(_scan(path), _stamp(path), version)
+
+
+def build_segment(path, out=None):
+    """JSONL -> .seg (原子替换)，返回写入的路径"""
+    out = out or segment_path(path)
+    seg.write(out, _pack(path, out))
+    return out
+
+
+def is_stale(catalog):
+    """源 JSONL 改过，或者段文件被别的进程换成了新的"""
+    sg = catalog.segment
+    try:
+        if _stamp(catalog.path) != sg.stamp: return True
+        return sg.inode is not None and os.stat(segment_path(catalog.path)).st_ino != sg.inode
+    except OSError: return False
+
+
+def _attach(path):
+    try: sg = Segment(segment_path(path))
+    except (OSError, SegmentError): return None
+    if sg.stamp == _stamp(path): return sg
+    sg.close(); return None
+
+
+def load_catalog(path, use_segment=True):
+    """优先 attach 现成的段；没有或已过期时逐行解析并写出新段 (目录只读时只放在本进程内存里)"""
+    sg = _attach(path) if use_segment else None
+    if sg is None:
+        data = _pack(path, segment_path(path))
+        sg = Segment(data)
+        if use_segment:
+            try: seg.write(segment_path(path), data)
+            except OSError: pass  # 只读目录：段只放在本进程内存里
+            else: sg.close(); sg = Segment(segment_path(path))
+    cat = _OPEN[path] = Catalog(sg, path)
+    return cat
+
+
+def write_jsonl(db, path):
+    """把 {course: [dish, ...]} 写成 JSONL (原子替换)；水果写成只有 course + name 的行"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for course, pool in db.items():
+            for d in pool:
+                if isinstance(d, str): rec = {"course": course, "name": d}
+                else: rec = {"course": course, **{k: v for k, v in dict(d).items() if k != "course"}}
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    os.replace(tmp, path)
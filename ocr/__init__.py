@@ -0,0 +1,8 @@
+# ocr: 冰箱照片识别 (预处理 -> 本地识别后端 -> 食材词表匹配)，在后台线程里跑
+from ocr.pipeline import BackendUnavailable, backend, image_key, load_backend, match_ingredients, preprocess, recognize
+from ocr.worker import OcrWorker
+
+__all__ = [
+    "BackendUnavailable", "OcrWorker", "backend", "image_key", "load_backend", "match_ingredients", "preprocess",
+    "recognize",
+]
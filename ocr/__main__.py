@@ -0,0 +1,23 @@
+# python -m ocr photo.jpg [--backend auto|rapidocr|tesseract|none]
+# 离线试跑识别流水线，输出识别到的食材与原文 (JSON)
+
+import argparse
+import json
+
+from ocr.worker import OcrWorker
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m ocr", description="识别冰箱照片里的食材")
+    ap.add_argument("images", nargs="+")
+    ap.add_argument("--backend", default=None, help="识别后端，默认取 UUKITCHEN_OCR 或 auto")
+    args = ap.parse_args(argv)
+    worker = OcrWorker(args.backend)
+    for path in args.images:
+        with open(path, "rb") as f: res = worker.recognize_now(f.read())
+        print(json.dumps({"image": path, "backend": worker.backend, **res}, ensure_ascii=False))
+    worker.shutdown()
+    return 0
+
+
+raise SystemExit(main())
@@ -0,0 +1,96 @@
+# ocr/pipeline.py
+# 冰箱照片 -> 食材：缩放/规整 (Pillow) -> 本地识别后端 (纯 CPU) -> 按食材词表匹配
+#
+# 识别后端可插拔，按 UUKITCHEN_OCR 选择 (默认 auto：依次尝试已安装的 rapidocr / tesseract)。
+# 后端只负责"图 -> 文字"；认出哪些食材统一交给 planner.normalize 的 Aho-Corasick 词表，
+# 同义词 ("番茄"、"基围虾") 与手输食材走同一套规则。都没装时退回 none 后端：不报错，页面据此提示"OCR 未安装"。
+
+import hashlib
+import io
+import os
+
+from PIL import Image, ImageOps
+
+MAX_SIDE = 1280
+_BACKENDS = {}
+_AUTO_ORDER = ("rapidocr", "tesseract")
+
+
+class BackendUnavailable(RuntimeError):
+    pass
+
+
+def backend(name):
+    """注册识别后端：工厂函数返回 fn(PIL.Image) -> str，依赖没装时抛 BackendUnavailable"""
+    def deco(factory):
+        _BACKENDS[name] = factory
+        return factory
+    return deco
+
+
+@backend("none")
+def _none_backend():
+    return lambda img: ""
+
+
+@backend("tesseract")
+def _tesseract_backend():
+    try: import pytesseract
+    except ImportError as e: raise BackendUnavailable("pytesseract 未安装") from e
+    try: langs = set(pytesseract.get_languages(config=""))
+    except Exception as e: raise BackendUnavailable(f"找不到 tesseract 可执行文件: {e}") from e
+    lang = "+".join(l for l in ("chi_sim", "eng") if l in langs) or None
+    return lambda img: pytesseract.image_to_string(img, lang=lang)
+
+
+@backend("rapidocr")
+def _rapidocr_backend():
+    try:
+        import numpy as np
+        from rapidocr_onnxruntime import RapidOCR
+    except ImportError as e: raise BackendUnavailable("rapidocr_onnxruntime 未安装") from e
+    engine = RapidOCR()
+
+    def run(img):
+        result, _ = engine(np.asarray(img.convert("RGB")))
+        return "\n".join(r[1] for r in result or ())
+    return run
+
+
+def load_backend(name=None):
+    """(后端名, 识别函数)；auto 时返回第一个可用的"""
+    name = name or os.environ.get("UUKITCHEN_OCR", "auto")
+    if name != "auto":
+        if name not in _BACKENDS: raise ValueError(f"未知的识别后端: {name}")
+        return name, _BACKENDS[name]()
+    for n in _AUTO_ORDER:
+        try: return n, _BACKENDS[n]()
+        except BackendUnavailable: continue
+    return "none", _BACKENDS["none"]()
+
+
+def image_key(data):
+    """缓存 key：照片原始字节的哈希 (同一张照片 rerun 多少次都是同一个 key)"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def preprocess(data, max_side=MAX_SIDE):
+    """按 EXIF 转正、缩到长边 max_side、转灰度并拉伸对比度"""
+    img = Image.open(io.BytesIO(data))
+    if img.format == "JPEG": img.draft("RGB", (max_side, max_side))  # 解码时就按 1/2~1/8 缩小，手机大图省大半时间
+    img = ImageOps.exif_transpose(img)
+    img.thumbnail((max_side, max_side), Image.LANCZOS)
+    return ImageOps.autocontrast(img.convert("L"), cutoff=1)
+
+
+def match_ingredients(text, normalizer=None):
+    """识别出的文字 -> 食材标准名 (按出现顺序、去重)"""
+    if normalizer is None:
+        from planner.normalize import NORMALIZER as normalizer
+    return normalizer.extract(text)
+
+
+def recognize(data, recognizer):
+    """一张照片完整跑一遍流水线，返回 {"items": [...], "text": 识别原文}"""
+    text = recognizer(preprocess(data))
+    return {"items": match_ingredients(text), "text": text}
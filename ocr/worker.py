@@ -0,0 +1,61 @@
+# ocr/worker.py
+# 后台识别：照片在线程池里跑流水线，结果按照片哈希缓存
+#
+# 页面只做两件事：submit(照片字节) 拿到 key，之后每次 rerun 用 poll(key) 看结果；从不等待。
+# 同一张照片 (同一 key) 只识别一次：在跑的复用同一个 Future，跑完的直接查缓存。
+# 识别后端 (onnxruntime / tesseract 子进程) 和 Pillow 的缩放都会释放 GIL，线程池就够用，不必跨进程传图。
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from ocr.pipeline import image_key, load_backend, recognize
+
+_CACHE_SIZE = 256
+
+
+class OcrWorker:
+    def __init__(self, backend=None, max_workers=1, cache_size=_CACHE_SIZE):
+        self.backend, self._recognizer = load_backend(backend)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ocr")
+        self._cache = OrderedDict()   # key -> 结果 dict
+        self._running = {}            # key -> Future
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def submit(self, data):
+        """照片排进队列 (已识别或正在识别的不重复提交)，返回 key"""
+        key = image_key(data)
+        with self._lock:
+            if key in self._cache or key in self._running: return key
+            fut = self._pool.submit(self._run, key, data)
+            self._running[key] = fut
+        return key
+
+    def _run(self, key, data):
+        try: res = recognize(data, self._recognizer)
+        except Exception as e: res = {"items": [], "text": "", "error": f"{type(e).__name__}: {e}"}
+        with self._lock:
+            self._cache[key] = res
+            while len(self._cache) > self._cache_size: self._cache.popitem(last=False)
+            self._running.pop(key, None)
+        return res
+
+    def poll(self, key):
+        """结果 dict；还没跑完返回 None"""
+        with self._lock:
+            res = self._cache.get(key)
+            if res is not None: self._cache.move_to_end(key)
+            return res
+
+    def pending(self, key):
+        with self._lock: return key in self._running
+
+    def recognize_now(self, data):
+        """同步识别 (命令行/批处理用)，同样走缓存"""
+        key = self.submit(data)
+        with self._lock: fut = self._running.get(key)
+        return fut.result() if fut is not None else self.poll(key)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,19 @@
+# planner: 与 Streamlit 无关的菜单规划引擎
+from planner.allergens import AllergenEngine
+from planner.batch import plan_batch
+from planner.engine import MenuPlanner, build_index, drop_index
+from planner.index import RecipeIndex, iter_bits
+from planner.normalize import NORMALIZER, Normalizer, normalize_ingredient
+from planner.nutrition import NutritionPlanner, daily_targets, nutrition_report, planner_for
+from planner.pantry import FridgeQuery
+from planner.recommend import DEFAULT_PARAMS, Params, PreferenceModel, history_names, preference_model
+from planner.rules import MENU_SLOTS, RED_MEAT, SLOT_POOLS, empty_menu, menu_names
+from planner.sampler import WeightedSampler
+from planner.shopping import ShoppingList
+from planner.weekly import WeeklyPlanner
+
+__all__ = [
+    "AllergenEngine", "DEFAULT_PARAMS", "FridgeQuery", "MENU_SLOTS", "NORMALIZER", "MenuPlanner", "Normalizer", "NutritionPlanner", "Params", "PreferenceModel", "RED_MEAT", "RecipeIndex",
+    "SLOT_POOLS", "ShoppingList", "WeightedSampler", "WeeklyPlanner",
+    "build_index", "daily_targets", "drop_index", "empty_menu", "history_names", "iter_bits", "menu_names", "normalize_ingredient", "nutrition_report", "plan_batch", "planner_for", "preference_model",
+]
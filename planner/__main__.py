@@ -0,0 +1,31 @@
+# python -m planner --fridge 鸡蛋,西红柿 --allergens 牛奶 --seed 1
+# 命令行生成一份菜单，输出 JSON (只输出菜名)
+
+import argparse
+import json
+import random
+
+from planner.engine import MenuPlanner
+from planner.rules import menu_names
+from recipe_data import RECIPES_DB
+
+
+def _split(s):
+    return [x.strip() for x in s.split(',') if x.strip()] if s else []
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m planner", description="生成一份每日菜单")
+    ap.add_argument("--fridge", default="", help="冰箱食材，逗号分隔")
+    ap.add_argument("--allergens", default="", help="过敏原，逗号分隔")
+    ap.add_argument("--likes", default=""); ap.add_argument("--dislikes", default="")
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args(argv)
+    profile = {"fridge_items": _split(args.fridge), "allergens": _split(args.allergens),
+               "likes": _split(args.likes), "dislikes": _split(args.dislikes)}
+    planner = MenuPlanner(RECIPES_DB, profile, rng=random.Random(args.seed))
+    print(json.dumps(menu_names(planner.generate_menu()), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# planner/allergens.py
+# 过敏原引擎：Aho-Corasick 多模式匹配 + 每道菜一个过敏原位掩码
+#
+# 每个过敏原 (含层级里的下级写法) 占一位。加载菜谱时对每种原始食材写法 (及其标准名) 跑一遍自动机，
+# 得到它含有的过敏原位；菜的掩码 = 各食材掩码按位或。请求时：
+#   单道菜是否安全 = not (recipe_masks[rid] & profile_mask)
+#   整个菜池过滤   = 按过敏原位取预先算好的菜品位图做按位或
+# 用户自定义的新过敏原第一次出现时才注册，只补算这一位。
+
+import threading
+
+from planner.index import iter_bits
+from planner.textmatch import AhoCorasick
+from recipe_data import ALLERGEN_HIERARCHY
+
+
+class AllergenEngine:
+    def __init__(self, index, hierarchy=ALLERGEN_HIERARCHY):
+        self.index = index
+        self.normalizer = index.normalizer
+        self.categories = []      # 位 -> 过敏原名
+        self._bit = {}            # 过敏原名 -> 位
+        self._term_mask = {}      # 匹配词 -> 过敏原位掩码 (含上级)
+        self._lock = threading.Lock()
+
+        parents = {}
+        for parent, members in hierarchy.items():
+            self._category(parent)
+            for m in members: self._category(m); parents.setdefault(m, set()).add(parent)
+        for name in list(self.categories):
+            mask = 0
+            for a in self._ancestors(name, parents): mask |= 1 << self._bit[a]
+            for term in self._terms(name): self._term_mask[term] = self._term_mask.get(term, 0) | mask
+        self._matcher = AhoCorasick(self._term_mask)
+
+        self.ingredient_masks = {}                       # 原始食材写法 -> 掩码
+        self.recipe_masks = [0] * len(index)             # rid -> 掩码
+        self._recipes_by_bit = [0] * len(self.categories)  # 位 -> 含该过敏原的菜品位图
+        for ing, bits in index.raw_postings.items():
+            mask = self._scan(ing)
+            self.ingredient_masks[ing] = mask
+            if mask: self._mark(mask, bits)
+
+    def _category(self, name):
+        if name not in self._bit:
+            self._bit[name] = len(self.categories); self.categories.append(name)
+        return self._bit[name]
+
+    @staticmethod
+    def _ancestors(name, parents):
+        out = {name}; stack = [name]
+        while stack:
+            for p in parents.get(stack.pop(), ()):
+                if p not in out: out.add(p); stack.append(p)
+        return out
+
+    def _terms(self, name):
+        return {name, self.normalizer.canonical(name)}
+
+    def _scan(self, ing):
+        mask = 0
+        for text in {ing, self.normalizer.canonical(ing)}:
+            for _, term in self._matcher.iter_matches(text): mask |= self._term_mask[term]
+        return mask
+
+    def _mark(self, mask, bits):
+        for b in iter_bits(mask): self._recipes_by_bit[b] |= bits
+        for rid in iter_bits(bits): self.recipe_masks[rid] |= mask
+
+    def _register(self, name):
+        """用户自定义的过敏原：新占一位，只补算这一位涉及的食材"""
+        with self._lock:
+            if name in self._bit: return self._bit[name]
+            b = self._category(name); bit = 1 << b
+            self._recipes_by_bit.append(0)
+            terms = self._terms(name)
+            for t in terms: self._term_mask[t] = self._term_mask.get(t, 0) | bit
+            self._matcher = AhoCorasick(self._term_mask)
+            for ing, bits in self.index.raw_postings.items():
+                canon = self.normalizer.canonical(ing)
+                if any(t in ing or t in canon for t in terms):
+                    self.ingredient_masks[ing] |= bit
+                    self._mark(bit, bits)
+            return b
+
+    def profile_mask(self, allergens):
+        mask = 0
+        for a in allergens:
+            a = a.strip()
+            if not a: continue
+            b = self._bit.get(a)
+            if b is None: b = self._register(a)
+            mask |= 1 << b
+        return mask
+
+    def is_safe(self, rid, profile_mask):
+        return not self.recipe_masks[rid] & profile_mask
+
+    def excluded(self, profile_mask):
+        """含任一过敏原的菜品位图"""
+        bits = 0
+        for b in iter_bits(profile_mask): bits |= self._recipes_by_bit[b]
+        return bits
+
+    def contains(self, ingredient, allergens):
+        """单个食材是否含过敏原 (用于界面提示等零散场景)"""
+        mask = self.ingredient_masks.get(ingredient)
+        if mask is None: mask = self._scan(ingredient)
+        return bool(mask & self.profile_mask(allergens))
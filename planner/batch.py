@@ -0,0 +1,78 @@
+# planner/batch.py
+# 批量生成菜单：每晚为大量家庭档案各出一份完整日菜单 + 缺货清单
+#
+# 档案按过敏原组合分组后依次处理，同组共用 RecipeIndex.safe_pool 的过滤结果；
+# processes > 1 时按组切块分发到进程池，每个工作进程只建一次索引。
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from planner.engine import MenuPlanner, build_index
+from planner.rules import menu_names
+
+_CHUNK = 2000
+_worker_recipes = None
+
+
+def _profile_rng(seed, i):
+    # 字符串种子按 sha512 展开：(seed, i) 不同流就不同，不会像 seed * K + i 那样两两撞上；也不受 PYTHONHASHSEED 影响
+    return random.Random(f"{seed}:{i}") if seed is not None else random.Random()
+
+
+def _group_key(profile):
+    return tuple(sorted(set(profile.get('allergens', []))))
+
+
+def _normalize_profile(profile):
+    p = {"fridge_items": [], "allergens": [], "likes": [], "dislikes": []}
+    p.update(profile)
+    return p
+
+
+def _plan_items(recipes, items, seed):
+    index = build_index(recipes)
+    out = []
+    for i, profile in items:
+        planner = MenuPlanner(recipes, _normalize_profile(profile), index=index, rng=_profile_rng(seed, i))
+        out.append((i, menu_names(planner.generate_menu())))
+    return out
+
+
+def _init_worker(recipes):
+    global _worker_recipes
+    if recipes is None:
+        from recipe_data import RECIPES_DB
+        recipes = RECIPES_DB
+    _worker_recipes = recipes
+    build_index(recipes)
+
+
+def _plan_chunk(items, seed):
+    return _plan_items(_worker_recipes, items, seed)
+
+
+def plan_batch(profiles, recipes=None, processes=None, seed=None, chunksize=_CHUNK):
+    """为每个档案生成一份菜单，按输入顺序返回 (菜名形式，含 shopping_list)
+
+    processes: None/1 在当前进程内执行；0 表示使用全部 CPU 核。
+    seed: 给定时结果可复现，且与是否开进程池无关。
+    """
+    profiles = list(profiles)
+    order = sorted(range(len(profiles)), key=lambda i: _group_key(profiles[i]))
+    items = [(i, profiles[i]) for i in order]
+    results = [None] * len(profiles)
+
+    if processes == 0: processes = os.cpu_count() or 1
+    if not processes or processes == 1 or len(items) <= chunksize:
+        if recipes is None:
+            from recipe_data import RECIPES_DB
+            recipes = RECIPES_DB
+        for i, menu in _plan_items(recipes, items, seed): results[i] = menu
+        return results
+
+    chunks = [items[s:s + chunksize] for s in range(0, len(items), chunksize)]
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(recipes,)) as ex:
+        for part in ex.map(_plan_chunk, chunks, [seed] * len(chunks)):
+            for i, menu in part: results[i] = menu
+    return results
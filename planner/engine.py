@@ -0,0 +1,135 @@
+# planner/engine.py
+# 菜单规划引擎：只依赖菜谱数据与用户档案，不碰 st.session_state
+#
+# profile 与 app.py 的 user_data 结构相同，至少包含 fridge_items / allergens / likes / dislikes。
+# 引擎每次调用时现读 profile，调用方改了档案无需重建 MenuPlanner。
+# 同一档次内的抽样权重来自 planner.recommend 学到的口味分 (喜欢/不喜欢/历史 -> 食材与标签亲和度)。
+
+import functools
+import random
+
+from planner.index import RecipeIndex, iter_bits
+from planner.normalize import NORMALIZER, normalize_ingredient
+from planner.recommend import preference_model
+from planner.rules import RED_MEAT, SLOT_POOLS, empty_menu
+from planner.sampler import WeightedSampler
+from planner.shopping import ShoppingList
+import telemetry
+from telemetry import gauge, timed
+
+_INDEXES = {}
+_INDEX_LIMIT = 4
+
+
+def build_index(recipes):
+    """同一份 recipes 对象只建一次索引"""
+    hit = _INDEXES.get(id(recipes))
+    if hit is None or hit[0] is not recipes:
+        if len(_INDEXES) >= _INDEX_LIMIT: _INDEXES.pop(next(iter(_INDEXES)))
+        hit = _INDEXES[id(recipes)] = (recipes, RecipeIndex(recipes, NORMALIZER))
+    return hit[1]
+
+
+def drop_index(recipes):
+    """菜谱库换了版本：丢掉旧索引和基于它的抽样器"""
+    hit = _INDEXES.get(id(recipes))
+    if hit is not None and hit[0] is recipes: del _INDEXES[id(recipes)]
+    _sampler.cache_clear(); preference_model.cache_clear()
+
+
+@functools.lru_cache(maxsize=256)
+def _sampler(index, bits, model):
+    """候选位图 -> 别名表抽样器；同一候选集与口味模型只建一次表"""
+    rids = list(iter_bits(bits))
+    return WeightedSampler(rids, model.probabilities(rids))
+
+
+gauge("planner_sampler_cache_hits", lambda: _sampler.cache_info().hits)
+gauge("planner_sampler_cache_misses", lambda: _sampler.cache_info().misses)
+gauge("planner_model_cache_misses", lambda: preference_model.cache_info().misses)
+
+
+class MenuPlanner:
+    def __init__(self, recipes, profile, index=None, rng=None, history=(), params=None):
+        self.recipes = recipes
+        self.profile = profile
+        self.index = index or build_index(recipes)
+        self.rng = rng or random
+        self.history = tuple(history)  # 做过的菜名，旧 -> 新
+        self.params = params           # recommend.Params：temperature / epsilon 等，None 用默认
+
+    @property
+    def model(self):
+        """当前口味模型 (profile 的 likes / dislikes 变了自动换一个)"""
+        p = self.profile
+        return preference_model(self.index, tuple(p['likes']), tuple(p['dislikes']), self.history, self.params)
+
+    def resolve_pool(self, pool_key):
+        """晚餐荤/素池为空时退回午餐池"""
+        if self.index.course(pool_key): return pool_key
+        if 'meat' in pool_key: return 'lunch_meat'
+        if 'veg' in pool_key: return 'lunch_veg'
+        return pool_key
+
+    @timed("planner.pick")
+    def pick_many(self, pool_key, k, exclude_names=(), prefer_type=None):
+        """从菜池不放回地抽 k 道菜"""
+        idx = self.index; p = self.profile
+        safe = idx.safe_pool(pool_key, p['allergens'])
+        if prefer_type == "white_meat": safe &= ~idx.containing_any(RED_MEAT)
+        excluded = idx.named(exclude_names)
+        if not safe & ~excluded: return []
+        tier0 = safe & idx.full_match(p['fridge_items'])
+        final = tier0 if tier0 & ~excluded else safe # 只推荐全匹配的，除非没有
+        if telemetry.enabled(): telemetry.count("planner.dishes_scanned", final.bit_count())
+
+        sampler = _sampler(idx, final, self.model)
+        return [idx.dishes[i] for i in sampler.sample_k(k, exclude=iter_bits(final & excluded), rng=self.rng)]
+
+    def pick(self, pool_key, exclude_names=(), prefer_type=None):
+        picked = self.pick_many(pool_key, 1, exclude_names, prefer_type)
+        return picked[0] if picked else None
+
+    @timed("planner.generate_menu")
+    def generate_menu(self):
+        """生成一天的完整菜单 (含缺货清单)"""
+        ms = empty_menu()
+        ms['breakfast'] = self.pick('breakfast')
+        ms['lunch_meat'] = self.pick('lunch_meat')
+        ms['lunch_veg'] = self.pick('lunch_veg')
+        ms['lunch_soup'] = self.pick('soup')
+        # 晚汤单独抽：冰箱只全匹配一道汤时，排除午汤后会退回整个安全菜池，而不是空着
+        ms['dinner_soup'] = self.pick('soup', [ms['lunch_soup']['name']] if ms['lunch_soup'] else [])
+
+        lunch_ings = ms['lunch_meat']['ingredients'] if ms['lunch_meat'] else []
+        is_red = any(normalize_ingredient(i) in RED_MEAT for i in lunch_ings)
+        pool_dm = self.resolve_pool('dinner_meat')
+        ex = [ms['lunch_meat']['name']] if ms['lunch_meat'] else []
+        ms['dinner_meat'] = (self.pick(pool_dm, ex, "white_meat") if is_red else None) or self.pick(pool_dm, ex)
+        ms['dinner_veg'] = self.pick(self.resolve_pool('dinner_veg'))
+        ms['fruit'] = self.rng.choice(self.recipes['fruit'])
+        ms['shopping_list'] = self.shopping_list(ms)
+        return ms
+
+    def new_shopping(self, menus):
+        """菜单 (一天或多天) 的增量缺货清单，后续换菜/改冰箱只做增量更新"""
+        return ShoppingList.from_menu(menus, self.profile['fridge_items'], NORMALIZER)
+
+    def shopping_list(self, menu):
+        """菜单里冰箱没有的食材"""
+        return self.new_shopping(menu).items()
+
+    def swap(self, menu, slot, pool_key=None, shopping=None):
+        """换掉 menu[slot]，原地更新菜单与缺货清单；没有可换的菜时返回 None
+
+        传入 shopping (ShoppingList) 时只对新旧两道菜做增量更新，否则整份重算。
+        """
+        curr = menu.get(slot)
+        exclude = [curr['name']] if curr else []
+        new_d = self.pick(self.resolve_pool(pool_key or SLOT_POOLS[slot]), exclude)
+        if new_d:
+            menu[slot] = new_d
+            if shopping is not None:
+                shopping.swap(curr, new_d); menu['shopping_list'] = shopping.items()
+            else: menu['shopping_list'] = self.shopping_list(menu)
+        return new_d
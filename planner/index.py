@@ -0,0 +1,158 @@
+# planner/index.py
+# 菜谱预编译索引：加载时建好，选菜时只做位运算
+#
+# 每道菜分配一个整数 ID (rid)，所有"菜品集合"都用 Python int 表示的位图，
+# 第 rid 位为 1 表示该菜在集合里。筛选 = 按位与/或/非，不再逐道菜扫描、也不复制 dict。
+# recipes 来自 catalog (RECIPES_DB.catalog) 时，rid 就是段里的 rid，位图直接从共享段读出，不逐道菜解码；
+# 食材/标签倒排每次用时现从 mmap 解码，各进程不各存一份。
+
+import os
+
+from catalog import is_dish
+
+_CACHE_LIMIT = 256
+POSTINGS_CACHE_BYTES = int(float(os.environ.get("UUKITCHEN_POSTINGS_CACHE_MB", "16")) * 2 ** 20)  # 每个进程最多常驻多少解码后的食材位图
+_NAME_LIMIT = 65536
+
+
+def iter_bits(bits):
+    """按从小到大的顺序返回位图里为 1 的位置"""
+    s = bin(bits)[:1:-1]
+    i = s.find("1")
+    while i >= 0:
+        yield i
+        i = s.find("1", i + 1)
+
+
+class _SegmentIngIds:
+    """rid -> 标准化食材 ID 集合，从段里的食材下标现算"""
+
+    def __init__(self, catalog, slot_ids):
+        self._catalog, self._slot_ids = catalog, slot_ids
+
+    def __getitem__(self, rid):
+        ids = self._slot_ids
+        return frozenset([ids[v] for v in self._catalog.ingredient_slots(rid)])
+
+
+class RecipeIndex:
+    """RECIPES_DB 的倒排索引 (课程 / 菜名 / 食材 -> 菜品位图)"""
+
+    def __init__(self, recipes, normalizer):
+        self.normalizer = normalizer
+        self.dishes = []          # rid -> 原始菜品 dict
+        self.ing_ids = []         # rid -> 标准化食材 ID 集合
+        self.courses = {}         # 课程 key -> 位图
+        self.names = {}           # 菜名 -> 位图 (同名菜可能出现在多个课程)
+        self.postings = {}        # 标准化食材 ID -> 位图
+        self.raw_postings = {}    # 原始食材写法 -> 位图
+        self.tag_postings = {}    # 标签 -> 位图
+        self._catalog = getattr(recipes, 'catalog', None)
+        self._fridge_cache = {}
+        self._pool_cache = {}
+
+        if self._catalog is not None: self._attach(self._catalog)
+        else: self._build(recipes)
+        self.all = 0
+        for bits in self.courses.values(): self.all |= bits
+
+        from planner.allergens import AllergenEngine  # allergens 依赖本模块的 iter_bits
+        self.allergens = AllergenEngine(self)
+
+    def _attach(self, catalog):
+        """段里已有课程/原始食材位图；食材与标签位图按需从段里解码 (catalog.Postings)，不在进程里常驻；
+        菜名位图查到哪个算哪个 (见 named)"""
+        n = self.normalizer
+        self.dishes = catalog.recipes
+        self.courses = catalog.course_bits()
+        self.raw_postings = catalog.raw_postings()
+        self.tag_postings = catalog.tag_postings()
+        self.postings = self.raw_postings.regroup(n.id, POSTINGS_CACHE_BYTES)  # 选菜热路径上要反复整表扫描
+        self.ing_ids = _SegmentIngIds(catalog, [n.id(ing) for ing in catalog.ingredients()])
+
+    def _build(self, recipes):
+        normalizer = self.normalizer
+        for course, pool in recipes.items():
+            bits = 0
+            for d in pool:
+                if not is_dish(d): continue  # 水果是纯字符串，不参与索引
+                rid = len(self.dishes); bit = 1 << rid
+                self.dishes.append(d)
+                bits |= bit
+                self.names[d['name']] = self.names.get(d['name'], 0) | bit
+                ids = []
+                for ing in d['ingredients']:
+                    self.raw_postings[ing] = self.raw_postings.get(ing, 0) | bit
+                    n = normalizer.id(ing); ids.append(n)
+                    self.postings[n] = self.postings.get(n, 0) | bit
+                self.ing_ids.append(frozenset(ids))
+                for t in d.get('tags', ()): self.tag_postings[t] = self.tag_postings.get(t, 0) | bit
+            if bits: self.courses[course] = bits
+
+    def __len__(self):
+        return len(self.dishes)
+
+    def course(self, key):
+        return self.courses.get(key, 0)
+
+    def named(self, names):
+        bits = 0
+        for n in names:
+            b = self.names.get(n)
+            if b is None:
+                b = 0
+                if self._catalog is not None:
+                    for rid in self._catalog.rids_named(n): b |= 1 << rid
+                    if len(self.names) < _NAME_LIMIT: self.names[n] = b
+            bits |= b
+        return bits
+
+    def containing_any(self, raw_names):
+        """原始食材中含有 raw_names 任意一项的菜"""
+        bits = 0
+        for n in raw_names: bits |= self.raw_postings.get(n, 0)
+        return bits
+
+    def with_ingredients(self, names):
+        """标准化食材中含有 names 任意一项的菜"""
+        bits = 0
+        for n in self.normalizer.ids(names): bits |= self.postings.get(n, 0)
+        return bits
+
+    def allergen_mask(self, allergens):
+        """含过敏原的菜 (含同义词与层级，见 planner.allergens)"""
+        eng = self.allergens
+        return eng.excluded(eng.profile_mask(allergens))
+
+    def safe_pool(self, course, allergens):
+        """课程里不含过敏原的菜；相同过敏原组合的用户共用同一份结果"""
+        key = (course, frozenset(allergens))
+        bits = self._pool_cache.get(key)
+        if bits is None:
+            bits = self.course(course) & ~self.allergen_mask(key[1])
+            if len(self._pool_cache) >= _CACHE_LIMIT: self._pool_cache.clear()
+            self._pool_cache[key] = bits
+        return bits
+
+    def norm_fridge(self, fridge):
+        """冰箱食材 -> 标准化 ID 集合"""
+        return self.normalizer.ids(fridge)
+
+    def full_match(self, fridge):
+        """冰箱里食材齐全 (缺 0 样) 的菜：全集减去"任一食材不在冰箱"的菜"""
+        key = self.norm_fridge(fridge)
+        bits = self._fridge_cache.get(key)
+        if bits is None:
+            missing = 0
+            for ing, b in self.postings.items():
+                if ing not in key: missing |= b
+            bits = self.all & ~missing
+            if len(self._fridge_cache) >= _CACHE_LIMIT: self._fridge_cache.clear()
+            self._fridge_cache[key] = bits
+        return bits
+
+    def missing_count(self, rid, fridge):
+        return len(self.ing_ids[rid] - self.norm_fridge(fridge))
+
+    def dishes_of(self, bits):
+        return [self.dishes[i] for i in iter_bits(bits)]
@@ -0,0 +1,96 @@
+# planner/normalize.py
+# 统一的食材标准化引擎 (导入时建好一次)
+#
+# - 同义词表只有一份：recipe_data.SYNONYM_MAP，别名链会被传递解析 (a -> b -> c 直接记为 a -> c)
+# - 标准名驻留为小整数 ID，下游集合运算比较 int，不再反复 strip / 查表
+# - 自由文本 ("两根胡萝卜"、"番茄,鸡蛋") 用 Aho-Corasick 一次扫描提取食材
+
+import re
+import threading
+
+from catalog import is_dish
+from planner.textmatch import AhoCorasick
+from recipe_data import FRIDGE_CATEGORIES, RECIPES_DB, SYNONYM_MAP
+
+_SPLIT = re.compile(r"[,，、;；\s]+")
+
+
+class Normalizer:
+    def __init__(self, synonyms, vocabulary=()):
+        self._alias = {}
+        for raw in synonyms: self._alias[raw.strip()] = self._resolve(synonyms, raw)
+        self.names = []       # ID -> 标准名
+        self._ids = {}        # 标准名 -> ID
+        self._cache = {}      # 原始写法 -> ID (含未 strip 的写法)
+        self._lock = threading.Lock()
+        for target in self._alias.values(): self.id(target)
+        for name in vocabulary: self.id(name)
+        self._matcher = AhoCorasick(list(self._alias) + self.names)
+
+    @staticmethod
+    def _resolve(synonyms, name):
+        seen = set(); cur = name.strip()
+        while cur in synonyms and cur not in seen:
+            seen.add(cur); cur = synonyms[cur].strip()
+        return cur
+
+    def canonical(self, name):
+        s = name.strip()
+        return self._alias.get(s, s)
+
+    def id(self, name):
+        """标准名的 ID，第一次见到时分配"""
+        i = self._cache.get(name)
+        if i is None:
+            c = self.canonical(name)
+            with self._lock:
+                i = self._ids.get(c)
+                if i is None:
+                    i = self._ids[c] = len(self.names); self.names.append(c)
+                self._cache[name] = i
+        return i
+
+    def lookup(self, name):
+        """只查不分配；从没出现过的食材返回 None"""
+        i = self._cache.get(name)
+        return i if i is not None else self._ids.get(self.canonical(name))
+
+    def ids(self, names):
+        out = set()
+        for n in names:
+            i = self.lookup(n)
+            if i is not None: out.add(i)
+        return frozenset(out)
+
+    def name(self, i):
+        return self.names[i]
+
+    def extract(self, text):
+        """从自由文本里提取食材标准名 (按出现顺序、去重)"""
+        return list(dict.fromkeys(self.canonical(p) for p in self._matcher.find_all(text)))
+
+    def parse_items(self, text):
+        """解析用户输入的食材列表：逗号/顿号分隔；认识的词原样保留，不认识的尝试从中提取食材"""
+        out = []
+        for tok in _SPLIT.split(text):
+            if not tok: continue
+            if self.lookup(tok) is not None: out.append(tok)
+            else: out.extend(self.extract(tok) or [tok])
+        return list(dict.fromkeys(out))
+
+
+def _vocabulary():
+    catalog = getattr(RECIPES_DB, 'catalog', None)
+    if catalog is not None: yield from catalog.ingredients()
+    else:
+        for course, pool in RECIPES_DB.items():
+            for d in pool:
+                if is_dish(d): yield from d['ingredients']
+    for items in FRIDGE_CATEGORIES.values(): yield from items
+
+
+NORMALIZER = Normalizer(SYNONYM_MAP, _vocabulary())
+
+
+def normalize_ingredient(name):
+    return NORMALIZER.canonical(name)
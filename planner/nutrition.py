@@ -0,0 +1,269 @@
+# planner/nutrition.py
+# 营养目标配餐：每道菜一个营养向量，按年龄/体重定每日目标，在候选短名单上做有界的坐标下降
+#
+# 营养向量 = Σ 食材常用量 × 每 100g 含量 (recipe_data.INGREDIENT_NUTRIENTS)，对整个菜库一次性算成 n × K 矩阵。
+# 一天的目标按中国居民膳食营养素参考摄入量 (幼儿/儿童分龄) 取值，家里的三餐只负责其中 HOME_SHARE；
+# 档案里的 nutrition_goals ("补钙"、"补铁"…) 提高对应营养素的权重。
+# 损失 = Σ 权重 · (未达标比例)² + 超上限惩罚 + 每样新增采购的惩罚 - 口味分 (planner.recommend)。
+# 搜索：每个槽位先按"单道菜的边际贡献 + 口味 + 随机扰动"取前 SHORTLIST 道，再逐槽位整批 (numpy) 试换，
+# 直到一轮没有改进、跑满 max_passes 或超出时间预算；结果与随机挑菜一样满足过敏原/不重复/红肉规则。
+
+import re
+import threading
+import time
+
+import numpy as np
+
+from planner.engine import MenuPlanner
+from planner.index import iter_bits
+from planner.rules import MENU_SLOTS, RED_MEAT, SLOT_POOLS, empty_menu
+from recipe_data import INGREDIENT_NUTRIENTS, NUTRIENT_FIELDS
+from telemetry import count, timed
+
+HOME_SHARE = 0.7     # 家里三餐覆盖每日目标的比例 (其余来自奶、点心、水果)
+SHORTLIST = 24       # 每个槽位参与搜索的候选数
+GOAL_WEIGHT = 3.0
+BUDGET_MS = 80.0
+
+# 每日参考摄入量：(年龄上限, 参考体重 kg, 各营养素目标，顺序同 NUTRIENT_FIELDS)
+DAILY_TARGETS = [
+    (4, 13, (1000, 25, 35, 130, 8, 500, 10, 4.0, 310, 40)),
+    (7, 19, (1300, 30, 43, 170, 12, 800, 10, 5.5, 360, 50)),
+    (11, 28, (1600, 40, 53, 210, 16, 1000, 13, 7.0, 500, 65)),
+    (18, 50, (2200, 60, 70, 300, 25, 1000, 16, 9.0, 670, 90)),
+    (200, 62, (2000, 60, 60, 280, 25, 800, 15, 10.0, 700, 100)),
+]
+# 超过目标多少倍开始惩罚 (其余营养素多了不罚)
+UPPER_LIMITS = {"energy": 1.15, "fat": 1.3, "vitamin_a": 3.0}
+NUTRIENT_NAMES = {"energy": "能量", "protein": "蛋白质", "fat": "脂肪", "carbs": "碳水", "fiber": "膳食纤维",
+                  "calcium": "钙", "iron": "铁", "zinc": "锌", "vitamin_a": "维A", "vitamin_c": "维C"}
+GOAL_NUTRIENTS = {
+    "补钙": ("calcium",), "补铁": ("iron",), "补锌": ("zinc",), "长高": ("calcium", "protein"),
+    "长肉": ("energy", "protein"), "增重": ("energy", "protein"), "免疫力": ("vitamin_c", "zinc"),
+    "护眼": ("vitamin_a",), "明目": ("vitamin_a",), "通便": ("fiber",), "润肠": ("fiber",), "补蛋白": ("protein",),
+}
+
+_AGE = re.compile(r"(\d+(?:\.\d+)?)\s*(岁半|岁|个月|月)?")
+_LOCK = threading.Lock()
+
+
+def parse_age(text, default=2.0):
+    """"2岁" / "1岁半" / "18个月" / "3" -> 年龄 (岁)"""
+    m = _AGE.search(str(text or ""))
+    if not m: return default
+    n, unit = float(m.group(1)), m.group(2)
+    if unit in ("个月", "月"): return n / 12
+    return n + 0.5 if unit == "岁半" else n
+
+
+def _number(text):
+    try: return float(str(text).strip())
+    except (TypeError, ValueError): return None
+
+
+def daily_targets(profile):
+    """档案 -> 家里三餐每天应提供的营养 (K 维向量)"""
+    age = parse_age(profile.get('age'))
+    _, ref_weight, base = next((t for t in DAILY_TARGETS if age < t[0]), DAILY_TARGETS[-1])  # 超出最后一档按成人算
+    target = np.array(base, dtype=float)
+    weight = _number(profile.get('weight'))
+    if weight and 5 <= weight <= 150:  # 能量与蛋白质按实际体重微调
+        scale = min(max(weight / ref_weight, 0.8), 1.25)
+        target[[NUTRIENT_FIELDS.index("energy"), NUTRIENT_FIELDS.index("protein")]] *= scale
+    return target * HOME_SHARE
+
+
+def goal_fields(goals):
+    """nutrition_goals -> 涉及的营养素名 (按出现顺序)"""
+    out = []
+    for g in goals or ():
+        for key, fields in GOAL_NUTRIENTS.items():
+            if key in g: out.extend(f for f in fields if f not in out)
+    return out
+
+
+def goal_weights(goals):
+    w = np.ones(len(NUTRIENT_FIELDS))
+    for f in goal_fields(goals): w[NUTRIENT_FIELDS.index(f)] = GOAL_WEIGHT
+    return w
+
+
+class NutrientMatrix:
+    """整个菜库的营养矩阵 (n × K) 与 菜 × 标准化食材 的稀疏关联 (算缺货数用)"""
+
+    def __init__(self, index):
+        n = len(index); norm = index.normalizer
+        per_ing = {}
+        for name, (grams, per100) in INGREDIENT_NUTRIENTS.items():
+            per_ing[name] = np.asarray(per100, dtype=float) * grams / 100
+        rows, vecs = [], []
+        for raw, bits in index.raw_postings.items():
+            v = per_ing.get(raw)
+            if v is None: v = per_ing.get(norm.canonical(raw))  # 写法不同 (番茄) 时按标准名查
+            if v is None: continue
+            rids = list(iter_bits(bits)); rows.extend(rids); vecs.extend([v] * len(rids))
+        self.values = np.zeros((n, len(NUTRIENT_FIELDS)))
+        if rows: np.add.at(self.values, np.asarray(rows), np.asarray(vecs))
+
+        rows, cols = [], []
+        for ing, bits in index.postings.items():
+            for rid in iter_bits(bits): rows.append(rid); cols.append(ing)
+        self.ing_rows = np.asarray(rows, dtype=np.int64); self.ing_cols = np.asarray(cols, dtype=np.int64)
+        self.n_ings = int(self.ing_cols.max()) + 1 if len(cols) else 0
+        self.red = np.zeros(n, dtype=bool)
+        self.red[list(iter_bits(index.containing_any(RED_MEAT) | index.with_ingredients(RED_MEAT)))] = True
+        self._pools = {}
+
+    def missing(self, have):
+        """每道菜缺几样 (have: 已有的标准化食材 ID 集合)"""
+        lack = np.ones(max(self.n_ings, 1))
+        ids = [i for i in have if i < self.n_ings]
+        if ids: lack[ids] = 0
+        return np.bincount(self.ing_rows, weights=lack[self.ing_cols], minlength=len(self.values))
+
+    def pool(self, index, bits):
+        """候选位图 -> rid 数组 (同一菜池/过敏原组合只转一次)"""
+        rids = self._pools.get(bits)
+        if rids is None:
+            if len(self._pools) >= 64: self._pools.clear()
+            rids = self._pools[bits] = np.fromiter(iter_bits(bits), dtype=np.int64)
+        return rids
+
+
+def nutrient_matrix(index):
+    """每个索引建一次 (首次配餐时)"""
+    nm = getattr(index, "_nutrients", None)
+    if nm is None:
+        with _LOCK:
+            nm = getattr(index, "_nutrients", None)
+            if nm is None: nm = index._nutrients = NutrientMatrix(index)
+    return nm
+
+
+def nutrition_report(menu, index, profile):
+    """菜单的营养 / 每日目标 (按营养素名)"""
+    nm = nutrient_matrix(index)
+    total = np.zeros(len(NUTRIENT_FIELDS))
+    for s in MENU_SLOTS:
+        d = menu.get(s)
+        if d:
+            for rid in iter_bits(index.named([d['name']])): total += nm.values[rid]; break
+    return dict(zip(NUTRIENT_FIELDS, np.round(total / daily_targets(profile), 3).tolist()))
+
+
+class NutritionPlanner(MenuPlanner):
+    """按营养目标配餐；换菜 (swap) 仍沿用 MenuPlanner 的按口味随机"""
+
+    def __init__(self, recipes, profile, index=None, rng=None, history=(), params=None,
+                 shopping_penalty=0.1, taste_weight=0.05, noise=0.05, max_passes=4, budget_ms=BUDGET_MS):
+        super().__init__(recipes, profile, index, rng, history, params)
+        self.shopping_penalty, self.taste_weight, self.noise = shopping_penalty, taste_weight, noise
+        self.max_passes, self.budget_ms = max_passes, budget_ms
+        self.nutrients = nutrient_matrix(self.index)
+        self._upper = np.full(len(NUTRIENT_FIELDS), np.inf)
+        for f, r in UPPER_LIMITS.items(): self._upper[NUTRIENT_FIELDS.index(f)] = r
+
+    def _loss(self, totals, target, weights):
+        """totals: (..., K)"""
+        r = totals / target
+        return (weights * np.maximum(1 - r, 0) ** 2).sum(-1) + 2 * (np.maximum(r - self._upper, 0) ** 2).sum(-1)
+
+    def _shortlist(self, slot, exclude, missing, target, weights, taste):
+        idx = self.index; nm = self.nutrients
+        bits = idx.safe_pool(self.resolve_pool(SLOT_POOLS[slot]), self.profile['allergens'])
+        rids = nm.pool(idx, bits)
+        if len(exclude): rids = rids[~np.isin(rids, exclude)]
+        count("planner.dishes_scanned", len(rids))
+        if not len(rids): return rids
+        gain = (weights * np.minimum(nm.values[rids] / target, 1)).sum(1)  # 单道菜能补多少缺口
+        score = gain + self.taste_weight * taste[rids] - self.shopping_penalty * missing[rids]
+        score += self.noise * np.random.default_rng(self.rng.getrandbits(32)).random(len(rids))  # 每次配餐略有不同
+        if len(rids) <= SHORTLIST: return rids[np.argsort(-score)]
+        top = np.argpartition(-score, SHORTLIST)[:SHORTLIST]
+        white = np.flatnonzero(~nm.red[rids])  # 另留一批非红肉，别的槽位已有红肉时也有菜可换
+        if len(white) > SHORTLIST // 2: white = white[np.argpartition(-score[white], SHORTLIST // 2)[:SHORTLIST // 2]]
+        top = np.union1d(top, white)
+        return rids[top[np.argsort(-score[top])]]
+
+    @timed("planner.optimize_day")
+    def optimize_day(self, target, weights, exclude=(), have=()):
+        """一天的 {槽位: rid}；exclude 为不能选的 rid，have 为已有 (冰箱 + 已买) 的食材 ID"""
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        nm = self.nutrients; idx = self.index
+        missing = nm.missing(set(have) | self.index.norm_fridge(self.profile['fridge_items']))
+        taste = self.model.scores
+        exclude = np.asarray(sorted(exclude), dtype=np.int64)
+        cands = {s: self._shortlist(s, exclude, missing, target, weights, taste) for s in MENU_SLOTS}
+        names = {s: [idx.dishes[r]['name'] for r in c] for s, c in cands.items()}
+        # 每个候选的固定代价：新增采购 - 口味
+        fixed = {s: self.shopping_penalty * missing[c] - self.taste_weight * taste[c] for s, c in cands.items()}
+
+        pick = {}
+        for s in MENU_SLOTS:  # 初始解：按短名单顺序取第一个不冲突的
+            for j in range(len(cands[s])):
+                if self._ok(s, j, pick, cands, names): pick[s] = j; break
+        totals = sum((nm.values[cands[s][j]] for s, j in pick.items()), np.zeros(len(NUTRIENT_FIELDS)))
+
+        for _ in range(self.max_passes):
+            improved = False
+            for s in MENU_SLOTS:
+                if not len(cands[s]) or time.perf_counter() > deadline: continue
+                base = totals - nm.values[cands[s][pick[s]]] if s in pick else totals
+                cost = self._loss(base + nm.values[cands[s]], target, weights) + fixed[s]
+                for j in np.argsort(cost):
+                    if not self._ok(s, j, pick, cands, names): continue
+                    if s not in pick or cost[j] < cost[pick[s]] - 1e-9:
+                        pick[s] = int(j); totals = base + nm.values[cands[s][j]]; improved = True
+                    break
+            if not improved or time.perf_counter() > deadline: break
+        return {s: int(cands[s][j]) for s, j in pick.items()}
+
+    def _ok(self, slot, j, pick, cands, names):
+        """同一天不重名、最多一道红肉"""
+        rid = cands[slot][j]; name = names[slot][j]
+        for s, k in pick.items():
+            if s == slot: continue
+            if names[s][k] == name: return False
+            if self.nutrients.red[rid] and self.nutrients.red[cands[s][k]]: return False
+        return True
+
+    def _menu(self, day):
+        menu = empty_menu()
+        for s, rid in day.items(): menu[s] = self.index.dishes[rid]
+        return menu
+
+    def generate_menu(self):
+        """营养最优的一天 (含水果与缺货清单)"""
+        p = self.profile
+        menu = self._menu(self.optimize_day(daily_targets(p), goal_weights(p.get('nutrition_goals'))))
+        menu['fruit'] = self.rng.choice(self.recipes['fruit'])
+        menu['shopping_list'] = self.shopping_list(menu)
+        return menu
+
+    def plan_week(self, days=7, no_repeat_days=3):
+        """与 WeeklyPlanner.plan_week 同样的返回结构；前几天没达标的营养素后几天补上"""
+        p = self.profile
+        target = daily_targets(p); weights = goal_weights(p.get('nutrition_goals'))
+        plan, got, have = [], np.zeros(len(target)), set()
+        fruits = list(self.recipes['fruit']); menus = []
+        for d in range(days):
+            behind = np.clip((d * target - got) / target, 0, 0.5)  # 累计欠多少天的量，最多多补半天
+            exclude = {r for day in plan[max(0, d - no_repeat_days + 1):] for r in day.values()}
+            exclude = set(iter_bits(self.index.named({self.index.dishes[r]['name'] for r in exclude})))
+            day = self.optimize_day(target * (1 + behind), weights, exclude, have)
+            plan.append(day)
+            for rid in day.values():
+                got += self.nutrients.values[rid]; have |= self.index.ing_ids[rid]
+            menu = self._menu(day)
+            recent = {m['fruit'] for m in menus[-no_repeat_days + 1:]} if no_repeat_days > 1 else set()
+            menu['fruit'] = self.rng.choice([f for f in fruits if f not in recent] or fruits)
+            menu['shopping_list'] = self.shopping_list(menu)
+            menus.append(menu)
+        week = self.new_shopping(menus)
+        return {"days": menus, "shopping_list": week.items(), "quantities": week.quantities()}
+
+
+def planner_for(recipes, profile, **kwargs):
+    """有营养目标时按目标配餐 (NutritionPlanner)，否则按口味随机 (MenuPlanner)"""
+    cls = NutritionPlanner if profile.get('nutrition_goals') else MenuPlanner
+    return cls(recipes, profile, **kwargs)
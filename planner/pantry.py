@@ -0,0 +1,95 @@
+# planner/pantry.py
+# "冰箱里有什么就做什么"：全部课程的菜按冰箱覆盖度排序，取前 k 道并列出还缺的食材
+#
+# 每道菜维护一个"冰箱里已有几样"的计数 (numpy 数组)。冰箱增减一样食材时，只沿倒排索引
+# (该食材 -> 含它的菜) 给这些菜 +1 / -1，不重扫整个菜库；多选框每次勾选只动一列。
+# 排序分 = 覆盖度 (已有 / 总数) + taste_weight · 口味分 (planner.recommend)，过敏原不安全的菜和
+# 一样都没有的菜不参与。取前 k 用 argpartition 只在"至少有一样"的候选里做 O(n) 的选择，不整体排序。
+
+import threading
+
+import numpy as np
+
+from planner.index import iter_bits
+from planner.recommend import preference_model
+from telemetry import count, timed
+
+_LOCK = threading.Lock()
+
+
+class PantryPostings:
+    """每个索引一份：标准化食材 ID -> 含它的菜 (rid 数组)，以及每道菜的食材总数"""
+
+    def __init__(self, index):
+        self.rids = {ing: np.fromiter(iter_bits(bits), dtype=np.int64) for ing, bits in index.postings.items()}
+        self.sizes = np.zeros(len(index), dtype=np.int32)
+        for rids in self.rids.values(): self.sizes[rids] += 1
+
+
+def pantry_postings(index):
+    pp = getattr(index, "_pantry", None)
+    if pp is None:
+        with _LOCK:
+            pp = getattr(index, "_pantry", None)
+            if pp is None: pp = index._pantry = PantryPostings(index)
+    return pp
+
+
+class FridgeQuery:
+    """按冰箱覆盖度查菜；set_fridge() 增量更新，top() 出结果。一个会话一份 (非线程安全)"""
+
+    def __init__(self, index, taste_weight=0.1):
+        self.index = index
+        self.taste_weight = taste_weight
+        self.postings = pantry_postings(index)
+        self.matched = np.zeros(len(index), dtype=np.int32)
+        self.fridge = frozenset()
+        self._unsafe = {}
+
+    def set_fridge(self, items):
+        """冰箱食材 (原始写法) -> 只对增减的食材更新计数；返回这次改动了几样"""
+        new = frozenset(self.index.norm_fridge(items))
+        added, removed = new - self.fridge, self.fridge - new
+        for ing in added:
+            rids = self.postings.rids.get(ing)
+            if rids is not None: self.matched[rids] += 1; count("pantry.rids_updated", len(rids))
+        for ing in removed:
+            rids = self.postings.rids.get(ing)
+            if rids is not None: self.matched[rids] -= 1; count("pantry.rids_updated", len(rids))
+        self.fridge = new
+        return len(added) + len(removed)
+
+    def _unsafe_mask(self, allergens):
+        key = frozenset(allergens)
+        mask = self._unsafe.get(key)
+        if mask is None:
+            mask = np.zeros(len(self.index), dtype=bool)
+            if key: mask[list(iter_bits(self.index.allergen_mask(key)))] = True
+            self._unsafe[key] = mask
+        return mask
+
+    @timed("pantry.top")
+    def top(self, profile, k=10, history=(), params=None):
+        """[{"dish", "coverage", "matched", "missing"}]，按分数从高到低；同名菜 (出现在多个课程) 只留一道"""
+        self.set_fridge(profile['fridge_items'])
+        sizes = self.postings.sizes
+        cand = np.flatnonzero((self.matched > 0) & ~self._unsafe_mask(profile['allergens']))
+        count("pantry.candidates", len(cand))
+        if not len(cand): return []
+        coverage = self.matched[cand] / sizes[cand]
+        model = preference_model(self.index, tuple(profile['likes']), tuple(profile['dislikes']), tuple(history), params)
+        score = coverage + self.taste_weight * model.scores[cand]
+        m = min(len(cand), 2 * k)  # 多取一些，去掉同名后仍够 k 道
+        top = np.argpartition(-score, m - 1)[:m] if len(cand) > m else np.arange(len(cand))
+        out, seen = [], set()
+        norm = self.index.normalizer
+        for j in top[np.argsort(-score[top], kind="stable")]:
+            rid = int(cand[j]); d = self.index.dishes[rid]
+            if d['name'] in seen: continue
+            seen.add(d['name'])
+            ids = self.index.ing_ids[rid]
+            out.append({"dish": d, "coverage": round(float(coverage[j]), 3),
+                        "matched": sorted(norm.name(i) for i in ids & self.fridge),
+                        "missing": sorted(norm.name(i) for i in ids - self.fridge)})
+            if len(out) >= k: break
+        return out
@@ -0,0 +1,118 @@
+# planner/recommend.py
+# 口味学习：菜 × 特征 (标准化食材 + 标签) 稀疏矩阵，整库打分 = 一次矩阵-向量乘
+#
+# 用户的喜欢 / 不喜欢 / 做过的菜 (history) 各自折成特征亲和度：
+#   w = Σ 权重 · 菜的特征行 / (Σ|权重| + shrink)，越早的反馈按 decay 衰减，反馈少时整体收缩到 0
+# 再给直接点过的菜本身一个偏置 b。scores = X @ w + b 对整个菜库算一次，按口味缓存。
+# 抽样概率 = (1 - epsilon) · softmax(score / temperature) + epsilon · 均匀：
+# temperature 越低越贪心 (只挑最合口味的)，epsilon 保证没吃过的菜也有机会出现。
+
+import functools
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+from planner.index import iter_bits
+
+Params = namedtuple("Params", "temperature epsilon like dislike history decay shrink bias")
+DEFAULT_PARAMS = Params(temperature=0.2, epsilon=0.05, like=1.0, dislike=-1.5, history=0.3, decay=0.97, shrink=2.0, bias=2.0)
+
+_LOCK = threading.Lock()
+_MIN_P = 1e-12   # 概率下限：温度很低且 epsilon=0 时 softmax 会下溢成 0，而别名表要求权重为正
+
+
+def check_params(params):
+    """参数越界直接报错，而不是等到抽样时才出怪结果"""
+    if not params.temperature > 0: raise ValueError(f"temperature 应大于 0: {params.temperature}")
+    if not 0 <= params.epsilon <= 1: raise ValueError(f"epsilon 应在 [0, 1] 内: {params.epsilon}")
+    if not 0 < params.decay <= 1: raise ValueError(f"decay 应在 (0, 1] 内: {params.decay}")
+    if params.shrink < 0: raise ValueError(f"shrink 不能为负: {params.shrink}")
+    return params
+
+
+class FeatureMatrix:
+    """CSR 形式的 菜 × 特征 矩阵 (每行 L2 归一)，从索引的倒排位图直接构造"""
+
+    def __init__(self, index):
+        self.index = index
+        self.n = len(index)
+        rows, cols = [], []
+        self.features = []    # 列 -> ("ing", 食材 ID) / ("tag", 标签)
+        for kind, postings in (("ing", index.postings), ("tag", index.tag_postings)):
+            for key, bits in postings.items():
+                c = len(self.features); self.features.append((kind, key))
+                for rid in iter_bits(bits): rows.append(rid); cols.append(c)
+        rows = np.asarray(rows, dtype=np.int64); cols = np.asarray(cols, dtype=np.int64)
+        order = np.argsort(rows, kind="stable")
+        self.rows, self.cols = rows[order], cols[order]
+        counts = np.bincount(self.rows, minlength=self.n)
+        self.indptr = np.concatenate(([0], np.cumsum(counts)))
+        self.vals = (1.0 / np.sqrt(np.maximum(counts, 1)))[self.rows]
+
+    def matvec(self, w):
+        """X @ w"""
+        return np.bincount(self.rows, weights=w[self.cols] * self.vals, minlength=self.n)
+
+    def add_row(self, w, rid, weight):
+        """w += weight · X[rid]"""
+        a, b = self.indptr[rid], self.indptr[rid + 1]
+        np.add.at(w, self.cols[a:b], weight * self.vals[a:b])
+
+
+def feature_matrix(index):
+    """每个索引建一次 (首次打分时)"""
+    fm = getattr(index, "_features", None)
+    if fm is None:
+        with _LOCK:
+            fm = getattr(index, "_features", None)
+            if fm is None: fm = index._features = FeatureMatrix(index)
+    return fm
+
+
+class PreferenceModel:
+    def __init__(self, index, likes=(), dislikes=(), history=(), params=DEFAULT_PARAMS):
+        fm = feature_matrix(index)
+        self.params = check_params(params)
+        w = np.zeros(len(fm.features)); b = np.zeros(fm.n); total = 0.0
+        feedback = ((likes, params.like, params.bias), (dislikes, params.dislike, params.bias), (history, params.history, 0.0))
+        for names, strength, bias in feedback:
+            # 列表末尾是最近的反馈
+            for age, name in enumerate(reversed(names)):
+                weight = strength * params.decay ** age
+                rids = list(iter_bits(index.named([name])))
+                for rid in rids:
+                    fm.add_row(w, rid, weight / len(rids))
+                    b[rid] += bias * weight
+                total += abs(weight)
+        self.w = w / (total + params.shrink)
+        self.scores = fm.matvec(self.w) + b
+
+    def probabilities(self, rids):
+        """候选菜 (rid 数组) 的抽样概率"""
+        p = self.params
+        s = self.scores[rids] / p.temperature
+        e = np.exp(s - s.max()); e /= e.sum()
+        prob = np.maximum((1 - p.epsilon) * e + p.epsilon / len(rids), _MIN_P)
+        return prob / prob.sum()
+
+    def top(self, bits, k=10):
+        """候选里得分最高的 k 个 rid"""
+        rids = np.fromiter(iter_bits(bits), dtype=np.int64)
+        return rids[np.argsort(-self.scores[rids], kind="stable")[:k]].tolist()
+
+
+@functools.lru_cache(maxsize=256)
+def preference_model(index, likes, dislikes, history, params=None):
+    """同一份口味 (likes / dislikes / history 均为 tuple) 只建一次模型"""
+    return PreferenceModel(index, likes, dislikes, history, params or DEFAULT_PARAMS)
+
+
+def history_names(items):
+    """HistoryStore 的记录 (最新在前) -> 做过的菜名，旧 -> 新"""
+    out = []
+    for item in reversed(items):
+        m = item.get('menu', {})
+        for v in (m.get('breakfast'), *m.get('lunch', ()), *m.get('dinner', ())):
+            if isinstance(v, str) and v: out.append(v)
+    return tuple(out)
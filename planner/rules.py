@@ -0,0 +1,25 @@
+# planner/rules.py
+# 菜单规则常量：红肉、菜单槽位与菜池的对应关系 (同义词见 recipe_data.SYNONYM_MAP / planner.normalize)
+
+from catalog import is_dish
+
+RED_MEAT = ["牛肉", "猪肉", "排骨", "羊肉", "猪肝"]
+
+# 菜单槽位 -> 菜池 (RECIPES_DB 的 key)
+SLOT_POOLS = {
+    "breakfast": "breakfast",
+    "lunch_meat": "lunch_meat", "lunch_veg": "lunch_veg", "lunch_soup": "soup",
+    "dinner_meat": "dinner_meat", "dinner_veg": "dinner_veg", "dinner_soup": "soup",
+}
+MENU_SLOTS = list(SLOT_POOLS)
+
+
+def empty_menu():
+    menu = {k: None for k in MENU_SLOTS}
+    menu["fruit"] = None; menu["shopping_list"] = []
+    return menu
+
+
+def menu_names(menu):
+    """菜单只保留菜名，便于 JSON 输出与跨进程传递"""
+    return {k: (v['name'] if is_dish(v) else v) for k, v in menu.items()}
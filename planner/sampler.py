@@ -0,0 +1,76 @@
+# planner/sampler.py
+# 加权随机抽样：Vose 别名表，建表 O(n)，每次抽样 O(1)
+#
+# 旧版做法是 weighted.extend([d] * score)，一道"喜欢且食材齐全"的菜就往列表里塞 160 个引用，
+# 每次调用都重建。这里建一次表即可反复抽样，并支持排除/不放回抽样。
+
+import bisect
+import itertools
+import random
+
+_MAX_REJECT = 32
+
+
+class WeightedSampler:
+    """按权重抽取 items (需可哈希)；rng 可传入 random.Random(seed) 以获得可复现结果"""
+
+    def __init__(self, items, weights, rng=None):
+        self.items = list(items)
+        self.weights = [float(w) for w in weights]
+        if len(self.items) != len(self.weights): raise ValueError("items 与 weights 长度不一致")
+        if any(w <= 0 for w in self.weights): raise ValueError("权重必须为正数")
+        self.rng = rng or random
+        self._pos = {it: i for i, it in enumerate(self.items)}
+        n = len(self.items)
+        self._prob = [1.0] * n
+        self._alias = list(range(n))
+        if not n: return
+        total = sum(self.weights)
+        scaled = [w * n / total for w in self.weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop(); l = large[-1]
+            self._prob[s] = scaled[s]; self._alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            if scaled[l] < 1.0: small.append(large.pop())
+        # 剩下的因浮点误差落在 1 附近，概率直接记为 1
+
+    def __len__(self):
+        return len(self.items)
+
+    def _draw(self, rng):
+        i = int(rng.random() * len(self.items))
+        return i if rng.random() < self._prob[i] else self._alias[i]
+
+    def _exact(self, taken, rng):
+        # 排除项占了大部分权重时拒绝采样会空转，改为在剩余项上做累积权重二分
+        rest = [i for i in range(len(self.items)) if i not in taken]
+        if not rest: return None
+        cum = list(itertools.accumulate(self.weights[i] for i in rest))
+        return rest[bisect.bisect_right(cum, rng.random() * cum[-1])]
+
+    def _pick(self, taken, rng):
+        for _ in range(_MAX_REJECT):
+            i = self._draw(rng)
+            if i not in taken: return i
+        return self._exact(taken, rng)
+
+    def _excluded(self, exclude):
+        return {self._pos[it] for it in exclude if it in self._pos}
+
+    def sample(self, exclude=(), rng=None):
+        """抽一个；exclude 里的元素不会被抽中，全被排除时返回 None"""
+        return (self.sample_k(1, exclude, rng) or [None])[0]
+
+    def sample_k(self, k, exclude=(), rng=None):
+        """不放回地抽 k 个 (不足 k 个时返回全部剩余)"""
+        rng = rng or self.rng
+        if not self.items: return []
+        taken = self._excluded(exclude)
+        out = []
+        while len(out) < k:
+            i = self._pick(taken, rng)
+            if i is None: break
+            taken.add(i); out.append(self.items[i])
+        return out
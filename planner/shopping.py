@@ -0,0 +1,121 @@
+# planner/shopping.py
+# 增量维护的缺货清单：引用计数的食材多重集
+#
+# 每道菜上桌/撤下时只对它自己的食材做 +1/-1；冰箱增减时只翻转受影响的食材。
+# 缺货 = 有菜需要 (计数 > 0) 且冰箱里没有。换一道菜的代价只和这两道菜的食材数有关，
+# 与菜单 (或整周计划) 的总食材数无关。full_ingredients 里写明的用量 ("老南瓜 60g") 在
+# quantities() 时才按菜解析汇总，增减菜品不触碰冷字段。
+
+import functools
+import re
+from collections import Counter
+
+from catalog import is_dish
+from planner.normalize import NORMALIZER
+
+_PART_SPLIT = re.compile(r"[,，、;；]+")
+_QTY = re.compile(r"^(.*?)\s*(\d+(?:\.\d+)?)\s*(kg|g|克|千克|ml|毫升|个|根|片|勺|颗|只)?$")
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_quantities(full_ingredients):
+    """'老南瓜 60g，小米 30g' -> ((南瓜ID, 'g', 60.0), (小米ID, 'g', 30.0))；没写用量的部分跳过"""
+    out = []
+    for part in _PART_SPLIT.split(full_ingredients or ""):
+        m = _QTY.match(part.strip())
+        if not m or not m.group(1): continue
+        name, amount, unit = m.group(1).strip(), float(m.group(2)), m.group(3) or ""
+        i = NORMALIZER.lookup(name)
+        if i is None:
+            found = NORMALIZER.extract(name)
+            i = NORMALIZER.lookup(found[0]) if found else None
+        if i is not None: out.append((i, unit, amount))
+    return tuple(out)
+
+
+class ShoppingList:
+    def __init__(self, fridge_items=(), normalizer=NORMALIZER):
+        self.normalizer = normalizer
+        self.fridge = set(normalizer.ids(fridge_items))
+        self.need = Counter()     # 食材 ID -> 需要它的菜数
+        self.spelling = {}        # 食材 ID -> Counter(原始写法)，显示用
+        self.dishes = {}          # 菜名 -> [菜, 份数]；用量在 quantities() 时才解析 (full_ingredients 是冷字段)
+        self.missing = {}         # 缺货食材 ID (dict 保持加入顺序)
+
+    @classmethod
+    def from_menu(cls, menus, fridge_items, normalizer=NORMALIZER):
+        """从一天 (dict) 或多天 (list of dict) 的菜单建清单"""
+        sl = cls(fridge_items, normalizer)
+        for menu in ([menus] if isinstance(menus, dict) else menus):
+            for d in menu.values():
+                if is_dish(d): sl.add_dish(d)
+        return sl
+
+    # ---- 菜品增减 ----
+    def add_dish(self, dish):
+        for raw in dish['ingredients']:
+            i = self.normalizer.id(raw)
+            self.need[i] += 1
+            self.spelling.setdefault(i, Counter())[raw] += 1
+            if self.need[i] == 1 and i not in self.fridge: self.missing[i] = None
+        self.dishes.setdefault(dish['name'], [dish, 0])[1] += 1
+
+    def remove_dish(self, dish):
+        """按菜名撤下一份 (菜谱热加载后换了对象也认得)；清单里没有这道菜时抛 KeyError"""
+        entry = self.dishes.get(dish['name'])
+        if entry is None: raise KeyError(f"缺货清单里没有这道菜: {dish['name']}")
+        dish = entry[0]  # 按加入时的那份食材扣减，计数始终对得上
+        entry[1] -= 1
+        if not entry[1]: del self.dishes[dish['name']]
+        for raw in dish['ingredients']:
+            i = self.normalizer.id(raw)
+            self.need[i] -= 1
+            self.spelling[i][raw] -= 1
+            if self.need[i] <= 0:
+                del self.need[i]; del self.spelling[i]
+                self.missing.pop(i, None)
+
+    def swap(self, old, new):
+        if old: self.remove_dish(old)
+        if new: self.add_dish(new)
+
+    # ---- 冰箱增减 ----
+    def add_fridge(self, items):
+        for i in self.normalizer.ids(items):
+            self.fridge.add(i); self.missing.pop(i, None)
+
+    def remove_fridge(self, items):
+        for i in self.normalizer.ids(items):
+            self.fridge.discard(i)
+            if self.need.get(i): self.missing[i] = None
+
+    def set_fridge(self, items):
+        new = set(self.normalizer.ids(items))
+        for i in self.fridge - new:
+            if self.need.get(i): self.missing[i] = None
+        for i in new - self.fridge: self.missing.pop(i, None)
+        self.fridge = new
+
+    # ---- 输出 ----
+    def _label(self, i):
+        return self.spelling[i].most_common(1)[0][0]
+
+    def items(self):
+        """缺货食材 (原始写法)，与旧版 shopping_list 一致"""
+        return [self._label(i) for i in self.missing]
+
+    def quantities(self):
+        """缺货食材 -> 用量说明：写明用量的按单位汇总，否则给出用到它的菜数"""
+        qty = {}
+        for dish, n in self.dishes.values():
+            for i, unit, amount in parse_quantities(dish.get('full_ingredients', '')):
+                if i in self.missing: qty.setdefault(i, Counter())[unit] += amount * n
+        out = {}
+        for i in self.missing:
+            q = qty.get(i)
+            if q: out[self._label(i)] = " + ".join(f"{amount:g}{unit}" for unit, amount in q.items())
+            else: out[self._label(i)] = f"×{self.need[i]}"
+        return out
+
+    def __len__(self):
+        return len(self.missing)
@@ -0,0 +1,65 @@
+# planner/textmatch.py
+# Aho-Corasick 多模式匹配：一次扫描文本，找出词表里出现的所有词
+
+from collections import deque
+
+
+class AhoCorasick:
+    def __init__(self, patterns=()):
+        self._goto = [{}]     # 状态 -> {字符: 下一状态}
+        self._fail = [0]
+        self._out = [()]      # 状态 -> 在此结束的模式 (按长度从长到短)
+        self._built = True
+        for p in patterns: self.add(p)
+        self.build()
+
+    def add(self, pattern):
+        if not pattern: return
+        s = 0
+        for ch in pattern:
+            nxt = self._goto[s].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[s][ch] = nxt
+                self._goto.append({}); self._fail.append(0); self._out.append(())
+            s = nxt
+        if pattern not in self._out[s]: self._out[s] = (pattern,) + self._out[s]
+        self._built = False
+
+    def build(self):
+        q = deque()
+        for s in self._goto[0].values():
+            self._fail[s] = 0; q.append(s)
+        while q:
+            r = q.popleft()
+            for ch, s in self._goto[r].items():
+                q.append(s)
+                f = self._fail[r]
+                while f and ch not in self._goto[f]: f = self._fail[f]
+                nf = self._goto[f].get(ch, 0)
+                self._fail[s] = nf if nf != s else 0
+                self._out[s] = tuple(sorted(set(self._out[s] + self._out[self._fail[s]]), key=len, reverse=True))
+        self._built = True
+
+    def iter_matches(self, text):
+        """产出 (起始位置, 模式)，包含重叠匹配"""
+        if not self._built: self.build()
+        s = 0
+        for i, ch in enumerate(text):
+            while s and ch not in self._goto[s]: s = self._fail[s]
+            s = self._goto[s].get(ch, 0)
+            for p in self._out[s]: yield i - len(p) + 1, p
+
+    def contains_any(self, text):
+        return next(self.iter_matches(text), None) is not None
+
+    def find_all(self, text):
+        """最左最长、互不重叠的匹配，按出现顺序返回模式"""
+        best = {}
+        for start, p in self.iter_matches(text):
+            if len(p) > len(best.get(start, "")): best[start] = p
+        out = []; pos = 0
+        for start in sorted(best):
+            if start >= pos:
+                out.append(best[start]); pos = start + len(best[start])
+        return out
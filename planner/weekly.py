@@ -0,0 +1,131 @@
+# planner/weekly.py
+# 一周菜单规划：贪心 + 局部改进
+#
+# 硬约束：过敏原安全；同一天不重复 (午/晚汤自然不同)；N 天内不重复同一道菜；每天最多一道红肉。
+# 目标：一周的缺货清单尽量短 —— 优先选"用已买食材就能做"的菜，再逐槽尝试替换以减少采购种类。
+# 同一档次内按喜好权重随机，候选集全部用 RecipeIndex 位图表示。
+
+from collections import Counter
+
+from planner.engine import MenuPlanner, _sampler
+from planner.rules import MENU_SLOTS, RED_MEAT, SLOT_POOLS
+
+_MAX_TIER = 2        # 贪心时最多接受"新增 2 样采购"的档次，再往上直接按喜好随机
+_MAX_REJECT = 64
+
+
+class WeeklyPlanner(MenuPlanner):
+    def __init__(self, recipes, profile, index=None, rng=None, days=7, no_repeat_days=3, improve_passes=2, history=(), params=None):
+        super().__init__(recipes, profile, index, rng, history, params)
+        self.days = days
+        self.no_repeat_days = no_repeat_days
+        self.improve_passes = improve_passes
+        idx = self.index
+        self._red = idx.containing_any(RED_MEAT) | idx.with_ingredients(RED_MEAT)
+        self._fridge = idx.norm_fridge(profile['fridge_items'])
+        self._miss_cache = {}
+        self._tier_cache = {}
+
+    # ---- 食材与采购 ----
+    def _miss(self, rid):
+        """这道菜需要买的标准化食材 ID"""
+        m = self._miss_cache.get(rid)
+        if m is None: m = self._miss_cache[rid] = self.index.ing_ids[rid] - self._fridge
+        return m
+
+    def _tiers(self, bought):
+        """[至少缺 1 样, 至少缺 2 样, 至少缺 3 样] 的菜品位图 (已买的算有)"""
+        key = frozenset(bought)
+        t = self._tier_cache.get(key)
+        if t is None:
+            one = two = three = 0
+            for ing, b in self.index.postings.items():
+                if ing in self._fridge or ing in key: continue
+                three |= two & b; two |= one & b; one |= b
+            t = self._tier_cache[key] = (one, two, three)
+        return t
+
+    # ---- 约束 ----
+    def _allowed(self, plan, d, slot, relax=0):
+        idx = self.index
+        bits = idx.safe_pool(self.resolve_pool(SLOT_POOLS[slot]), self.profile['allergens'])
+        names = set(); red = False
+        # relax=0：前后 N-1 天内不重复；relax>=1：只保证同一天不重复；relax=2 再放开红肉限制
+        span = 0 if relax else self.no_repeat_days - 1
+        for dd in range(max(d - span, 0), min(d + span, self.days - 1) + 1):
+            for s, rid in plan[dd].items():
+                if rid is None or (dd == d and s == slot): continue
+                names.add(idx.dishes[rid]['name'])
+                if dd == d and self._red >> rid & 1: red = True
+        bits &= ~idx.named(names)
+        if red and relax < 2: bits &= ~self._red
+        return bits
+
+    def _draw(self, bits, course_bits):
+        """在 bits 里按喜好权重抽一道；先用整个菜池的抽样器拒绝采样，命中率低再单独建表"""
+        model = self.model
+        whole = _sampler(self.index, course_bits, model)
+        for _ in range(_MAX_REJECT):
+            rid = whole.sample(rng=self.rng)
+            if bits >> rid & 1: return rid
+        return _sampler(self.index, bits, model).sample(rng=self.rng)
+
+    def _choose(self, allowed, course_bits, bought, max_new):
+        """新增采购最少 (且 < max_new) 的档次里抽一道"""
+        tiers = self._tiers(bought)
+        for k in range(min(max_new, _MAX_TIER + 1)):
+            c = allowed & ~tiers[k]
+            if c: return self._draw(c, course_bits)
+        return None
+
+    # ---- 规划 ----
+    def _fill(self, plan, d, slot, bought):
+        course_bits = self.index.course(self.resolve_pool(SLOT_POOLS[slot]))
+        for relax in range(3):
+            allowed = self._allowed(plan, d, slot, relax)
+            if allowed: break
+        if not allowed: return None
+        rid = self._choose(allowed, course_bits, bought, _MAX_TIER + 1)
+        if rid is None: rid = self._draw(allowed, course_bits)
+        bought.update(self._miss(rid))
+        return rid
+
+    def _improve(self, plan, bought):
+        cells = [(d, s) for d in range(self.days) for s in MENU_SLOTS]
+        for _ in range(self.improve_passes):
+            improved = False
+            self.rng.shuffle(cells)
+            for d, slot in cells:
+                rid = plan[d][slot]
+                if rid is None: continue
+                miss = self._miss(rid)
+                bought.subtract(miss)
+                freed = sum(1 for m in miss if bought[m] <= 0)
+                new = None
+                if freed:
+                    course_bits = self.index.course(self.resolve_pool(SLOT_POOLS[slot]))
+                    new = self._choose(self._allowed(plan, d, slot), course_bits, +bought, freed)
+                if new is None:
+                    bought.update(miss); continue
+                plan[d][slot] = new; bought.update(self._miss(new)); improved = True
+            bought = +bought
+            if not improved: break
+
+    def plan_week(self):
+        """返回 {"days": [每日菜单...], "shopping_list": [整周缺货], "quantities": {缺货: 整周用量}}"""
+        plan = [{s: None for s in MENU_SLOTS} for _ in range(self.days)]
+        bought = Counter()
+        for d in range(self.days):
+            for slot in MENU_SLOTS:
+                plan[d][slot] = self._fill(plan, d, slot, bought)
+        self._improve(plan, bought)
+
+        fruits = list(self.recipes['fruit']); days = []
+        for d in range(self.days):
+            menu = {s: (self.index.dishes[rid] if rid is not None else None) for s, rid in plan[d].items()}
+            recent = {m['fruit'] for m in days[-self.no_repeat_days + 1:]} if self.no_repeat_days > 1 else set()
+            menu['fruit'] = self.rng.choice([f for f in fruits if f not in recent] or fruits)
+            menu['shopping_list'] = self.shopping_list(menu)
+            days.append(menu)
+        week = self.new_shopping(days)
+        return {"days": days, "shopping_list": week.items(), "quantities": week.quantities()}
@@ -0,0 +1,9 @@
+# push: 微信推送 (PushPlus)：菜单文字 + 卡片图，asyncio 队列 + 限并发 + 指数退避重试
+from push.dispatcher import PushDispatcher, PushJob, PushMetrics, PushResult, PushService
+from push.message import build_message, card_menu, menu_html
+from push.sender import PUSHPLUS_URL, PushError, PushPlusSender
+
+__all__ = [
+    "PUSHPLUS_URL", "PushDispatcher", "PushError", "PushJob", "PushMetrics", "PushPlusSender", "PushResult",
+    "PushService", "build_message", "card_menu", "menu_html",
+]
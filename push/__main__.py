@@ -0,0 +1,93 @@
+# python -m push send [--at 07:00] [--profiles profiles.db] [--processes 0] [--no-image]
+# python -m push bench [--n 2000] [--concurrency 32] [--fail-rate 0.1]
+#
+# send：早饭前给所有填了 pushplus_token 的用户批量出菜单并推送 (--at 不给就立即发)；卡片在进程池里渲染，边渲染边发。
+# bench：起一个本地假 PushPlus，测吞吐、延迟与重试，不打真实接口。结果都以 JSON 输出。
+
+import argparse
+import datetime
+import itertools
+import json
+import os
+import time
+
+from push.dispatcher import PushDispatcher, PushJob
+from push.message import build_message
+from push.mock import MockPushServer
+from push.sender import PushPlusSender
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _wait_until(hhmm):
+    h, m = map(int, hhmm.split(":"))
+    now = datetime.datetime.now()
+    at = now.replace(hour=h, minute=m, second=0, microsecond=0)
+    if at <= now: at += datetime.timedelta(days=1)
+    time.sleep((at - now).total_seconds())
+
+
+def _messages(users, menus, args):
+    """按用户顺序逐条产出 PushJob；卡片交给 render_cards 的进程池，渲染好一张发一张"""
+    from render.export import render_cards
+    if args.no_image: cards = itertools.repeat(None)
+    else: cards = (png for _, png, _ in render_cards(((uid, m, p.get("nickname", "")) for (uid, p), m in zip(users, menus)), args.processes))
+    for (uid, p), m, png in zip(users, menus, cards):
+        yield PushJob(uid, p["pushplus_token"], build_message(m, p.get("nickname", ""), with_image=not args.no_image, png=png))
+
+
+def send(args):
+    from planner import plan_batch
+    from storage import ProfileStore
+    store = ProfileStore(args.profiles)
+    users = [(uid, p) for uid, p in store if p.get("pushplus_token")]
+    if args.at: _wait_until(args.at)
+    t = time.perf_counter()
+    menus = plan_batch([p for _, p in users], processes=args.processes)
+    plan_s = time.perf_counter() - t
+    sender = PushPlusSender(args.url, pool_size=args.concurrency)
+    dispatcher = PushDispatcher(sender, concurrency=args.concurrency)
+    results = dispatcher.send_all(_messages(users, menus, args))
+    dispatcher.close(); sender.close()
+    failed = [{"user_id": r.user_id, "error": r.error} for r in results if not r.ok]
+    print(json.dumps({"users": len(users), "plan_s": round(plan_s, 2), "total_s": round(time.perf_counter() - t, 2),
+                      **dispatcher.metrics.summary(), "failures": failed}, ensure_ascii=False))
+    return 0 if not failed else 1
+
+
+def bench(args):
+    from render.card import sample_menu
+    message = build_message(sample_menu(), "Bingo", with_image=not args.no_image)
+    with MockPushServer(fail_rate=args.fail_rate, throttle_rate=args.fail_rate / 2, latency=args.latency, seed=0) as mock:
+        sender = PushPlusSender(mock.url, pool_size=args.concurrency)
+        dispatcher = PushDispatcher(sender, concurrency=args.concurrency, base_delay=args.base_delay)
+        dispatcher.send_all(PushJob(f"u{i}", f"token{i}", message) for i in range(args.n))
+        dispatcher.close(); sender.close()
+        out = {"n": args.n, "concurrency": args.concurrency, "fail_rate": args.fail_rate,
+               "server_requests": mock.requests, **dispatcher.metrics.summary()}
+    print(json.dumps(out, ensure_ascii=False))
+    return 0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m push", description="微信推送 (PushPlus)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("send", help="给所有有 token 的用户推送今日菜单")
+    s.add_argument("--at", help="HH:MM，等到这个时间再发")
+    s.add_argument("--profiles", default=os.path.join(BASE_DIR, "profiles.db"))
+    s.add_argument("--url", help="默认取 UUKITCHEN_PUSHPLUS_URL 或 PushPlus 正式接口")
+    s.add_argument("--processes", type=int, default=0, help="生成菜单与渲染卡片的进程数，0 = 全部 CPU")
+    s.add_argument("--concurrency", type=int, default=16)
+    s.add_argument("--no-image", action="store_true")
+    b = sub.add_parser("bench", help="对本地假服务测吞吐与重试")
+    b.add_argument("--n", type=int, default=2000)
+    b.add_argument("--concurrency", type=int, default=32)
+    b.add_argument("--fail-rate", type=float, default=0.1)
+    b.add_argument("--latency", type=float, default=0.005, help="假服务每个请求的延迟 (秒)")
+    b.add_argument("--base-delay", type=float, default=0.01, help="第一次重试前的等待 (秒)")
+    b.add_argument("--no-image", action="store_true")
+    args = ap.parse_args(argv)
+    return send(args) if args.cmd == "send" else bench(args)
+
+
+raise SystemExit(main())
@@ -0,0 +1,121 @@
+# push/dispatcher.py
+# asyncio 推送队列：固定数量的 worker 从队列取消息，并发有上限，失败按指数退避重试
+#
+# 发送器是同步函数 (requests)，在专用线程池里执行；线程数 = 并发上限 = 连接池大小。
+# 重试延迟 = base_delay * 2^(第几次重试) 再乘 [0.5, 1) 的随机抖动，早饭时间大批量发送不会齐刷刷地重试。
+# 批量发送时消息按需从 jobs 取 (队列有界)，前面的在发、后面的还在渲染，不必全部生成好再开始。
+# PushService 在后台线程里常驻一个事件循环，app 点按钮只是把消息放进队列，不等网络。
+
+import asyncio
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from push.sender import PushError
+
+PushJob = namedtuple("PushJob", "user_id token message")
+PushResult = namedtuple("PushResult", "user_id ok attempts latency error")
+
+
+def _pct(sorted_vals, q):
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * len(sorted_vals)))] if sorted_vals else 0.0
+
+
+class PushMetrics:
+    def __init__(self):
+        self.sent = self.failed = self.retries = 0
+        self.latencies = []   # 每条消息从出队到最终成功/放弃的秒数
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, result):
+        with self._lock:
+            if result.ok: self.sent += 1
+            else: self.failed += 1
+            self.retries += result.attempts - 1
+            self.latencies.append(result.latency)
+
+    def summary(self):
+        with self._lock:
+            lat = sorted(self.latencies); elapsed = time.perf_counter() - self.started
+            return {
+                "sent": self.sent, "failed": self.failed, "retries": self.retries,
+                "throughput_per_sec": round(len(lat) / elapsed, 2) if elapsed else 0.0,
+                "p50_ms": round(_pct(lat, 0.5) * 1000, 2), "p99_ms": round(_pct(lat, 0.99) * 1000, 2),
+            }
+
+
+class PushDispatcher:
+    def __init__(self, sender, concurrency=8, max_attempts=4, base_delay=0.5, max_delay=30.0, rng=None):
+        self.sender = sender
+        self.concurrency = concurrency
+        self.max_attempts, self.base_delay, self.max_delay = max_attempts, base_delay, max_delay
+        self.rng = rng or random.Random()
+        self.metrics = PushMetrics()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="push")
+
+    def backoff(self, attempt):
+        """第 attempt 次失败后等多久 (秒)"""
+        return min(self.max_delay, self.base_delay * 2 ** (attempt - 1)) * (0.5 + self.rng.random() / 2)
+
+    async def deliver(self, job):
+        """发送一条 (含重试)，返回 PushResult，不抛异常"""
+        loop = asyncio.get_running_loop(); t0 = time.perf_counter()
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await loop.run_in_executor(self._executor, self.sender, job.token, job.message)
+                res = PushResult(job.user_id, True, attempt, time.perf_counter() - t0, None); break
+            except PushError as e:
+                if not e.retryable or attempt == self.max_attempts:
+                    res = PushResult(job.user_id, False, attempt, time.perf_counter() - t0, str(e)); break
+                await asyncio.sleep(self.backoff(attempt))
+            except Exception as e:  # 发送器自身的 bug：记为失败，不拖垮整批
+                res = PushResult(job.user_id, False, attempt, time.perf_counter() - t0, f"{type(e).__name__}: {e}"); break
+        self.metrics.record(res)
+        return res
+
+    async def run(self, jobs):
+        """批量发送：jobs 按需读取 (可以是边渲染边产出的生成器)，经有界 asyncio 队列交给 concurrency 个 worker；结果按输入顺序返回"""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=2 * self.concurrency)
+        jobs, end, results = iter(jobs), object(), []
+
+        async def produce():
+            try:
+                with ThreadPoolExecutor(max_workers=1, thread_name_prefix="push-jobs") as ex:  # 取下一条可能要等渲染，不占事件循环
+                    while (job := await loop.run_in_executor(ex, next, jobs, end)) is not end:
+                        results.append(None); await queue.put((len(results) - 1, job))
+            finally:
+                for _ in range(self.concurrency): await queue.put(None)
+
+        async def worker():
+            while (item := await queue.get()) is not None:
+                i, job = item; results[i] = await self.deliver(job)
+
+        await asyncio.gather(produce(), *(worker() for _ in range(self.concurrency)))
+        return results
+
+    def send_all(self, jobs):
+        return asyncio.run(self.run(jobs))
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+class PushService:
+    """后台常驻的事件循环：submit() 立即返回 concurrent.futures.Future"""
+
+    def __init__(self, dispatcher):
+        self.dispatcher = dispatcher
+        self._loop = asyncio.new_event_loop()
+        self._sem = None
+        threading.Thread(target=self._loop.run_forever, name="push-loop", daemon=True).start()
+
+    async def _bounded(self, job):
+        if self._sem is None: self._sem = asyncio.Semaphore(self.dispatcher.concurrency)
+        async with self._sem: return await self.dispatcher.deliver(job)
+
+    def submit(self, job):
+        return asyncio.run_coroutine_threadsafe(self._bounded(job), self._loop)
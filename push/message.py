@@ -0,0 +1,37 @@
+# push/message.py
+# 推送内容：菜单文字 (HTML) + 菜单卡片 PNG (内嵌 base64)，PushPlus 的 html 模板可直接显示
+
+import base64
+import html
+
+from catalog import is_dish
+from render.card import card_menu, menu_card_png
+
+_SECTIONS = [
+    ("🌅 早餐", ["breakfast"]),
+    ("☀️ 午餐", ["lunch_meat", "lunch_veg", "lunch_soup"]),
+    ("🌙 晚餐", ["dinner_meat", "dinner_veg", "dinner_soup"]),
+]
+
+
+def _name(d):
+    return d['name'] if is_dish(d) else d
+
+
+def menu_html(menu, nickname):
+    parts = [f"<h3>{html.escape(nickname)} 的今日食谱</h3>"]
+    for title, slots in _SECTIONS:
+        names = [html.escape(_name(menu.get(s))) for s in slots if menu.get(s)]
+        parts.append(f"<p><b>{title}</b><br>{'<br>'.join(names)}</p>")
+    if menu.get('fruit'): parts.append(f"<p><b>🍎 水果</b><br>{html.escape(menu['fruit'])}</p>")
+    if menu.get('shopping_list'): parts.append(f"<p><b>🛒 需要买</b><br>{html.escape('、'.join(menu['shopping_list']))}</p>")
+    return "".join(parts)
+
+
+def build_message(menu, nickname, with_image=True, png=None):
+    """PushPlus 的请求体 (不含 token)；png 给了就直接用 (批量时由 render_cards 在进程池里渲染好)"""
+    content = menu_html(menu, nickname)
+    if with_image:
+        if png is None: png = menu_card_png(card_menu(menu), nickname)
+        content += f'<img src="data:image/png;base64,{base64.b64encode(png).decode()}" style="width:100%">'
+    return {"title": f"🦴 {nickname} 的今日食谱", "content": content, "template": "html"}
@@ -0,0 +1,61 @@
+# push/mock.py
+# 本地假 PushPlus 服务：按比例返回 500/429、可加延迟，用来测重试与吞吐，不打真实接口
+
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockPushServer:
+    def __init__(self, fail_rate=0.0, throttle_rate=0.0, latency=0.0, port=0, seed=None):
+        self.fail_rate, self.throttle_rate, self.latency = fail_rate, throttle_rate, latency
+        self.received = []      # 成功收下的 (token, title)
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/send"
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive，才能看出连接池的效果
+            disable_nagle_algorithm = True  # 头和正文分两次写，不关 Nagle 每个请求白等 40ms
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if mock.latency: threading.Event().wait(mock.latency)
+                with mock._lock:
+                    mock.requests += 1; r = mock._rng.random()
+                if r < mock.fail_rate: return self._reply(500, {"code": 500, "msg": "mock failure"})
+                if r < mock.fail_rate + mock.throttle_rate: return self._reply(429, {"code": 429, "msg": "slow down"})
+                if not body.get("token"): return self._reply(200, {"code": 903, "msg": "无效的用户token"})
+                with mock._lock: mock.received.append((body["token"], body.get("title")))
+                self._reply(200, {"code": 200, "msg": "请求成功", "data": "mock"})
+
+            def _reply(self, status, payload):
+                raw = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json"); self.send_header("Content-Length", str(len(raw)))
+                self.end_headers(); self.wfile.write(raw)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, name="mock-push", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown(); self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,46 @@
+# push/sender.py
+# HTTP 发送器：一次请求，失败时区分"可重试"与"不必重试"；重试/并发由 push.dispatcher 负责
+#
+# 发送器是可插拔的普通函数 sender(token, message) -> 响应 dict，测试时换成本地 mock 服务或假函数即可。
+# PushPlusSender 在所有线程间共享一个 requests.Session，连接池大小与并发数一致，避免每条消息重新握手。
+
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+
+PUSHPLUS_URL = "https://www.pushplus.plus/send"
+
+
+class PushError(Exception):
+    def __init__(self, message, retryable=False, status=None):
+        super().__init__(message)
+        self.retryable, self.status = retryable, status
+
+
+class PushPlusSender:
+    def __init__(self, url=None, pool_size=16, timeout=10):
+        self.url = url or os.environ.get("UUKITCHEN_PUSHPLUS_URL", PUSHPLUS_URL)  # 可指向本地 mock
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter); self.session.mount("https://", adapter)
+
+    def __call__(self, token, message):
+        try:
+            r = self.session.post(self.url, json={"token": token, **message}, timeout=self.timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise PushError(f"网络错误: {e}", retryable=True) from e
+        if r.status_code == 429 or r.status_code >= 500:
+            raise PushError(f"HTTP {r.status_code}", retryable=True, status=r.status_code)
+        if r.status_code >= 400:
+            raise PushError(f"HTTP {r.status_code}: {r.text[:200]}", status=r.status_code)
+        try: body = r.json()
+        except ValueError as e: raise PushError("响应不是 JSON", retryable=True, status=r.status_code) from e
+        code = body.get("code")
+        if code != 200:  # PushPlus 业务错误：token 无效等不必重试，服务端异常 (>=500) 可以
+            raise PushError(f"PushPlus {code}: {body.get('msg')}", retryable=isinstance(code, int) and code >= 500, status=code)
+        return body
+
+    def close(self):
+        self.session.close()
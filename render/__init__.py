@@ -0,0 +1,10 @@
+# render: 菜单卡片图片 (PIL) 与仪表盘 HTML 片段，与 Streamlit 无关；批量导出 (zip / 多页 PDF) 见 render.export
+from render.card import TEMPLATE_VERSION, CardCache, card_image, card_key, card_menu, create_menu_card_image, menu_card_png, sample_menu
+from render.dashboard import card_banner, dish_label, ingredient_pills
+from render.fonts import font_health, get_pil_font, load_custom_font, resolve_font, warm_up
+
+__all__ = [
+    "TEMPLATE_VERSION", "CardCache", "card_banner", "card_image", "card_key", "card_menu", "create_menu_card_image",
+    "dish_label", "font_health", "get_pil_font", "ingredient_pills", "load_custom_font", "menu_card_png", "resolve_font",
+    "sample_menu", "warm_up",
+]
@@ -0,0 +1,6 @@
+# python -m render [--download]
+# 安装/部署时检查菜单卡片字体，必要时下载；退出码 0 表示可以显示中文
+
+from render.fonts import main
+
+raise SystemExit(main())
@@ -0,0 +1,147 @@
+# render/card.py
+# 菜单卡片 PNG + 按内容寻址的 LRU 缓存
+#
+# 缓存 key = (各槽位菜名, 昵称, 模板版本) 的哈希；菜单没变就直接返回上次的 PNG 字节，
+# 不再每次 rerun 都重画 800x1200 的图并重新编码。改了卡片样式记得把 TEMPLATE_VERSION 加 1。
+# 背景、边框和栏目标题与菜单无关，每个进程预画一张模板，每张卡片只在副本上画昵称和菜名。
+
+import functools
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageDraw
+
+from catalog import is_dish
+from render.fonts import get_pil_font
+from telemetry import count, timed
+
+TEMPLATE_VERSION = 1
+CARD_SLOTS = ["breakfast", "lunch_meat", "lunch_veg", "lunch_soup", "dinner_meat", "dinner_veg", "dinner_soup"]
+
+
+# 栏目：(标题, 该栏的行)；行是槽位名，或原样画出的固定文字。每栏行数固定，所以各行的 y 坐标也固定
+_SECTIONS = [
+    ("早餐", ["breakfast", "🥛 热牛奶"]),
+    ("午餐", ["lunch_meat", "lunch_veg", "lunch_soup"]),
+    ("晚餐", ["dinner_meat", "dinner_veg", "dinner_soup"]),
+    ("今日水果", ["fruit"]),
+]
+
+
+def _layout():
+    """-> (栏目标题 [(y, 文字)], 各行 [(y, 槽位或固定文字)])"""
+    headers, lines, y = [], [], 260
+    for title, rows in _SECTIONS:
+        headers.append((y, f"• {title} •")); y += 75
+        for row in rows: lines.append((y, row)); y += 55
+        y += 40
+    return headers, lines
+
+
+_HEADERS, _LINES = _layout()
+
+
+def _name(d):
+    return d['name'] if is_dish(d) else d
+
+
+def card_menu(menu):
+    """菜单 (菜品 dict 或 plan_batch 的菜名形式) -> 卡片渲染需要的形态"""
+    out = {k: {'name': _name(menu.get(k)) or "--"} for k in CARD_SLOTS}
+    out['fruit'] = menu.get('fruit') or "--"
+    return out
+
+
+@functools.lru_cache(maxsize=1)
+def _template():
+    """背景、边框、栏目标题与固定行：每个进程只画一次，之后每张卡片在它的副本上只画昵称和菜名"""
+    img = Image.new('RGB', (800, 1200), color='#FFFDF5')
+    draw = ImageDraw.Draw(img)
+    header_font = get_pil_font(40); text_font = get_pil_font(30)
+    draw.rectangle([30, 30, 770, 1170], outline="#FF9500", width=5)
+    for y, text in _HEADERS: draw.text((400, y), text, font=header_font, fill='#333', anchor="mm")
+    for y, row in _LINES:
+        if row not in CARD_SLOTS and row != 'fruit': draw.text((400, y), row, font=text_font, fill='#555', anchor="mm")
+    return img
+
+
+def card_image(menu, nickname):
+    """菜单卡片 (PIL Image，800x1200)"""
+    img = _template().copy()
+    draw = ImageDraw.Draw(img)
+    text_font = get_pil_font(30)
+    draw.text((400, 120), f"{nickname} 的今日食谱", font=get_pil_font(60), fill='#FF9500', anchor="mm")
+    for y, row in _LINES:
+        if row == 'fruit': draw.text((400, y), menu['fruit'], font=text_font, fill='#555', anchor="mm")
+        elif row in CARD_SLOTS: draw.text((400, y), menu[row]['name'], font=text_font, fill='#555', anchor="mm")
+    return img
+
+
+@timed("render.card")
+def create_menu_card_image(menu, nickname):
+    buf = io.BytesIO(); card_image(menu, nickname).save(buf, format="PNG"); return buf.getvalue()
+
+
+def sample_menu():
+    """示例菜单：健康检查与基准测试用"""
+    menu = {k: {'name': "🥚 蒸水蛋"} for k in CARD_SLOTS}
+    menu['fruit'] = "🍎 苹果片"
+    return menu
+
+
+def card_key(menu, nickname, version=TEMPLATE_VERSION):
+    names = [_name(menu.get(k)) for k in CARD_SLOTS] + [menu.get('fruit')]
+    raw = json.dumps([names, nickname, version], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class CardCache:
+    """线程安全的 LRU：同时限制条数与总字节数"""
+
+    def __init__(self, max_items=128, max_bytes=32 * 1024 * 1024):
+        self.max_items, self.max_bytes = max_items, max_bytes
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            png = self._data.get(key)
+            if png is None: self.misses += 1; count("render.card_cache_miss"); return None
+            self._data.move_to_end(key); self.hits += 1
+        count("render.card_cache_hit")
+        return png
+
+    def put(self, key, png):
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None: self._bytes -= len(old)
+            if len(png) > self.max_bytes: return
+            self._data[key] = png; self._bytes += len(png)
+            while len(self._data) > self.max_items or self._bytes > self.max_bytes:
+                _, ev = self._data.popitem(last=False); self._bytes -= len(ev)
+
+    def get_or_render(self, key, render):
+        png = self.get(key)
+        if png is None:
+            png = render(); self.put(key, png)
+        return png
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+
+_CACHE = CardCache()
+
+
+def menu_card_png(menu, nickname, cache=_CACHE):
+    """带缓存的卡片 PNG；同一份菜单 + 昵称只渲染一次"""
+    return cache.get_or_render(card_key(menu, nickname), lambda: create_menu_card_image(menu, nickname))
@@ -0,0 +1,29 @@
+# render/dashboard.py
+# 仪表盘的 HTML 片段：纯字符串，和 Streamlit 无关，按 (菜的食材, 冰箱) 记忆化
+#
+# 同一道菜在冰箱没变时每次 rerun 拼出来的 HTML 都一样，直接复用；冰箱 ID 集合是 frozenset，
+# 哈希只算一次。食材命中用标准化 ID 比较 (番茄/西红柿算同一种)。
+
+import functools
+
+from planner.normalize import NORMALIZER
+
+ROW_DIVIDER = "<hr style='margin:0 15px; border:0; border-top:1px solid #F2F2F7;'>"
+
+
+@functools.lru_cache(maxsize=1024)
+def ingredient_pills(ingredients, fridge_ids, divider=False):
+    """食材条；冰箱里有的高亮。ingredients 为 tuple，fridge_ids 为 frozenset"""
+    lookup = NORMALIZER.lookup
+    pills = "".join(f'<span class="pill {"pill-hit" if lookup(i) in fridge_ids else ""}">{i}</span>' for i in ingredients)
+    return f'<div class="ing-scroll">{pills}</div>' + (ROW_DIVIDER if divider else "")
+
+
+@functools.lru_cache(maxsize=256)
+def dish_label(name):
+    return f'<div class="name-label">{name}</div>'
+
+
+@functools.lru_cache(maxsize=16)
+def card_banner(title, bg_class):
+    return f'<div class="dish-card-ios"><div class="card-banner {bg_class}">{title}</div>'
@@ -0,0 +1,183 @@
+# render/export.py
+# 批量导出菜单卡片：一周的菜单，或成百上千个家庭各一张，打包成 PNG zip 和/或一个多页 PDF
+# python -m render.export [--week] [--profiles profiles.db] [--synthetic 500] [--zip cards.zip] [--pdf cards.pdf] [--processes 0]
+#
+# 卡片分块发到进程池，每个工作进程启动时预加载字体、画好背景模板 (render.card._template)，之后每张只画文字。
+# 结果按输入顺序边到边写：zip 每张 PNG 直接写进文件；PDF 每页是一张 JPEG 图像对象，写完即丢，只记对象偏移，
+# 最后补页树与 xref。在途的块数有上限 (默认进程数 x 2)，内存占用与批量大小无关。结果以 JSON 输出 (含 cards/sec)。
+# 按家庭批量导出时，档案按块送进同一个进程池，工作进程先规划当天菜单再渲染，不先把全部菜单攒齐。
+
+import argparse
+import io
+import itertools
+import json
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from render.card import card_image, card_menu, create_menu_card_image
+from render.fonts import warm_up
+
+_CHUNK = 16
+PAGE_SIZE = (600, 900)   # PDF 页面 (pt)，800x1200 像素按 96 dpi
+
+
+class PdfWriter:
+    """增量写多页 PDF：每页铺满一张 JPEG (DCTDecode，不再重新编码)"""
+
+    def __init__(self, f, page_size=PAGE_SIZE):
+        self.f = f
+        self.page_size = page_size
+        self.pos = 0
+        self.offsets = {}   # 对象号 -> 文件偏移
+        self.pages = []     # Page 对象号
+        self._next = 3      # 1 = Catalog、2 = Pages，收尾时再写
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data):
+        self.f.write(data); self.pos += len(data)
+
+    def _obj(self, body, num=None):
+        if num is None: num = self._next; self._next += 1
+        self.offsets[num] = self.pos
+        self._write(b"%d 0 obj\n" % num + body + b"\nendobj\n")
+        return num
+
+    def add_jpeg(self, jpeg, width, height):
+        w, h = self.page_size
+        img = self._obj(b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB "
+                        b"/BitsPerComponent 8 /Filter /DCTDecode /Length %d >>\nstream\n" % (width, height, len(jpeg))
+                        + jpeg + b"\nendstream")
+        content = b"q %d 0 0 %d 0 0 cm /Im0 Do Q" % (w, h)
+        cs = self._obj(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        self.pages.append(self._obj(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+                                    b"/Resources << /XObject << /Im0 %d 0 R >> >> /Contents %d 0 R >>" % (w, h, img, cs)))
+
+    def close(self):
+        kids = b" ".join(b"%d 0 R" % p for p in self.pages)
+        self._obj(b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(self.pages), 2)
+        self._obj(b"<< /Type /Catalog /Pages 2 0 R >>", 1)
+        xref = self.pos
+        self._write(b"xref\n0 %d\n0000000000 65535 f \n" % self._next)
+        self._write(b"".join(b"%010d 00000 n \n" % self.offsets[n] for n in range(1, self._next)))
+        self._write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (self._next, xref))
+
+
+def _render_one(menu, nickname, png, jpeg):
+    menu = card_menu(menu)
+    out_png = create_menu_card_image(menu, nickname) if png else None
+    out_jpeg = None
+    if jpeg:
+        buf = io.BytesIO(); card_image(menu, nickname).save(buf, format="JPEG", quality=90); out_jpeg = buf.getvalue()
+    return out_png, out_jpeg
+
+
+def _render_chunk(chunk, png, jpeg, plan=False):
+    if plan:  # (文件名, 档案)：先在本进程里给这一块出当天菜单，再渲染
+        from planner import plan_batch
+        menus = plan_batch([p for _, p in chunk])
+        chunk = [(name, m, p.get("nickname", "")) for (name, p), m in zip(chunk, menus)]
+    return [(name, *_render_one(menu, nickname, png, jpeg)) for name, menu, nickname in chunk]
+
+
+def render_cards(jobs, processes=None, png=True, jpeg=False, chunksize=_CHUNK, window=None, plan=False):
+    """jobs: 可迭代的 (文件名, 菜单, 昵称)；按输入顺序逐张产出 (文件名, PNG 字节, JPEG 字节)
+
+    processes: None/1 在当前进程内渲染；0 表示使用全部 CPU 核。
+    window: 同时在途的块数上限，默认进程数 x 2；jobs 按需读取，可以是生成器。
+    plan=True 时 jobs 是 (文件名, 档案)，规划也放进同一个进程池，按块边规划边渲染，不先把所有菜单攒在内存里。
+    """
+    jobs = iter(jobs)
+    chunks = iter(lambda: list(itertools.islice(jobs, chunksize)), [])
+    if processes == 0: processes = os.cpu_count() or 1
+    if not processes or processes == 1:
+        warm_up()
+        for chunk in chunks: yield from _render_chunk(chunk, png, jpeg, plan)
+        return
+    window = window or 2 * processes
+    with ProcessPoolExecutor(max_workers=processes, initializer=warm_up) as ex:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(ex.submit(_render_chunk, chunk, png, jpeg, plan))
+            if len(pending) >= window: yield from pending.popleft().result()
+        while pending: yield from pending.popleft().result()
+
+
+def export_cards(jobs, zip_path=None, pdf_path=None, processes=None, chunksize=_CHUNK, plan=False):
+    """渲染并写出 zip (每张一个 PNG) 和/或多页 PDF；先写 .part 再改名。返回统计 (含 cards_per_sec)；plan 见 render_cards"""
+    if not zip_path and not pdf_path: raise ValueError("zip_path 和 pdf_path 至少给一个")
+    t = time.perf_counter()
+    n = 0
+    zf = zipfile.ZipFile(zip_path + ".part", "w", zipfile.ZIP_STORED) if zip_path else None  # PNG 本身已压缩
+    pf = open(pdf_path + ".part", "wb") if pdf_path else None
+    pdf = PdfWriter(pf) if pf else None
+    try:
+        for name, png, jpeg in render_cards(jobs, processes, png=zf is not None, jpeg=pdf is not None, chunksize=chunksize, plan=plan):
+            if zf is not None: zf.writestr(f"{name}.png", png)
+            if pdf is not None: pdf.add_jpeg(jpeg, 800, 1200)
+            n += 1
+        if pdf is not None: pdf.close()
+    finally:
+        if zf is not None: zf.close()
+        if pf is not None: pf.close()
+    seconds = time.perf_counter() - t
+    out = {"cards": n, "seconds": round(seconds, 3), "cards_per_sec": round(n / seconds, 1) if seconds else 0.0}
+    for key, path in (("zip_bytes", zip_path), ("pdf_bytes", pdf_path)):
+        if path: os.replace(path + ".part", path); out[key] = os.path.getsize(path)
+    return out
+
+
+def cards_pdf(jobs, processes=None):
+    """小批量 (如 app 里一周 7 张) 直接在内存里出 PDF 字节"""
+    buf = io.BytesIO(); pdf = PdfWriter(buf)
+    for _, _, jpeg in render_cards(jobs, processes, png=False, jpeg=True): pdf.add_jpeg(jpeg, 800, 1200)
+    pdf.close()
+    return buf.getvalue()
+
+
+def week_jobs(plan, nickname):
+    """周计划 (plan_week 的返回值) -> 每天一张的导出任务"""
+    return [(f"day{i + 1}", m, nickname) for i, m in enumerate(plan['days'])]
+
+
+# ---- 命令行：菜单从哪来 ----
+def _week_plan(profile, days):
+    from planner import NutritionPlanner, WeeklyPlanner, build_index
+    from recipe_data import RECIPES_DB
+    if profile.get('nutrition_goals'): return NutritionPlanner(RECIPES_DB, profile, index=build_index(RECIPES_DB)).plan_week(days)
+    return WeeklyPlanner(RECIPES_DB, profile, index=build_index(RECIPES_DB), days=days).plan_week()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m render.export", description="批量导出菜单卡片 (PNG zip / 多页 PDF)")
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--week", action="store_true", help="用默认档案 (昵称 --nickname) 出 --days 天的菜单，每天一张")
+    src.add_argument("--profiles", help="档案库 (SQLite)：每个家庭一张")
+    src.add_argument("--synthetic", type=int, metavar="N", help="N 个合成档案 (压测用)")
+    ap.add_argument("--days", type=int, default=7)
+    ap.add_argument("--nickname", default="宝宝")
+    ap.add_argument("--zip", help="输出 zip 路径")
+    ap.add_argument("--pdf", help="输出 PDF 路径")
+    ap.add_argument("--processes", type=int, default=0, help="渲染 (按家庭导出时含规划) 进程数，0 = 全部 CPU 核，1 = 单进程")
+    ap.add_argument("--chunksize", type=int, default=_CHUNK)
+    args = ap.parse_args(argv)
+    if not args.zip and not args.pdf: ap.error("--zip 和 --pdf 至少给一个")
+    if args.week:
+        profile = {"nickname": args.nickname, "fridge_items": [], "allergens": [], "likes": [], "dislikes": []}
+        jobs, plan = week_jobs(_week_plan(profile, args.days), args.nickname), False
+    elif args.profiles:  # 每个家庭一份当天菜单：档案按需读出，规划和渲染一起在进程池里按块做
+        from storage import ProfileStore
+        jobs, plan = ProfileStore(args.profiles), True
+    else:
+        from bench.synthetic import synthetic_profiles
+        jobs, plan = ((f"family{i:05d}", p) for i, p in enumerate(synthetic_profiles(args.synthetic))), True
+    out = export_cards(jobs, args.zip, args.pdf, processes=args.processes, chunksize=args.chunksize, plan=plan)
+    out["processes"] = args.processes or os.cpu_count()
+    print(json.dumps(out, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+# render/fonts.py
+# 中文字体：离线解析 + 启动时预热，渲染路径上绝不联网
+#
+# 查找顺序：环境变量 UUKITCHEN_FONT 指定的文件 -> UUKITCHEN_FONT_DIR (默认项目下 fonts/) 里的字体
+# -> 旧版下载到项目根目录的 SimHei.ttf -> 常见系统中文字体。
+# 需要联网下载的话只能在安装阶段显式执行：python -m render --download
+
+import argparse
+import functools
+import glob
+import json
+import os
+import time
+
+from PIL import Image, ImageDraw, ImageFont
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FONT_DIR = os.environ.get("UUKITCHEN_FONT_DIR", os.path.join(BASE_DIR, "fonts"))
+LEGACY_FONT_FILE = os.path.join(BASE_DIR, "SimHei.ttf")
+FONT_URL = "https://github.com/StellarCN/scp_zh/raw/master/fonts/SimHei.ttf"
+CARD_FONT_SIZES = (60, 40, 30)
+SYSTEM_FONTS = [
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc",
+    "/System/Library/Fonts/PingFang.ttc",
+    "/System/Library/Fonts/STHeiti Medium.ttc",
+    "C:/Windows/Fonts/msyh.ttc",
+    "C:/Windows/Fonts/simhei.ttf",
+]
+
+
+def font_candidates():
+    env = os.environ.get("UUKITCHEN_FONT")
+    out = [env] if env else []
+    for ext in ("ttf", "ttc", "otf"): out.extend(sorted(glob.glob(os.path.join(FONT_DIR, f"*.{ext}"))))
+    return out + [LEGACY_FONT_FILE] + SYSTEM_FONTS
+
+
+def resolve_font():
+    """第一个存在且能显示中文的字体文件，找不到返回 None"""
+    for path in font_candidates():
+        if os.path.isfile(path) and _renders_cjk(path): return path
+    return None
+
+
+def _renders_cjk(path):
+    try: font = ImageFont.truetype(path, 24)
+    except OSError: return False
+    return supports_text(font, "中")
+
+
+def supports_text(font, text):
+    """字体里是否真有这些字：缺字时 FreeType 画的是 .notdef 方块，和私用区字符的图形一致"""
+    tofu = _glyph(font, "\ue000")
+    return all(_glyph(font, ch) != tofu for ch in text)
+
+
+def _glyph(font, ch):
+    img = Image.new("L", (64, 64))
+    ImageDraw.Draw(img).text((8, 8), ch, font=font, fill=255)
+    return img.tobytes()
+
+
+@functools.lru_cache(maxsize=1)
+def load_custom_font():
+    return resolve_font()
+
+
+@functools.lru_cache(maxsize=32)
+def get_pil_font(size):
+    path = load_custom_font()
+    try: return ImageFont.truetype(path, size) if path else ImageFont.load_default()
+    except OSError: return ImageFont.load_default()
+
+
+def warm_up(sizes=CARD_FONT_SIZES):
+    """启动时调用：把卡片用到的字号都加载好，返回耗时 (毫秒)"""
+    t = time.perf_counter()
+    for s in sizes: get_pil_font(s)
+    return (time.perf_counter() - t) * 1000
+
+
+def font_health():
+    """字体健康检查，供启动日志 / 调试面板使用"""
+    path = load_custom_font()
+    warm_ms = warm_up()
+    from render.card import create_menu_card_image, sample_menu  # 避免循环导入
+    t = time.perf_counter()
+    create_menu_card_image(sample_menu(), "Bingo")
+    return {"font": path, "cjk": path is not None, "warm_ms": round(warm_ms, 2),
+            "first_card_ms": round((time.perf_counter() - t) * 1000, 2)}
+
+
+def download_font(dest_dir=FONT_DIR, url=FONT_URL, timeout=60):
+    """安装阶段使用：下载 SimHei 到字体目录 (先写临时文件再改名)"""
+    import requests
+    os.makedirs(dest_dir, exist_ok=True)
+    dest = os.path.join(dest_dir, os.path.basename(url))
+    r = requests.get(url, timeout=timeout); r.raise_for_status()
+    tmp = dest + ".part"
+    with open(tmp, "wb") as f: f.write(r.content)
+    os.replace(tmp, dest)
+    return dest
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m render", description="检查 / 准备菜单卡片字体")
+    ap.add_argument("--download", action="store_true", help="找不到中文字体时从网络下载到字体目录")
+    args = ap.parse_args(argv)
+    if args.download and resolve_font() is None:
+        print("下载字体到", download_font())
+        load_custom_font.cache_clear(); get_pil_font.cache_clear()
+    health = font_health()
+    print(json.dumps(health, ensure_ascii=False))
+    return 0 if health["cjk"] else 1
@@ -0,0 +1,5 @@
+# service: 无界面菜单 HTTP 服务 (生成菜单 / 换菜 / 购物清单 / 卡片 PNG)，标准库 asyncio + 有界渲染进程池
+from service.api import MenuApi
+from service.http import HttpError, HttpServer, Request, Response
+
+__all__ = ["HttpError", "HttpServer", "MenuApi", "Request", "Response"]
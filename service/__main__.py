@@ -0,0 +1,174 @@
+# python -m service serve [--host 127.0.0.1] [--port 8765] [--render-workers 2] [--profiles profiles.db]
+# python -m service bench [--url http://127.0.0.1:8765] [--connections 32] [--duration 10] [--mix menu,card,swap,shopping]
+#
+# serve：无界面的菜单服务 (接口见 service.api)，菜谱文件改了自动热加载。
+# bench：压测 (默认在本进程里起一个服务)，每个连接 keep-alive 循环发请求，输出 requests/sec 与延迟分位 (JSON)。
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from service.api import MenuApi
+from service.http import HttpServer
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_api(args):
+    from catalog import LiveCatalog
+    from planner import build_index, drop_index
+    from planner.nutrition import nutrient_matrix
+    from planner.recommend import feature_matrix
+    from recipe_data import LIVE
+    from storage import HistoryStore, ProfileStore
+    live = LiveCatalog(args.recipes) if args.recipes else LIVE  # 默认就用 recipe_data 导入时建好的那份，不另建一份
+    live.prepare.append(lambda snap: (feature_matrix(build_index(snap.db)), nutrient_matrix(build_index(snap.db))))
+    live.on_retire.append(lambda snap: drop_index(snap.db))
+    live.prepare[-1](live.snapshot())  # 当前版本也先建好，首个请求不用等
+    live.watch()
+    profiles = ProfileStore(args.profiles) if args.profiles else None
+    history = HistoryStore(args.history) if args.history and os.path.exists(args.history) else None
+    return MenuApi(live, profiles, history, render_workers=args.render_workers, plan_threads=args.plan_threads)
+
+
+def serve(args):
+    api = make_api(args)
+    server = HttpServer(api, args.host, args.port)
+
+    async def run():
+        await server.start()
+        print(json.dumps({"listening": f"http://{server.host}:{server.port}"}), flush=True)
+        await server.serve_forever()
+    try: asyncio.run(run())
+    except KeyboardInterrupt: pass
+    finally: api.close()
+    return 0
+
+
+# ---- 压测 ----
+_PROFILE = {"nickname": "Bingo", "fridge_items": ["鸡蛋", "西红柿", "土豆", "大米"], "allergens": ["牛奶"]}
+
+
+class _Client:
+    """一条 keep-alive 连接"""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None, headers=None):
+        if self.writer is None: self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8") if body is not None else b""
+        head = [f"{method} {path} HTTP/1.1", f"Host: {self.host}", f"Content-Length: {len(data)}"]
+        head += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        self.writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+        status = int((await self.reader.readline()).split()[1])
+        length, close = 0, False
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""): break
+            k, _, v = line.decode("latin-1").partition(":")
+            if k.lower() == "content-length": length = int(v)
+            elif k.lower() == "connection" and v.strip().lower() == "close": close = True
+        payload = await self.reader.readexactly(length) if length else b""
+        if close: self.close()
+        return status, payload
+
+    def close(self):
+        if self.writer is not None: self.writer.close(); self.writer = self.reader = None
+
+
+async def _load(host, port, connections, duration, mix, seed):
+    latencies, statuses = [], Counter()
+    deadline = time.perf_counter() + duration
+    menus = []   # 已拿到的菜单 (菜名)，swap / shopping / card 复用
+    cards = []   # 卡片路径 (/card/<key>.png)
+
+    async def one(client, rng):
+        kind = rng.choice(mix)
+        if kind != "menu" and not menus: kind = "menu"
+        if kind == "menu":
+            status, payload = await client.request("POST", "/menu", {"profile": _PROFILE})
+            if status == 200:
+                out = json.loads(payload); menus.append(out["menu"]); cards.append(out["card"])
+                del menus[:-256]; del cards[:-256]
+        elif kind == "swap":
+            status, _ = await client.request("POST", "/swap", {"profile": _PROFILE, "menu": rng.choice(menus), "slot": "lunch_meat"})
+        elif kind == "shopping":
+            status, _ = await client.request("POST", "/shopping-list", {"profile": _PROFILE, "days": rng.sample(menus, min(7, len(menus)))})
+        else:  # card：一半带 If-None-Match (客户端已缓存)，一半不带
+            path = rng.choice(cards)
+            etag = {"If-None-Match": f'"{path[len("/card/"):-4]}"'} if rng.random() < 0.5 else None
+            status, _ = await client.request("GET", path, headers=etag)
+        return kind, status
+
+    async def worker(i):
+        client = _Client(host, port); rng = random.Random(seed * 7919 + i)
+        try:
+            while time.perf_counter() < deadline:
+                t = time.perf_counter()
+                try: kind, status = await one(client, rng)
+                except (ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+                    client.close(); statuses["error"] += 1; continue
+                latencies.append(time.perf_counter() - t); statuses[f"{kind} {status}"] += 1
+        finally:
+            client.close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(connections)))
+    elapsed = time.perf_counter() - t0
+    latencies.sort()
+    pct = lambda q: round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 2) if latencies else 0.0
+    return {"requests": len(latencies), "elapsed_s": round(elapsed, 2), "requests_per_sec": round(len(latencies) / elapsed, 1),
+            "p50_ms": pct(0.5), "p99_ms": pct(0.99), "status": dict(sorted(statuses.items()))}
+
+
+def bench(args):
+    mix = [m.strip() for m in args.mix.split(",") if m.strip()]
+    if args.url:
+        u = urlsplit(args.url); host, port = u.hostname, u.port or 80
+        server = None
+    else:  # 本进程里起服务 (单独的线程和事件循环)，不依赖任何外部服务
+        api = make_api(args)
+        server = HttpServer(api, "127.0.0.1", 0)
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(server.start())
+        threading.Thread(target=loop.run_forever, name="service", daemon=True).start()
+        host, port = "127.0.0.1", server.port
+    out = asyncio.run(_load(host, port, args.connections, args.duration, mix, args.seed))
+    out.update({"connections": args.connections, "mix": mix})
+    if server is not None: out["server_requests"] = server.requests; api.close()
+    print(json.dumps(out, ensure_ascii=False))
+    return 0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m service", description="无界面菜单 HTTP 服务")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    for name, help_ in (("serve", "启动服务"), ("bench", "压测 (不给 --url 时在本进程里起服务)")):
+        p = sub.add_parser(name, help=help_)
+        p.add_argument("--recipes", help="菜谱 JSONL，默认同 app (UUKITCHEN_RECIPES 或 data/recipes.jsonl)")
+        p.add_argument("--profiles", help="档案库 (SQLite)，给了才支持请求里传 user_id")
+        p.add_argument("--history", default=os.path.join(BASE_DIR, "menu_history.jsonl"), help="历史收藏 (口味模型用)")
+        p.add_argument("--render-workers", type=int, default=2, help="卡片渲染进程数，0 = 在线程里渲染")
+        p.add_argument("--plan-threads", type=int, default=4)
+    s = sub.choices["serve"]
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=8765)
+    b = sub.choices["bench"]
+    b.add_argument("--url", help="压测已在运行的服务，如 http://127.0.0.1:8765")
+    b.add_argument("--connections", type=int, default=32)
+    b.add_argument("--duration", type=float, default=10.0, help="秒")
+    b.add_argument("--mix", default="menu,card,swap,shopping", help="请求类型，逗号分隔 (按个数均匀抽)")
+    b.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+    return serve(args) if args.cmd == "serve" else bench(args)
+
+
+raise SystemExit(main())
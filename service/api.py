@@ -0,0 +1,194 @@
+# service/api.py
+# 菜单 HTTP/JSON 接口：与 app 同一套规划逻辑 (planner_for / swap / ShoppingList) 与卡片渲染
+#
+# POST /menu           {"profile": {...} | "user_id": "...", "seed": 1}      -> {"menu": {...}, "card": "/card/<key>.png"}
+# POST /swap           {"menu": {槽位: 菜名}, "slot": "lunch_meat", "profile": ...} -> 同上，换掉一道
+# POST /shopping-list  {"menu": {...}} 或 {"days": [{...}, ...]}, "profile": ... -> {"shopping_list", "quantities"}
+# POST /card           {"menu": {...}, "nickname": "Bingo"}                   -> image/png
+# GET  /card/<key>.png (来自 /menu 的 "card")                                  -> image/png
+# GET  /healthz, GET /metrics (Prometheus 文本)
+#
+# 规划在线程池里跑 (不卡事件循环)；卡片在有界的进程池里渲染，排队超过上限直接回 503。
+# 卡片 key = render.card.card_key (菜名 + 昵称 + 模板版本) 的哈希，内容寻址，直接当 ETag：
+# 带 If-None-Match 命中回 304，同一张卡片并发请求只渲染一次。
+
+import asyncio
+import copy
+import random
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import telemetry
+from planner import build_index, history_names, iter_bits, menu_names, planner_for
+from planner.rules import MENU_SLOTS, SLOT_POOLS, empty_menu
+from render.card import CardCache, card_key, card_menu, create_menu_card_image
+from render.fonts import warm_up
+from service.http import HttpError, Response
+
+DEFAULT_PROFILE = {"nickname": "宝宝", "fridge_items": [], "allergens": [], "likes": [], "dislikes": [], "nutrition_goals": []}
+_LIST_FIELDS = ("fridge_items", "allergens", "likes", "dislikes", "nutrition_goals")
+_CARD_MENUS = 4096    # 记住多少张卡片的内容 (GET /card/<key>.png 按需渲染用)
+RECENT_HISTORY = 30
+
+
+def _render(menu, nickname):
+    """渲染进程里执行"""
+    return create_menu_card_image(menu, nickname)
+
+
+class MenuApi:
+    def __init__(self, live, profiles=None, history=None, render_workers=2, plan_threads=4, max_pending_renders=None):
+        self.live = live                  # catalog.LiveCatalog
+        self.profiles = profiles          # storage.ProfileStore，可选：请求里给 user_id 时用
+        self.history = history            # storage.HistoryStore，可选：做过的菜作为口味弱正反馈
+        self.cards = CardCache()
+        self._card_menus = OrderedDict()  # key -> (卡片菜单, 昵称)
+        self._inflight = {}               # key -> 正在渲染的 asyncio.Task
+        self._pending = 0
+        self.max_pending = max_pending_renders or 8 * max(render_workers, 1)
+        self._plan_pool = ThreadPoolExecutor(plan_threads, thread_name_prefix="plan")
+        self._render_pool = (ProcessPoolExecutor(render_workers, initializer=warm_up) if render_workers
+                             else ThreadPoolExecutor(1, thread_name_prefix="render"))
+        self.routes = {
+            ("POST", "/menu"): self.menu, ("POST", "/swap"): self.swap, ("POST", "/shopping-list"): self.shopping,
+            ("POST", "/card"): self.card_post, ("GET", "/healthz"): self.health, ("GET", "/metrics"): self.metrics,
+        }
+
+    async def __call__(self, req):
+        handler = self.routes.get((req.method, req.path))
+        if handler is None and req.path.startswith("/card/") and req.path.endswith(".png") and req.method == "GET":
+            handler = self.card_get
+        if handler is None:
+            raise HttpError(405 if any(p == req.path for _, p in self.routes) else 404)
+        telemetry.count("service.requests")
+        with telemetry.span(f"service.{handler.__name__}"): return await handler(req)
+
+    def close(self):
+        self._plan_pool.shutdown(wait=False); self._render_pool.shutdown(wait=False, cancel_futures=True)
+
+    # ---- 输入 ----
+    def _profile(self, data):
+        p = copy.deepcopy(DEFAULT_PROFILE)
+        uid = data.get("user_id")
+        if uid is not None:
+            if self.profiles is None: raise HttpError(400, "服务没有配置档案库，请直接传 profile")
+            p.update(self.profiles.load(str(uid))[0])
+        extra = data.get("profile") or {}
+        if not isinstance(extra, dict): raise HttpError(400, "profile 应为 JSON 对象")
+        p.update(extra)
+        for k in _LIST_FIELDS:
+            if not isinstance(p.get(k), list): raise HttpError(400, f"profile.{k} 应为数组")
+        return p
+
+    def _planner(self, profile, seed=None):
+        db = self.live.db
+        hist = history_names(self.history.latest(RECENT_HISTORY)) if self.history is not None else ()
+        return planner_for(db, profile, index=build_index(db), rng=random.Random(seed), history=hist)
+
+    @staticmethod
+    def _resolve(index, names):
+        """{槽位: 菜名} -> 菜单 (菜品对象)；同名菜优先取该槽位所在课程的那道"""
+        if not isinstance(names, dict): raise HttpError(400, "menu 应为 {槽位: 菜名}")
+        menu = empty_menu()
+        for slot in MENU_SLOTS:
+            name = names.get(slot)
+            if not name: continue
+            bits = index.named([name])
+            bits = bits & index.course(SLOT_POOLS[slot]) or bits
+            if not bits: raise HttpError(400, f"菜谱库里没有「{name}」")
+            menu[slot] = index.dishes[next(iter_bits(bits))]
+        menu['fruit'] = names.get('fruit')
+        return menu
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._plan_pool, fn, *args)
+
+    def _menu_response(self, menu, nickname, **extra):
+        key = card_key(menu, nickname)
+        self._card_menus[key] = (card_menu(menu), nickname); self._card_menus.move_to_end(key)
+        while len(self._card_menus) > _CARD_MENUS: self._card_menus.popitem(last=False)
+        return Response.json({"menu": menu_names(menu), "card": f"/card/{key}.png", **extra})
+
+    # ---- 接口 ----
+    async def menu(self, req):
+        data = req.json(); profile = self._profile(data)
+        menu = await self._run(lambda: self._planner(profile, data.get("seed")).generate_menu())
+        return self._menu_response(menu, profile.get("nickname", ""))
+
+    async def swap(self, req):
+        data = req.json(); profile = self._profile(data)
+        slot = data.get("slot")
+        if slot not in SLOT_POOLS: raise HttpError(400, f"slot 应为 {'/'.join(MENU_SLOTS)} 之一")
+
+        def run():
+            planner = self._planner(profile, data.get("seed"))
+            menu = self._resolve(planner.index, data.get("menu") or {})
+            shopping = planner.new_shopping(menu)
+            new = planner.swap(menu, slot, shopping=shopping)
+            menu['shopping_list'] = shopping.items()
+            return menu, new is not None
+        menu, swapped = await self._run(run)
+        return self._menu_response(menu, profile.get("nickname", ""), swapped=swapped)
+
+    async def shopping(self, req):
+        data = req.json(); profile = self._profile(data)
+        days = data.get("days") if "days" in data else [data.get("menu") or {}]
+        if not isinstance(days, list): raise HttpError(400, "days 应为数组")
+
+        def run():
+            planner = self._planner(profile)
+            sl = planner.new_shopping([self._resolve(planner.index, d) for d in days])
+            return {"shopping_list": sl.items(), "quantities": sl.quantities()}
+        return Response.json(await self._run(run))
+
+    async def _render_png(self, key, menu, nickname):
+        self._pending += 1
+        try: png = await asyncio.get_running_loop().run_in_executor(self._render_pool, _render, menu, nickname)
+        finally: self._pending -= 1; self._inflight.pop(key, None)
+        self.cards.put(key, png)
+        return png
+
+    async def _png(self, key, menu, nickname):
+        png = self.cards.get(key)
+        if png is not None: return png
+        task = self._inflight.get(key)
+        if task is None:
+            if self._pending >= self.max_pending: raise HttpError(503, "卡片渲染排队已满，请稍后重试")
+            task = self._inflight[key] = asyncio.ensure_future(self._render_png(key, menu, nickname))
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def _card_headers(key):
+        return {"ETag": f'"{key}"', "Cache-Control": "public, max-age=31536000, immutable"}
+
+    async def _card(self, req, key, menu, nickname):
+        headers = self._card_headers(key)
+        if f'"{key}"' in req.headers.get("if-none-match", ""):
+            telemetry.count("service.card_not_modified")
+            return Response(304, b"", headers, content_type="image/png")
+        return Response(200, await self._png(key, menu, nickname), headers, content_type="image/png")
+
+    async def card_get(self, req):
+        key = req.path[len("/card/"):-len(".png")]
+        hit = self._card_menus.get(key)
+        if hit is not None: return await self._card(req, key, *hit)
+        # 内容已经忘了：key 就是内容哈希，客户端手里有这张就 304，缓存里还有图也照样能给
+        if f'"{key}"' in req.headers.get("if-none-match", ""): return Response(304, b"", self._card_headers(key), content_type="image/png")
+        png = self.cards.get(key)
+        if png is None: raise HttpError(404, "卡片已过期，请重新生成菜单")
+        return Response(200, png, self._card_headers(key), content_type="image/png")
+
+    async def card_post(self, req):
+        data = req.json()
+        names = data.get("menu")
+        if not isinstance(names, dict): raise HttpError(400, "menu 应为 {槽位: 菜名}")
+        menu = card_menu(names); nickname = str(data.get("nickname", ""))
+        return await self._card(req, card_key(menu, nickname), menu, nickname)
+
+    async def health(self, req):
+        snap = self.live.snapshot()
+        return Response.json({"ok": True, "catalog_version": snap.version, "recipes": len(build_index(snap.db)),
+                              "render_pending": self._pending, "cards_cached": len(self.cards)})
+
+    async def metrics(self, req):
+        return Response(200, telemetry.prometheus_text().encode("utf-8"), content_type="text/plain; version=0.0.4")
@@ -0,0 +1,138 @@
+# service/http.py
+# 极简 asyncio HTTP/1.1 服务器 (只用标准库)：keep-alive、按 Content-Length 读正文、空闲超时
+#
+# 只实现菜单服务用得到的部分：不支持 chunked 请求体、不支持 Expect: 100-continue。
+# 同一连接上的请求按顺序处理 (允许客户端流水线发送)；handler 是 async 函数 Request -> Response。
+
+import asyncio
+import json
+import logging
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+log = logging.getLogger("uukitchen.service")
+
+MAX_BODY = 1 << 20
+MAX_HEADERS = 100
+
+
+class HttpError(Exception):
+    def __init__(self, status, message=""):
+        super().__init__(message or HTTPStatus(status).phrase)
+        self.status = status
+
+
+class Request:
+    __slots__ = ("method", "path", "query", "headers", "body")
+
+    def __init__(self, method, target, headers, body):
+        parts = urlsplit(target)
+        self.method, self.path = method, unquote(parts.path)
+        self.query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        self.headers, self.body = headers, body
+
+    def json(self):
+        if not self.body: return {}
+        try: data = json.loads(self.body)
+        except ValueError as e: raise HttpError(400, f"请求体不是 JSON: {e}") from e
+        if not isinstance(data, dict): raise HttpError(400, "请求体应为 JSON 对象")
+        return data
+
+
+class Response:
+    __slots__ = ("status", "headers", "body")
+
+    def __init__(self, status=200, body=b"", headers=None, content_type="application/json; charset=utf-8"):
+        self.status, self.body = status, body
+        self.headers = {"Content-Type": content_type, **(headers or {})}
+
+    @classmethod
+    def json(cls, data, status=200, headers=None):
+        return cls(status, json.dumps(data, ensure_ascii=False).encode("utf-8"), headers)
+
+    def encode(self, keep_alive):
+        head = [f"HTTP/1.1 {self.status} {HTTPStatus(self.status).phrase}"]
+        head += [f"{k}: {v}" for k, v in self.headers.items()]
+        head.append(f"Content-Length: {len(self.body)}")
+        head.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + self.body
+
+
+def _keep_alive(version, headers):
+    conn = headers.get("connection", "").lower()
+    return conn != "close" if version == "HTTP/1.1" else conn == "keep-alive"
+
+
+class HttpServer:
+    def __init__(self, handler, host="127.0.0.1", port=8765, idle_timeout=15.0, max_body=MAX_BODY):
+        self.handler = handler
+        self.host, self.port = host, port
+        self.idle_timeout, self.max_body = idle_timeout, max_body
+        self.requests = 0
+        self._server = None
+
+    async def _read_request(self, reader):
+        """返回 (Request, HTTP 版本)；对端关闭或空闲超时返回 None"""
+        try: line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+        except asyncio.TimeoutError: return None
+        except (ValueError, asyncio.LimitOverrunError): raise HttpError(414)  # 请求行超过流的行长上限
+        if not line: return None
+        try: method, target, version = line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+        except ValueError: raise HttpError(400, "请求行格式错误")
+        # 请求行之后的头与正文整体限时：慢速客户端不能一直占着连接
+        try: headers, body = await asyncio.wait_for(self._read_rest(reader), self.idle_timeout)
+        except asyncio.TimeoutError: raise HttpError(408)
+        return Request(method.upper(), target, headers, body), version
+
+    async def _read_rest(self, reader):
+        headers = {}
+        while True:
+            try: h = await reader.readline()
+            except (ValueError, asyncio.LimitOverrunError): raise HttpError(431, "请求头过长")
+            if h in (b"\r\n", b"\n", b""): break
+            if len(headers) >= MAX_HEADERS: raise HttpError(431)
+            k, _, v = h.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+        if "chunked" in headers.get("transfer-encoding", "").lower(): raise HttpError(501, "不支持 chunked 请求体")
+        try: n = int(headers.get("content-length") or 0)
+        except ValueError: raise HttpError(400, "Content-Length 无效")
+        if n < 0: raise HttpError(400, "Content-Length 无效")
+        if n > self.max_body: raise HttpError(413)
+        return headers, (await reader.readexactly(n) if n else b"")
+
+    async def _connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    got = await self._read_request(reader)
+                    if got is None: break
+                    req, version = got
+                    keep = _keep_alive(version, req.headers)
+                    try: resp = await self.handler(req)
+                    except HttpError as e: resp = Response.json({"error": str(e)}, e.status)
+                    except Exception:
+                        log.exception("处理 %s %s 出错", req.method, req.path)
+                        resp = Response.json({"error": "服务器内部错误"}, 500)
+                except HttpError as e:  # 请求本身不合法：回一个错误就断开
+                    resp, keep = Response.json({"error": str(e)}, e.status), False
+                self.requests += 1
+                writer.write(resp.encode(keep))
+                await writer.drain()
+                if not keep: break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._connection, self.host, self.port, backlog=1024)
+        self.port = self._server.sockets[0].getsockname()[1]  # port=0 时取实际端口
+        return self
+
+    async def serve_forever(self):
+        if self._server is None: await self.start()
+        async with self._server: await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close(); await self._server.wait_closed()
@@ -0,0 +1,5 @@
+# storage: 本地持久化 (历史收藏、用户档案)
+from storage.history import HistoryStore
+from storage.profiles import ProfileStore, VersionConflict, apply_ops
+
+__all__ = ["HistoryStore", "ProfileStore", "VersionConflict", "apply_ops"]
@@ -0,0 +1,102 @@
+# storage/history.py
+# 历史收藏：JSON Lines 追加日志
+#
+# 每条记录一行，O_APPEND + 单次 write 写入，加文件锁防止多个会话交错；从不重写整个文件。
+# 读取"最近 N 条"时从文件尾部按块倒着读，代价只和 N 有关，与历史总长度无关。
+
+import json
+import os
+
+from telemetry import count, timed
+
+try:
+    import fcntl
+except ImportError:  # Windows 没有 fcntl，退化为不加锁 (O_APPEND 本身仍是原子追加)
+    fcntl = None
+
+_BLOCK = 8192
+
+
+class HistoryStore:
+    def __init__(self, path, legacy_path=None):
+        self.path = path
+        if legacy_path: self.migrate_legacy(legacy_path)
+
+    def migrate_legacy(self, legacy_path):
+        """一次性把旧版 menu_history.json (整个数组、最新在前) 转成 JSONL，旧文件改名为 .bak
+
+        与 append 用同一把文件锁：多个进程同时启动时只有一个真正迁移，其余返回 0。
+        """
+        if not os.path.exists(legacy_path) or _size(self.path): return 0
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl: fcntl.flock(fd, fcntl.LOCK_EX)
+            if os.fstat(fd).st_size or not os.path.exists(legacy_path): return 0  # 等锁期间别的进程已迁移完
+            try:
+                with open(legacy_path, "r", encoding="utf-8") as f: items = json.load(f)
+            except FileNotFoundError: return 0
+            except (OSError, ValueError): items = []
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for item in reversed(items): f.write(json.dumps(item, ensure_ascii=False) + "\n")
+                f.flush(); os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            try: os.replace(legacy_path, legacy_path + ".bak")
+            except FileNotFoundError: return 0  # 没有 fcntl 时可能被别的进程抢先改名：内容相同，算已迁移
+            return len(items)
+        finally:
+            os.close(fd)
+
+    def append(self, item):
+        line = (json.dumps(item, ensure_ascii=False) + "\n").encode("utf-8")
+        fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if fcntl: fcntl.flock(fd, fcntl.LOCK_EX)
+            size = os.fstat(fd).st_size
+            if size and os.pread(fd, 1, size - 1) != b"\n": line = b"\n" + line  # 上次写了半行，先断开
+            os.write(fd, line)
+            os.fsync(fd)
+            count("history.bytes_written", len(line))
+        finally:
+            os.close(fd)  # 关闭即释放锁
+
+    @timed("history.latest")
+    def latest(self, n):
+        """最近 n 条，最新在前；跳过写了一半的坏行"""
+        if n <= 0 or not os.path.exists(self.path): return []
+        out = []
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell(); tail = b""
+            while pos > 0 and len(out) < n:
+                step = min(_BLOCK, pos); pos -= step
+                f.seek(pos)
+                chunk = f.read(step) + tail
+                lines = chunk.split(b"\n")
+                tail = lines.pop(0) if pos > 0 else b""  # 块首可能是半行，留到下一块拼上
+                for raw in reversed(lines):
+                    item = _parse(raw)
+                    if item is not None:
+                        out.append(item)
+                        if len(out) >= n: break
+        return out
+
+    def __iter__(self):
+        """从旧到新遍历全部记录"""
+        if not os.path.exists(self.path): return
+        with open(self.path, "rb") as f:
+            for raw in f:
+                item = _parse(raw)
+                if item is not None: yield item
+
+
+def _parse(raw):
+    raw = raw.strip()
+    if not raw: return None
+    try: return json.loads(raw)
+    except ValueError: return None
+
+
+def _size(path):
+    try: return os.path.getsize(path)
+    except OSError: return 0
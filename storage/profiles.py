@@ -0,0 +1,149 @@
+# storage/profiles.py
+# 多用户档案：SQLite (WAL)，按 user_id 一行
+#
+# - 局部更新：ops 形如 ("set", 字段, 值) / ("add", 列表字段, 值) / ("remove", 列表字段, 值)，
+#   在一个事务里基于库里最新数据执行，两个窗口分别点"喜欢"不会互相覆盖。
+# - 乐观版本：每次写入 version + 1，传 expected_version 时不匹配抛 VersionConflict。
+# - 防抖：queue() 先攒在内存，flush_delay 秒后由后台线程合并成一个事务写入。
+
+import atexit
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from telemetry import count, timed
+
+
+class VersionConflict(Exception):
+    def __init__(self, user_id, expected, actual):
+        super().__init__(f"档案 {user_id} 版本冲突：期望 {expected}，实际 {actual}")
+        self.user_id, self.expected, self.actual = user_id, expected, actual
+
+
+def apply_ops(data, ops):
+    for op, field, value in ops:
+        if op == "set": data[field] = value
+        elif op == "add":
+            lst = data.setdefault(field, [])
+            if value not in lst: lst.append(value)
+        elif op == "remove":
+            lst = data.get(field, [])
+            if value in lst: lst.remove(value)
+        else: raise ValueError(f"未知操作: {op}")
+    return data
+
+
+class ProfileStore:
+    def __init__(self, path, defaults=None, legacy_path=None, flush_delay=0.5):
+        self.path = path
+        self.defaults = defaults or {}
+        self.flush_delay = flush_delay
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pending = {}   # user_id -> [ops]
+        self._timer = None
+        with self._tx() as c:
+            c.execute("CREATE TABLE IF NOT EXISTS profiles (user_id TEXT PRIMARY KEY, data TEXT NOT NULL, "
+                      "version INTEGER NOT NULL, updated_at REAL NOT NULL)")
+        if legacy_path: self.migrate_legacy(legacy_path)
+        atexit.register(self.flush)
+
+    # ---- 连接与事务 ----
+    def _conn(self):
+        c = getattr(self._local, "conn", None)
+        if c is None:
+            c = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            c.execute("PRAGMA journal_mode=WAL")
+            c.execute("PRAGMA synchronous=NORMAL")  # WAL 下只在检查点 fsync，每次提交不落盘
+            self._local.conn = c
+        return c
+
+    def _tx(self):
+        return _Transaction(self._conn())
+
+    def _read(self, c, user_id):
+        row = c.execute("SELECT data, version FROM profiles WHERE user_id = ?", (user_id,)).fetchone()
+        data = copy.deepcopy(self.defaults)
+        if row is None: return data, 0
+        data.update(json.loads(row[0]))
+        return data, row[1]
+
+    def _write(self, c, user_id, data, version):
+        raw = json.dumps(data, ensure_ascii=False)
+        count("profiles.bytes_written", len(raw.encode("utf-8")))
+        c.execute("INSERT INTO profiles (user_id, data, version, updated_at) VALUES (?, ?, ?, ?) "
+                  "ON CONFLICT(user_id) DO UPDATE SET data = excluded.data, version = excluded.version, "
+                  "updated_at = excluded.updated_at",
+                  (user_id, raw, version, time.time()))
+
+    # ---- 读写 ----
+    def load(self, user_id):
+        """返回 (档案, 版本号)；未保存过的用户版本号为 0"""
+        return self._read(self._conn(), user_id)
+
+    def __iter__(self):
+        """(user_id, 档案)，批量任务 (如早饭时间的推送) 用"""
+        rows = self._conn().execute("SELECT user_id, data FROM profiles ORDER BY user_id").fetchall()
+        for user_id, raw in rows:
+            data = copy.deepcopy(self.defaults); data.update(json.loads(raw))
+            yield user_id, data
+
+    def save(self, user_id, data, expected_version=None):
+        """整份覆盖写入，返回新版本号"""
+        return self.apply(user_id, [("set", k, v) for k, v in data.items()], expected_version)[1]
+
+    def apply(self, user_id, ops, expected_version=None):
+        """立即在一个事务里执行 ops，返回 (新档案, 新版本号)"""
+        with self._tx() as c:
+            data, version = self._read(c, user_id)
+            if expected_version is not None and expected_version != version:
+                raise VersionConflict(user_id, expected_version, version)
+            apply_ops(data, ops)
+            self._write(c, user_id, data, version + 1)
+        return data, version + 1
+
+    def queue(self, user_id, *ops):
+        """攒起来稍后写；连续快速点击只落一次盘"""
+        with self._lock:
+            self._pending.setdefault(user_id, []).extend(ops)
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    @timed("profiles.flush")
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None: self._timer.cancel(); self._timer = None
+        if not pending: return
+        with self._tx() as c:
+            for user_id, ops in pending.items():
+                data, version = self._read(c, user_id)
+                self._write(c, user_id, apply_ops(data, ops), version + 1)
+
+    def migrate_legacy(self, legacy_path, user_id="default"):
+        """把旧版单文件 user_data.json 导入为 user_id 的档案 (只在该用户尚无记录时)"""
+        if not os.path.exists(legacy_path) or self.load(user_id)[1]: return False
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f: saved = json.load(f)
+        except (OSError, ValueError): return False
+        try: self.apply(user_id, [("set", k, v) for k, v in saved.items()], expected_version=0)
+        except VersionConflict: return False  # 另一个进程同时启动、已经先导入了
+        return True
+
+
+class _Transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")  # 先拿写锁，读-改-写之间不会被别的进程插队
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
@@ -0,0 +1,9 @@
+# telemetry: 热路径埋点 (计时/计数)、按 rerun 的明细、采样剖析与本地导出，默认关闭
+from telemetry.core import RERUNS, begin_rerun, count, enable, enabled, end_rerun, gauge, record, reset, snapshot, span, timed
+from telemetry.export import append_jsonl, prometheus_text, write_prometheus
+from telemetry.profiler import SamplingProfiler, folded
+
+__all__ = [
+    "RERUNS", "SamplingProfiler", "append_jsonl", "begin_rerun", "count", "enable", "enabled", "end_rerun", "folded",
+    "gauge", "prometheus_text", "record", "reset", "snapshot", "span", "timed", "write_prometheus",
+]
@@ -0,0 +1,152 @@
+# telemetry/core.py
+# 计时区间 (span)、计数器、仪表值 (gauge)，以及按 rerun 归集的明细
+#
+# 默认关闭 (UUKITCHEN_TELEMETRY=1 或 enable() 对整个进程打开)。关闭时 span() 返回同一个空上下文，
+# @timed 包装只多一两次全局判断，count() 直接返回 —— 埋点可以常驻在热路径上。
+# begin_rerun(scoped=True) 只对当前线程的这一次 rerun 打开 (调试面板)，不影响其他会话，end_rerun 时自动关回去。
+# 打开后：全局累计每个 span 的次数/总耗时/最大值与计数器总数；同时按线程记录"当前 rerun"的明细，
+# Streamlit 每个会话的 rerun 跑在自己的脚本线程里，互不串台。
+
+import functools
+import os
+import threading
+import time
+from collections import deque
+
+_enabled = os.environ.get("UUKITCHEN_TELEMETRY", "") not in ("", "0")
+_scoped = 0        # 正在按线程单独打开埋点的 rerun 数；为 0 时热路径不查 threading.local
+_lock = threading.Lock()
+_local = threading.local()
+_spans = {}        # 名称 -> [次数, 总秒数, 最大秒数]
+_counters = {}
+_gauges = {}       # 名称 -> 无参函数，导出时现取
+RERUNS = deque(maxlen=50)   # 最近的 rerun 明细 (end_rerun 的返回值)
+
+
+def enabled():
+    return bool(_enabled or _scoped and getattr(_local, "on", False))
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = bool(on)
+
+
+def record(name, seconds):
+    with _lock:
+        s = _spans.get(name)
+        if s is None: _spans[name] = [1, seconds, seconds]
+        else:
+            s[0] += 1; s[1] += seconds
+            if seconds > s[2]: s[2] = seconds
+    run = getattr(_local, "run", None)
+    if run is not None:
+        r = run["spans"].setdefault(name, [0, 0.0])
+        r[0] += 1; r[1] += seconds * 1000
+
+
+class _Span:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.t0)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+
+_NULL = _NullSpan()
+
+
+def span(name):
+    """with span("render.card"): ..."""
+    return _Span(name) if _enabled or _scoped and getattr(_local, "on", False) else _NULL
+
+
+def timed(name=None):
+    """给函数整体计时的装饰器；名称默认 模块.函数"""
+    def deco(fn):
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not (_enabled or _scoped and getattr(_local, "on", False)): return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try: return fn(*args, **kwargs)
+            finally: record(label, time.perf_counter() - t0)
+        return wrapper
+    return deco
+
+
+def count(name, n=1):
+    if not (_enabled or _scoped and getattr(_local, "on", False)): return
+    with _lock: _counters[name] = _counters.get(name, 0) + n
+    run = getattr(_local, "run", None)
+    if run is not None: run["counters"][name] = run["counters"].get(name, 0) + n
+
+
+def gauge(name, fn):
+    """登记一个仪表值 (如缓存命中数)，导出/面板展示时调用 fn() 取值"""
+    _gauges[name] = fn
+
+
+# ---- 按 rerun 归集 ----
+def begin_rerun(started=None, profiler=None, scoped=False):
+    """脚本开头调用；profiler (SamplingProfiler) 给定时同时对本线程采样。
+    scoped=True 时即使全局未开启，也只为本线程的这次 rerun 打开埋点"""
+    global _scoped
+    scoped = bool(scoped)
+    if getattr(_local, "on", False) != scoped:  # 上次 rerun 被打断、没走到 end_rerun 时也在这里归位
+        with _lock: _scoped += 1 if scoped else -1
+        _local.on = scoped
+    if not (_enabled or scoped): _local.run = None; return
+    _local.run = {"t0": started or time.perf_counter(), "spans": {}, "counters": {}, "profiler": profiler}
+    if profiler is not None: profiler.watch()
+
+
+def end_rerun(**extra):
+    """脚本结尾调用，返回本次 rerun 的明细 dict (未开启时返回 None)"""
+    global _scoped
+    if getattr(_local, "on", False):
+        with _lock: _scoped -= 1
+        _local.on = False
+    run = getattr(_local, "run", None)
+    if run is None: return None
+    _local.run = None
+    out = {"time": time.time(), "ms": round((time.perf_counter() - run["t0"]) * 1000, 3),
+           "spans": {k: {"n": n, "ms": round(ms, 3)} for k, (n, ms) in run["spans"].items()},
+           "counters": dict(run["counters"]), **extra}
+    if run["profiler"] is not None: run["profiler"].unwatch(out)
+    RERUNS.append(out)
+    return out
+
+
+def snapshot():
+    """全局累计值：{"spans": {名称: {n, total_ms, max_ms}}, "counters": {...}, "gauges": {...}}"""
+    with _lock:
+        spans = {k: {"n": n, "total_ms": round(t * 1000, 3), "max_ms": round(m * 1000, 3)} for k, (n, t, m) in _spans.items()}
+        counters = dict(_counters)
+    gauges = {}
+    for k, fn in list(_gauges.items()):
+        try: gauges[k] = fn()
+        except Exception: continue  # 仪表取值失败不影响页面
+    return {"spans": spans, "counters": counters, "gauges": gauges}
+
+
+def reset():
+    with _lock: _spans.clear(); _counters.clear()
+    RERUNS.clear()
@@ -0,0 +1,46 @@
+# telemetry/export.py
+# 导出到本地文件：Prometheus 文本格式 (node_exporter 的 textfile collector 可直接收) 与 JSON Lines
+#
+# Prometheus 文件整份重写 (临时文件 + os.replace，采集方不会读到半份)；rerun 明细逐行追加。
+
+import json
+import os
+import re
+
+from telemetry.core import snapshot
+
+PREFIX = "uukitchen"
+_BAD = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _label(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(snap=None):
+    snap = snap or snapshot()
+    lines = [f"# TYPE {PREFIX}_span_seconds summary"]
+    for name, s in sorted(snap["spans"].items()):
+        lines.append(f'{PREFIX}_span_seconds_count{{span="{_label(name)}"}} {s["n"]}')
+        lines.append(f'{PREFIX}_span_seconds_sum{{span="{_label(name)}"}} {s["total_ms"] / 1000:.6f}')
+    lines.append(f"# TYPE {PREFIX}_span_seconds_max gauge")
+    for name, s in sorted(snap["spans"].items()):
+        lines.append(f'{PREFIX}_span_seconds_max{{span="{_label(name)}"}} {s["max_ms"] / 1000:.6f}')
+    for kind, typ in (("counters", "counter"), ("gauges", "gauge")):
+        for name, v in sorted(snap[kind].items()):
+            metric = f"{PREFIX}_{_BAD.sub('_', name)}" + ("_total" if typ == "counter" else "")
+            lines.append(f"# TYPE {metric} {typ}")
+            lines.append(f"{metric} {v}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path, snap=None):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f: f.write(prometheus_text(snap))
+    os.replace(tmp, path)
+
+
+def append_jsonl(path, record):
+    """一条 rerun 明细追加一行 (不含火焰图数据，那部分单独存 .folded)"""
+    line = json.dumps({k: v for k, v in record.items() if k != "folded"}, ensure_ascii=False) + "\n"
+    with open(path, "a", encoding="utf-8") as f: f.write(line)
@@ -0,0 +1,82 @@
+# telemetry/profiler.py
+# 采样式剖析：后台线程每隔 interval 抓一次被监视线程的调用栈，汇总成 folded 格式
+#
+# folded 格式每行 "外层;...;内层 次数"，flamegraph.pl、speedscope 都能直接画火焰图。
+# 只对登记过的线程 (正在 rerun 的脚本线程) 采样，没有登记时采样线程挂起不占 CPU。
+# 每次 rerun 结束时只保留最慢的 keep 次的栈，其余丢弃。
+
+import heapq
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+_MAX_DEPTH = 64
+
+
+def _frame_label(f):
+    code = f.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _stack(frame):
+    out = []
+    while frame is not None and len(out) < _MAX_DEPTH:
+        out.append(_frame_label(frame)); frame = frame.f_back
+    return ";".join(reversed(out))
+
+
+class SamplingProfiler:
+    def __init__(self, interval=0.005, keep=5):
+        self.interval, self.keep = interval, keep
+        self.slowest = []      # 小顶堆 [(ms, 序号, rerun 明细)]，rerun 明细里带 "folded"
+        self._seq = 0
+        self._watched = {}     # 线程 ID -> Counter
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            with self._lock:
+                targets = dict(self._watched)
+                if not targets: self._wake.clear()
+            if not targets: continue
+            frames = sys._current_frames()
+            for tid, stacks in targets.items():
+                f = frames.get(tid)
+                if f is not None: stacks[_stack(f)] += 1
+            del frames
+            time.sleep(self.interval)
+
+    def watch(self, thread_id=None):
+        """开始对 thread_id (默认当前线程) 采样"""
+        with self._lock:
+            self._watched[thread_id or threading.get_ident()] = Counter()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="telemetry-profiler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def unwatch(self, rerun=None, thread_id=None):
+        """停止采样；rerun (明细 dict) 属于最慢的 keep 次时把栈存进去并留下"""
+        with self._lock: stacks = self._watched.pop(thread_id or threading.get_ident(), None)
+        if stacks is None or rerun is None: return stacks
+        with self._lock:
+            if len(self.slowest) < self.keep or rerun["ms"] > self.slowest[0][0]:
+                rerun["folded"] = folded(stacks); rerun["samples"] = sum(stacks.values())
+                self._seq += 1
+                item = (rerun["ms"], self._seq, rerun)
+                if len(self.slowest) < self.keep: heapq.heappush(self.slowest, item)
+                else: heapq.heapreplace(self.slowest, item)
+        return stacks
+
+    def slowest_reruns(self):
+        """最慢的几次 rerun，最慢在前"""
+        with self._lock: return [r for _, _, r in sorted(self.slowest, key=lambda x: -x[0])]
+
+
+def folded(stacks):
+    return "".join(f"{stack} {n}\n" for stack, n in stacks.most_common())
@@ -0,0 +1,55 @@
+# tests/test_allergens.py
+# Aho-Corasick 与朴素子串查找一致；过敏原位掩码过滤与逐菜逐食材的朴素检查一致 (含层级与自定义过敏原)
+
+import random
+
+from planner import build_index
+from planner.index import iter_bits
+from planner.normalize import NORMALIZER
+from planner.textmatch import AhoCorasick
+from recipe_data import ALLERGEN_HIERARCHY, RECIPES_DB
+
+
+def test_matches_agree_with_naive_search():
+    rng = random.Random(0)
+    for _ in range(200):
+        pats = {"".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(6)}
+        text = "".join(rng.choice("abcd") for _ in range(30))
+        got = sorted(AhoCorasick(pats).iter_matches(text))
+        want = sorted((i, p) for p in pats for i in range(len(text)) if text.startswith(p, i))
+        assert got == want
+
+
+def test_find_all_is_leftmost_longest():
+    ac = AhoCorasick(["胡萝卜", "萝卜", "鸡蛋", "蛋"])
+    assert ac.find_all("两根胡萝卜和三个鸡蛋，一个蛋黄") == ["胡萝卜", "鸡蛋", "蛋"]
+    assert ac.contains_any("萝卜丝") and not ac.contains_any("土豆")
+    ac.add("土豆")                                   # 加词后下次查询前自动重建
+    assert ac.find_all("土豆丝") == ["土豆"]
+
+
+def _naive_unsafe(index, terms):
+    terms = set(terms) | {NORMALIZER.canonical(t) for t in terms}
+    out = 0
+    for rid, dish in enumerate(index.dishes):
+        for ing in dish["ingredients"]:
+            if any(t in ing or t in NORMALIZER.canonical(ing) for t in terms): out |= 1 << rid; break
+    return out
+
+
+def test_masks_match_naive_scan_with_hierarchy():
+    index = build_index(RECIPES_DB)
+    for parent, members in ALLERGEN_HIERARCHY.items():
+        assert index.allergen_mask([parent]) == _naive_unsafe(index, [parent, *members])
+        for m in members: assert index.allergen_mask([m]) & ~_naive_unsafe(index, [m]) == 0
+    safe = index.safe_pool("lunch_meat", ["鸡蛋", "虾"])
+    assert all(index.allergens.is_safe(rid, index.allergens.profile_mask(["鸡蛋", "虾"])) for rid in iter_bits(safe))
+
+
+def test_custom_allergen_registers_one_new_bit():
+    index = build_index(RECIPES_DB); eng = index.allergens
+    before = len(eng.categories)
+    assert index.allergen_mask(["土豆"]) == _naive_unsafe(index, ["土豆"]) != 0
+    assert len(eng.categories) == before + 1
+    index.allergen_mask(["土豆"]); assert len(eng.categories) == before + 1
+    assert eng.contains("小土豆", ["土豆"]) and not eng.contains("大米", ["土豆"])
@@ -0,0 +1,12 @@
+# tests/test_card.py
+# 卡片渲染：空槽位 (如没抽到的晚汤) 显示 "--"，不报错
+
+from render import CardCache, card_menu, menu_card_png, sample_menu
+
+
+def test_empty_slots_render_as_placeholder():
+    menu = dict(sample_menu(), dinner_soup=None, fruit=None)
+    card = card_menu(menu)
+    assert card['dinner_soup'] == {'name': "--"} and card['fruit'] == "--"
+    assert menu_card_png(card, "Bingo", cache=CardCache()).startswith(b"\x89PNG")
+
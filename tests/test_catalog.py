@@ -0,0 +1,63 @@
+# tests/test_catalog.py
+# 段文件的往返：JSONL -> .seg -> mmap 读回的菜与索引，和直接用 dict 建的完全一致
+
+import pytest
+
+from bench.synthetic import synthetic_catalog
+from catalog import Postings, load_catalog, segment_path, write_jsonl
+from planner.index import RecipeIndex
+from planner.normalize import NORMALIZER
+
+
+@pytest.fixture(scope="module")
+def source():
+    return synthetic_catalog(300, seed=1)
+
+
+@pytest.fixture(scope="module")
+def catalog(source, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("cat") / "recipes.jsonl")
+    write_jsonl(source, path)
+    load_catalog(path)                       # 第一次：逐行解析并写出 .seg
+    return load_catalog(path)                # 第二次：直接 attach 现成的段
+
+
+def _plain(d):
+    """热字段在 Recipe 里是 tuple，比较时统一成 list"""
+    return {k: list(v) if isinstance(v, tuple) else v for k, v in dict(d).items()}
+
+
+def test_segment_written_and_attached(catalog):
+    assert catalog.segment.path == segment_path(catalog.path)
+
+
+def test_records_round_trip(source, catalog):
+    db = catalog.as_db()
+    assert db['fruit'] == source['fruit']
+    for course, pool in source.items():
+        if course == 'fruit': continue
+        assert [_plain(d) for d in db[course]] == [_plain(d) for d in pool]
+
+
+def test_index_matches_dict_build(source, catalog):
+    a, b = RecipeIndex(source, NORMALIZER), RecipeIndex(catalog.as_db(), NORMALIZER)
+    assert [d['name'] for d in a.dishes] == [d['name'] for d in b.dishes]
+    assert a.courses == b.courses
+    assert a.raw_postings == dict(b.raw_postings)
+    assert a.postings == dict(b.postings)
+    assert a.tag_postings == dict(b.tag_postings)
+    assert all(a.ing_ids[r] == b.ing_ids[r] for r in range(len(a)))
+    name = source['lunch_meat'][3]['name']
+    assert a.named([name]) == b.named([name])
+    assert a.allergen_mask(["鸡蛋", "虾"]) == b.allergen_mask(["鸡蛋", "虾"])
+
+
+def test_postings_cache_budget(catalog):
+    sg = catalog.segment
+    raw = catalog.raw_postings()
+    keys = list(raw)[:5]
+    capped = Postings(sg, sg.post, raw.slots, cache_bytes=2 * sg.nb)
+    assert [capped[k] for k in keys] == [raw[k] for k in keys]
+    assert len(capped._cache) == 2 and not raw._cache
+    with pytest.raises(KeyError): raw["不存在的食材"]
+    assert raw.get("不存在的食材", 0) == 0
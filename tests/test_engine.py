@@ -0,0 +1,19 @@
+# tests/test_engine.py
+# 单日菜单：冰箱只全匹配一道汤时，晚汤也不能空着 (排除午汤后退回整个安全菜池)
+
+import random
+
+import pytest
+
+from planner.engine import MenuPlanner
+from recipe_data import RECIPES_DB
+
+PROFILE = {"fridge_items": ["西红柿", "香菇"], "allergens": [], "likes": [], "dislikes": []}
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_dinner_soup_filled_when_fridge_matches_one_soup(seed):
+    planner = MenuPlanner(RECIPES_DB, dict(PROFILE), rng=random.Random(seed))
+    ms = planner.generate_menu()
+    assert ms['lunch_soup']['name'] == "🥣 番茄菌菇汤"    # 唯一全匹配的汤优先
+    assert ms['dinner_soup'] is not None and ms['dinner_soup']['name'] != ms['lunch_soup']['name']
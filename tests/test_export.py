@@ -0,0 +1,36 @@
+# tests/test_export.py
+# 批量导出：档案按需读取、边规划边渲染；PDF 结构完整
+
+import itertools
+import zipfile
+
+from render.export import cards_pdf, export_cards, render_cards
+
+_PROFILE = {"nickname": "Bingo", "fridge_items": ["鸡蛋", "西红柿"], "allergens": [], "likes": [], "dislikes": []}
+
+
+def test_plan_jobs_are_read_lazily():
+    pulled = []
+
+    def jobs():
+        for i in itertools.count():
+            pulled.append(i); yield f"f{i}", dict(_PROFILE)
+    out = render_cards(jobs(), processes=1, chunksize=4, plan=True)
+    names = [name for name, png, _ in itertools.islice(out, 3)]
+    assert names == ["f0", "f1", "f2"]
+    assert len(pulled) == 4          # 只读了第一块
+
+
+def test_export_zip_and_pdf(tmp_path):
+    jobs = ((f"family{i}", dict(_PROFILE)) for i in range(5))
+    out = export_cards(jobs, str(tmp_path / "a.zip"), str(tmp_path / "a.pdf"), processes=1, chunksize=2, plan=True)
+    assert out["cards"] == 5
+    assert zipfile.ZipFile(tmp_path / "a.zip").namelist() == [f"family{i}.png" for i in range(5)]
+    pdf = (tmp_path / "a.pdf").read_bytes()
+    assert pdf.startswith(b"%PDF-1.4") and pdf.rstrip().endswith(b"%%EOF") and b"/Count 5" in pdf
+
+
+def test_cards_pdf_in_memory():
+    from planner import plan_batch
+    menu = plan_batch([_PROFILE], seed=0)[0]
+    assert b"/Count 2" in cards_pdf([("d1", menu, "Bingo"), ("d2", menu, "Bingo")])
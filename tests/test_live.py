@@ -0,0 +1,47 @@
+# tests/test_live.py
+# 菜谱热加载：改 JSONL -> 后台加载 -> prepare -> 切换 -> on_retire；旧版本的菜照样读冷字段；文件写坏时保留旧版本
+
+import pytest
+
+from bench.synthetic import synthetic_catalog
+from catalog import LiveCatalog, write_jsonl
+from planner import build_index, drop_index
+from planner import engine
+
+
+@pytest.fixture
+def live(tmp_path):
+    db = synthetic_catalog(100, seed=2)
+    path = str(tmp_path / "recipes.jsonl"); write_jsonl(db, path)
+    live = LiveCatalog(path)
+    calls = []
+    live.prepare.append(lambda snap: (calls.append(("prepare", snap.version)), build_index(snap.db)))
+    live.on_retire.append(lambda snap: (calls.append(("retire", snap.version)), drop_index(snap.db)))
+    live.calls, live.source = calls, db
+    return live
+
+
+def test_reload_swaps_and_retires(live):
+    old = live.snapshot(); build_index(old.db)
+    dish = old.db['soup'][0]; steps = dish['steps_list']
+    db = dict(live.source, soup=[dict(live.source['soup'][0], name="新汤"), *live.source['soup'][1:]])
+    write_jsonl(db, live.path)
+    assert live.changed()
+    live.reload(wait=True)
+    new = live.snapshot()
+    assert live.error is None and new.version == old.version + 1
+    assert new.db['soup'][0]['name'] == "新汤"
+    assert live.calls == [("prepare", new.version), ("retire", old.version)]
+    assert dish['steps_list'] == steps                # 旧段已被替换，旧版本的菜仍能读冷字段
+    assert id(old.db) not in engine._INDEXES and id(new.db) in engine._INDEXES
+
+
+def test_broken_file_keeps_previous_snapshot(live):
+    old = live.snapshot()
+    with open(live.path, "a", encoding="utf-8") as f: f.write("{这一行写坏了\n")
+    live.reload(wait=True)
+    assert live.snapshot() is old and live.error is not None
+    assert live.calls == []
+    write_jsonl(live.source, live.path)               # 文件修好后恢复正常
+    live.reload(wait=True)
+    assert live.error is None and live.version == old.version + 1
@@ -0,0 +1,58 @@
+# tests/test_nutrition.py
+# 营养配餐的硬约束 (与随机挑菜相同)：同日不重名、最多一道红肉、不含过敏原、N 天内不重复；目标按年龄分档
+
+import random
+
+import pytest
+
+from planner.normalize import normalize_ingredient
+from planner.nutrition import DAILY_TARGETS, HOME_SHARE, NutritionPlanner, daily_targets, parse_age
+from planner.rules import MENU_SLOTS, RED_MEAT
+from recipe_data import RECIPES_DB
+
+PROFILE = {"nickname": "Bingo", "age": "2岁", "weight": "13", "nutrition_goals": ["补钙"], "allergens": ["牛奶", "鸡蛋"],
+           "fridge_items": ["西红柿", "土豆"], "likes": [], "dislikes": []}
+
+
+def _is_red(dish):
+    return any(normalize_ingredient(i) in RED_MEAT for i in dish['ingredients'])
+
+
+def _check_day(planner, menu):
+    dishes = [menu[s] for s in MENU_SLOTS if menu[s]]
+    names = [d['name'] for d in dishes]
+    assert len(names) == len(set(names))
+    assert sum(map(_is_red, dishes)) <= 1
+    eng = planner.index.allergens
+    for d in dishes:
+        assert not any(eng.contains(i, PROFILE['allergens']) for i in d['ingredients']), d['name']
+    return names
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_day_constraints(seed):
+    planner = NutritionPlanner(RECIPES_DB, dict(PROFILE), rng=random.Random(seed), budget_ms=1000)
+    menu = planner.generate_menu()
+    assert len(_check_day(planner, menu)) == len(MENU_SLOTS) and menu['fruit']
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_week_no_repeats(seed):
+    planner = NutritionPlanner(RECIPES_DB, dict(PROFILE), rng=random.Random(seed), budget_ms=1000)
+    plan = planner.plan_week(days=7, no_repeat_days=3)
+    days = [_check_day(planner, m) for m in plan['days']]
+    for d in range(len(days)):
+        for prev in days[max(0, d - 2):d]: assert not set(days[d]) & set(prev)
+
+
+@pytest.mark.parametrize("age, band", [("1岁半", 0), ("18个月", 0), ("4", 1), ("8岁", 2), ("15", 3), ("40", 4), ("250", 4)])
+def test_targets_by_age(age, band):
+    target = daily_targets({"age": age})
+    assert target.tolist() == pytest.approx([v * HOME_SHARE for v in DAILY_TARGETS[band][2]])
+
+
+def test_weight_scales_energy_and_protein_only():
+    base, heavy = daily_targets({"age": "2岁"}), daily_targets({"age": "2岁", "weight": "16"})
+    assert heavy[0] == pytest.approx(base[0] * 16 / 13) and heavy[1] == pytest.approx(base[1] * 16 / 13)
+    assert heavy[2:].tolist() == pytest.approx(base[2:].tolist())
+    assert parse_age("") == 2.0
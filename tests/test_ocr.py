@@ -0,0 +1,32 @@
+# tests/test_ocr.py
+# 识别后端的选择 (没装依赖时退回 none) 与识别文字 -> 食材
+
+import io
+
+import pytest
+from PIL import Image
+
+from ocr import BackendUnavailable, OcrWorker, load_backend, match_ingredients
+from ocr import pipeline
+
+
+def _missing():
+    raise BackendUnavailable("not installed")
+
+
+def test_auto_falls_back_to_none(monkeypatch):
+    monkeypatch.setitem(pipeline._BACKENDS, "rapidocr", _missing)
+    monkeypatch.setitem(pipeline._BACKENDS, "tesseract", _missing)
+    name, fn = load_backend("auto")
+    assert name == "none" and fn(None) == ""
+    with pytest.raises(ValueError): load_backend("nope")
+
+
+def test_worker_runs_pipeline_and_caches(monkeypatch):
+    monkeypatch.setitem(pipeline._BACKENDS, "fake", lambda: lambda img: "番茄 两个\n鸡蛋")
+    buf = io.BytesIO(); Image.new("RGB", (40, 30), "white").save(buf, format="PNG")
+    worker = OcrWorker("fake")
+    res = worker.recognize_now(buf.getvalue())
+    assert worker.backend == "fake" and res["items"] == match_ingredients("番茄 两个\n鸡蛋")
+    assert "鸡蛋" in res["items"] and worker.poll(worker.submit(buf.getvalue())) is res
+    worker.shutdown()
@@ -0,0 +1,49 @@
+# tests/test_pantry.py
+# "冰箱能做什么"：增量计数与整表重算一致；结果不含过敏原、不重名、按覆盖度取到真正的前 k
+
+import random
+
+import numpy as np
+
+from planner import build_index
+from planner.pantry import FridgeQuery
+from recipe_data import FRIDGE_CATEGORIES, RECIPES_DB
+
+VOCAB = sorted({x for items in FRIDGE_CATEGORIES.values() for x in items})
+
+
+def _profile(fridge, allergens=()):
+    return {"fridge_items": list(fridge), "allergens": list(allergens), "likes": [], "dislikes": []}
+
+
+def test_incremental_counts_match_recount():
+    index = build_index(RECIPES_DB); q = FridgeQuery(index); rng = random.Random(0)
+    fridge = set()
+    for _ in range(40):
+        for x in rng.sample(VOCAB, 3): fridge ^= {x}          # 每步增减几样
+        q.set_fridge(fridge)
+        have = index.norm_fridge(fridge)
+        assert q.matched.tolist() == [len(ids & have) for ids in index.ing_ids]
+    q.set_fridge([])
+    assert not q.matched.any()
+
+
+def test_top_is_safe_unique_and_best():
+    index = build_index(RECIPES_DB); rng = random.Random(1)
+    for _ in range(10):
+        fridge, allergens = rng.sample(VOCAB, 8), rng.sample(["鸡蛋", "牛奶", "虾", "鱼"], 2)
+        q = FridgeQuery(index, taste_weight=0.0)
+        out = q.top(_profile(fridge, allergens), k=5)
+        unsafe = index.allergen_mask(allergens)
+        names = [r["dish"]["name"] for r in out]
+        assert len(names) == len(set(names))
+        for r in out:
+            assert not index.named([r["dish"]["name"]]) & unsafe, r["dish"]["name"]
+            assert r["matched"] and set(r["matched"]).isdisjoint(r["missing"])
+        have = index.norm_fridge(fridge)
+        best = {}                                            # 同名菜取覆盖度最高的那道
+        for rid, (d, ids) in enumerate(zip(index.dishes, index.ing_ids)):
+            if ids & have and not unsafe >> rid & 1: best[d["name"]] = max(best.get(d["name"], 0), len(ids & have) / len(ids))
+        best = sorted(best.values(), reverse=True)
+        assert len(out) == min(5, len(best))
+        assert [r["coverage"] for r in out] == list(np.round(best[:len(out)], 3))
@@ -0,0 +1,77 @@
+# tests/test_push.py
+# 推送队列：可重试的失败按退避重试、不可重试的直接放弃；消息按需读取；对本地假 PushPlus 端到端
+
+import random
+import threading
+
+from push import PushDispatcher, PushError, PushJob, PushPlusSender, build_message
+from push.mock import MockPushServer
+
+
+class FlakySender:
+    """前 fails 次抛可重试错误，之后成功；记下每个 token 的尝试次数"""
+
+    def __init__(self, fails=0, retryable=True):
+        self.fails, self.retryable, self.calls = fails, retryable, {}
+        self._lock = threading.Lock()
+
+    def __call__(self, token, message):
+        with self._lock: n = self.calls[token] = self.calls.get(token, 0) + 1
+        if n <= self.fails: raise PushError("boom", retryable=self.retryable)
+        return {"code": 200}
+
+
+def _dispatcher(sender, **kw):
+    return PushDispatcher(sender, concurrency=4, base_delay=0.001, rng=random.Random(0), **kw)
+
+
+def test_backoff_grows_and_is_capped():
+    d = _dispatcher(FlakySender(), max_delay=0.004)
+    for attempt, cap in ((1, 0.001), (2, 0.002), (3, 0.004), (6, 0.004)):
+        assert cap / 2 <= d.backoff(attempt) < cap
+    d.close()
+
+
+def test_retries_then_succeeds():
+    sender = FlakySender(fails=2); d = _dispatcher(sender)
+    results = d.send_all(PushJob(f"u{i}", f"t{i}", {}) for i in range(10))
+    d.close()
+    assert [r.user_id for r in results] == [f"u{i}" for i in range(10)]
+    assert all(r.ok and r.attempts == 3 for r in results)
+    assert d.metrics.summary()["retries"] == 20
+
+
+def test_gives_up_after_max_attempts_and_on_fatal_errors():
+    d = _dispatcher(FlakySender(fails=99), max_attempts=3)
+    [r] = d.send_all([PushJob("u", "t", {})]); d.close()
+    assert not r.ok and r.attempts == 3
+    d = _dispatcher(FlakySender(fails=99, retryable=False))
+    [r] = d.send_all([PushJob("u", "t", {})]); d.close()
+    assert not r.ok and r.attempts == 1
+
+
+def test_jobs_are_pulled_lazily():
+    pulled, seen = [], []
+
+    def sender(token, message):
+        seen.append(len(pulled)); return {"code": 200}
+
+    def jobs():
+        for i in range(100):
+            pulled.append(i); yield PushJob(f"u{i}", f"t{i}", {})
+    d = _dispatcher(sender)
+    assert len(d.send_all(jobs())) == 100
+    d.close()
+    assert min(seen) <= 2 * 4 + 4 + 1   # 队列有界：第一条发出时只取了几条，没有先全部生成
+
+
+def test_against_mock_server():
+    message = build_message({"breakfast": "小米粥", "lunch_meat": "红烧肉"}, "Bingo", with_image=True, png=b"png")
+    assert "data:image/png;base64,cG5n" in message["content"]
+    with MockPushServer(fail_rate=0.3, throttle_rate=0.1, seed=1) as mock:
+        sender = PushPlusSender(mock.url, pool_size=4); d = _dispatcher(sender, max_attempts=10)
+        results = d.send_all(PushJob(f"u{i}", f"t{i}", message) for i in range(20))
+        d.close(); sender.close()
+    assert all(r.ok for r in results)
+    assert sorted(t for t, _ in mock.received) == sorted(f"t{i}" for i in range(20))
+    assert mock.requests == 20 + d.metrics.summary()["retries"]
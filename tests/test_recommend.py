@@ -0,0 +1,48 @@
+# tests/test_recommend.py
+# 口味模型：反馈方向、抽样概率的边界情况 (极低温度 / epsilon=0) 与参数校验
+
+import random
+
+import numpy as np
+import pytest
+
+from planner.engine import MenuPlanner, build_index
+from planner.index import iter_bits
+from planner.recommend import DEFAULT_PARAMS, PreferenceModel
+from recipe_data import RECIPES_DB
+
+PROFILE = {"fridge_items": [], "allergens": [], "likes": [], "dislikes": []}
+
+
+@pytest.fixture(scope="module")
+def index():
+    return build_index(RECIPES_DB)
+
+
+def _rids(index, course):
+    return np.fromiter(iter_bits(index.course(course)), dtype=np.int64)
+
+
+def test_feedback_moves_scores(index):
+    liked, disliked = RECIPES_DB['lunch_meat'][0]['name'], RECIPES_DB['lunch_meat'][1]['name']
+    model = PreferenceModel(index, likes=(liked,), dislikes=(disliked,))
+    rid = lambda name: next(iter_bits(index.named([name])))
+    assert model.scores[rid(liked)] > 0 > model.scores[rid(disliked)]
+    assert model.top(index.course("lunch_meat"), k=1) == [rid(liked)]
+
+
+@pytest.mark.parametrize("temperature", [1e-4, 1e-9])
+def test_greedy_params_keep_probabilities_positive(index, temperature):
+    params = DEFAULT_PARAMS._replace(temperature=temperature, epsilon=0.0)
+    model = PreferenceModel(index, likes=(RECIPES_DB['lunch_meat'][0]['name'],), params=params)
+    p = model.probabilities(_rids(index, "lunch_meat"))
+    assert (p > 0).all() and p.sum() == pytest.approx(1.0)
+    profile = dict(PROFILE, likes=[RECIPES_DB['lunch_meat'][0]['name']])
+    menu = MenuPlanner(RECIPES_DB, profile, index=index, rng=random.Random(0), params=params).generate_menu()
+    assert menu['lunch_meat']['name'] == RECIPES_DB['lunch_meat'][0]['name']
+
+
+@pytest.mark.parametrize("field, value", [("temperature", 0.0), ("temperature", -1.0), ("epsilon", -0.1), ("epsilon", 1.5), ("decay", 0.0)])
+def test_invalid_params_rejected(index, field, value):
+    with pytest.raises(ValueError):
+        PreferenceModel(index, params=DEFAULT_PARAMS._replace(**{field: value}))
@@ -0,0 +1,42 @@
+# tests/test_sampler.py
+# 别名法加权抽样：频率与权重成正比；排除项永不被抽中；排除大部分权重时走精确抽样也不空转
+
+import random
+from collections import Counter
+
+import pytest
+
+from planner.sampler import WeightedSampler
+
+
+def test_frequencies_follow_weights():
+    s = WeightedSampler("abcd", [1, 2, 3, 4], rng=random.Random(0))
+    got = Counter(s.sample() for _ in range(20000))
+    for it, w in zip("abcd", [1, 2, 3, 4]):
+        assert got[it] / 20000 == pytest.approx(w / 10, abs=0.02)
+
+
+def test_exclude_and_exhaustion():
+    s = WeightedSampler("abc", [1, 1, 1], rng=random.Random(1))
+    assert {s.sample(exclude=["a", "b"]) for _ in range(50)} == {"c"}
+    assert s.sample(exclude="abc") is None
+    assert s.sample(exclude=["zzz"]) in "abc"           # 不认识的排除项忽略
+    assert sorted(s.sample_k(5)) == ["a", "b", "c"]     # 不放回，不足 k 个给全部
+    assert WeightedSampler([], []).sample_k(3) == [] and WeightedSampler([], []).sample() is None
+
+
+def test_heavy_exclusion_uses_exact_path():
+    items = list(range(1000)); weights = [1000.0] * 999 + [0.001]
+    s = WeightedSampler(items, weights, rng=random.Random(2))
+    assert s.sample(exclude=items[:-1]) == 999          # 剩下的只占百万分之一的权重
+
+
+def test_reproducible_with_rng():
+    a = WeightedSampler("abcdef", [1, 5, 2, 2, 8, 1])
+    draws = lambda seed: a.sample_k(4, rng=random.Random(seed))
+    assert draws(3) == draws(3)
+
+
+def test_rejects_bad_weights():
+    with pytest.raises(ValueError): WeightedSampler("ab", [1])
+    with pytest.raises(ValueError): WeightedSampler("ab", [1, 0])
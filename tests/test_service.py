@@ -0,0 +1,100 @@
+# tests/test_service.py
+# 菜单 HTTP 服务：keep-alive 上的各接口、卡片 ETag / 304、慢速与超长请求头
+
+import asyncio
+import json
+
+import pytest
+
+from recipe_data import LIVE
+from service import HttpServer, MenuApi
+
+PROFILE = {"nickname": "Bingo", "fridge_items": ["鸡蛋", "土豆"], "allergens": ["牛奶"]}
+
+
+async def _request(reader, writer, method, path, body=None, headers=None):
+    data = json.dumps(body, ensure_ascii=False).encode("utf-8") if body is not None else b""
+    head = [f"{method} {path} HTTP/1.1", "Host: test", f"Content-Length: {len(data)}"]
+    head += [f"{k}: {v}" for k, v in (headers or {}).items()]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+    return await _response(reader)
+
+
+async def _response(reader):
+    status = int((await reader.readline()).split()[1])
+    hdrs = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""): break
+        k, _, v = line.decode("latin-1").partition(":")
+        hdrs[k.strip().lower()] = v.strip()
+    n = int(hdrs.get("content-length", 0))
+    return status, hdrs, (await reader.readexactly(n) if n else b"")
+
+
+def _serve(test, **kwargs):
+    async def run():
+        api = MenuApi(LIVE, render_workers=0, plan_threads=2)
+        server = await HttpServer(api, "127.0.0.1", 0, **kwargs).start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            try: await test(reader, writer)
+            finally: writer.close()
+        finally:
+            await server.close(); api.close()
+    asyncio.run(run())
+
+
+def test_endpoints_on_one_keep_alive_connection():
+    async def test(reader, writer):
+        status, hdrs, body = await _request(reader, writer, "POST", "/menu", {"profile": PROFILE, "seed": 1})
+        assert status == 200 and hdrs["connection"] == "keep-alive"
+        out = json.loads(body); menu, card = out["menu"], out["card"]
+        assert menu["breakfast"] and card.startswith("/card/")
+
+        status, hdrs, png = await _request(reader, writer, "GET", card)
+        assert status == 200 and png.startswith(b"\x89PNG") and hdrs["etag"] == f'"{card[6:-4]}"'
+        status, _, body = await _request(reader, writer, "GET", card, headers={"If-None-Match": hdrs["etag"]})
+        assert status == 304 and body == b""
+
+        status, _, body = await _request(reader, writer, "POST", "/swap", {"profile": PROFILE, "menu": menu, "slot": "lunch_veg"})
+        assert status == 200 and json.loads(body)["menu"]["lunch_meat"] == menu["lunch_meat"]
+        status, _, body = await _request(reader, writer, "POST", "/shopping-list", {"profile": PROFILE, "days": [menu, menu]})
+        assert status == 200 and "quantities" in json.loads(body)
+
+        assert (await _request(reader, writer, "POST", "/swap", {"menu": menu, "slot": "nope"}))[0] == 400
+        assert (await _request(reader, writer, "GET", "/nope"))[0] == 404
+        assert (await _request(reader, writer, "GET", "/menu"))[0] == 405
+        assert (await _request(reader, writer, "GET", "/healthz"))[0] == 200
+    _serve(test)
+
+
+def test_card_post_is_content_addressed():
+    async def test(reader, writer):
+        names = {"breakfast": "🥚 蒸水蛋", "fruit": "🍎 苹果片"}
+        a = await _request(reader, writer, "POST", "/card", {"menu": names, "nickname": "Bingo"})
+        b = await _request(reader, writer, "POST", "/card", {"menu": names, "nickname": "Bingo"})
+        c = await _request(reader, writer, "POST", "/card", {"menu": names, "nickname": "Bluey"})
+        assert a[0] == b[0] == c[0] == 200
+        assert a[1]["etag"] == b[1]["etag"] != c[1]["etag"] and a[2] == b[2]
+    _serve(test)
+
+
+def test_slow_headers_time_out():
+    async def test(reader, writer):
+        writer.write(b"GET /healthz HTTP/1.1\r\nHost: test\r\n")   # 头一直不发完
+        status, hdrs, _ = await asyncio.wait_for(_response(reader), 5)
+        assert status == 408 and hdrs["connection"] == "close"
+    _serve(test, idle_timeout=0.2)
+
+
+@pytest.mark.parametrize("request_bytes, expected", [
+    (b"GET /healthz HTTP/1.1\r\nX-Big: " + b"a" * 100_000 + b"\r\n\r\n", 431),
+    (b"GET /" + b"a" * 100_000 + b" HTTP/1.1\r\n\r\n", 414),
+])
+def test_overlong_lines_get_an_error_response(request_bytes, expected):
+    async def test(reader, writer):
+        writer.write(request_bytes)
+        status, hdrs, _ = await asyncio.wait_for(_response(reader), 5)
+        assert status == expected and hdrs["connection"] == "close"
+    _serve(test)
@@ -0,0 +1,53 @@
+# tests/test_shopping.py
+# 引用计数的缺货清单：增量换菜/改冰箱与整份重算一致；撤下按菜名认，不在清单里的菜报错
+
+import pytest
+
+from planner.shopping import ShoppingList, parse_quantities
+
+BEEF = {"name": "番茄土豆炖牛腩", "ingredients": ("牛肉", "土豆", "西红柿"), "full_ingredients": "牛腩 300g，番茄 2个，土豆 1个"}
+EGGS = {"name": "番茄炒蛋", "ingredients": ("鸡蛋", "番茄"), "full_ingredients": "鸡蛋 3个，番茄 1个"}
+RICE = {"name": "白米饭", "ingredients": ("大米",), "full_ingredients": ""}
+
+
+def _rebuilt(menu, fridge):
+    return ShoppingList.from_menu(menu, fridge).items()
+
+
+def test_shared_ingredient_stays_until_last_dish_leaves():
+    sl = ShoppingList.from_menu({"a": BEEF, "b": EGGS}, ["土豆"])
+    assert sl.items() == ["牛肉", "西红柿", "鸡蛋"]   # 番茄/西红柿同一种，只算一项
+    sl.remove_dish(BEEF)
+    assert sl.items() == ["番茄", "鸡蛋"]            # 还有番茄炒蛋要用，留着；显示改用剩下的写法
+    sl.remove_dish(EGGS)
+    assert sl.items() == [] and not sl.need
+
+
+def test_swap_matches_full_rebuild():
+    fridge = ["鸡蛋"]
+    sl = ShoppingList.from_menu({"a": BEEF, "b": RICE}, fridge)
+    sl.swap(BEEF, EGGS)
+    assert sl.items() == _rebuilt({"b": RICE, "a": EGGS}, fridge)
+    sl.swap(RICE, BEEF)
+    assert sorted(sl.items()) == sorted(_rebuilt({"a": EGGS, "b": BEEF}, fridge))
+
+
+def test_fridge_changes_flip_only_needed_items():
+    sl = ShoppingList.from_menu({"a": EGGS}, [])
+    sl.add_fridge(["西红柿"]); assert sl.items() == ["鸡蛋"]
+    sl.remove_fridge(["西红柿", "牛肉"]); assert sorted(sl.items()) == ["番茄", "鸡蛋"]
+    sl.set_fridge(["鸡蛋"]); assert sl.items() == ["番茄"]
+
+
+def test_remove_by_name_not_identity():
+    sl = ShoppingList.from_menu({"a": BEEF}, [])
+    sl.remove_dish(dict(BEEF))               # 相等但不是同一个对象 (如菜谱热加载后)
+    assert len(sl) == 0 and not sl.dishes
+    with pytest.raises(KeyError): sl.remove_dish(BEEF)
+
+
+def test_week_quantities_sum_by_unit():
+    sl = ShoppingList.from_menu([{"a": BEEF}, {"a": EGGS}, {"a": EGGS}], [])
+    q = sl.quantities()
+    assert q["鸡蛋"] == "6个" and q["番茄"] == "4个" and q["牛肉"] == "300g"
+    assert len(parse_quantities(RICE["full_ingredients"])) == 0
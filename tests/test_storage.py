@@ -0,0 +1,94 @@
+# tests/test_storage.py
+# 档案库：乐观锁版本号、攒写合并、旧版档案导入 (含多进程同时启动的竞争)
+# 历史收藏：JSONL 追加、从尾部倒读最近 N 条 (跨块、跳过半行)、旧版 JSON 数组迁移
+
+import json
+
+import pytest
+
+from storage import HistoryStore, ProfileStore, VersionConflict, history
+
+
+@pytest.fixture
+def db(tmp_path):
+    return str(tmp_path / "profiles.db")
+
+
+def test_versioned_apply(db):
+    store = ProfileStore(db, defaults={"likes": []})
+    assert store.load("u") == ({"likes": []}, 0)
+    data, v = store.apply("u", [("add", "likes", "面条"), ("add", "likes", "面条")])
+    assert data["likes"] == ["面条"] and v == 1
+    with pytest.raises(VersionConflict): store.apply("u", [("set", "nickname", "x")], expected_version=0)
+    store.queue("u", ("remove", "likes", "面条")); store.queue("u", ("set", "nickname", "Bingo"))
+    store.flush()
+    assert store.load("u") == ({"likes": [], "nickname": "Bingo"}, 2)
+
+
+def test_legacy_migration_race(db, tmp_path, monkeypatch):
+    legacy = tmp_path / "user_data.json"
+    legacy.write_text(json.dumps({"nickname": "Bingo"}), encoding="utf-8")
+    first = ProfileStore(db, legacy_path=str(legacy))
+    assert first.load("default") == ({"nickname": "Bingo"}, 1)
+    # 第二个进程在第一个导入之前做了"尚无记录"的检查，随后写入时才发现已被导入
+    second = ProfileStore(db)
+    monkeypatch.setattr(second, "load", lambda user_id: ({}, 0))
+    assert second.migrate_legacy(str(legacy)) is False
+    assert first.load("default") == ({"nickname": "Bingo"}, 1)
+
+
+def test_history_latest_across_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(history, "_BLOCK", 64)          # 小块，逼出跨块拼行
+    h = HistoryStore(str(tmp_path / "h.jsonl"))
+    assert h.latest(3) == []
+    for i in range(50): h.append({"i": i, "menu": "番茄炒蛋" * (i % 4)})
+    assert [x["i"] for x in h.latest(5)] == [49, 48, 47, 46, 45]
+    assert [x["i"] for x in h.latest(100)] == list(range(49, -1, -1))
+    assert [x["i"] for x in h] == list(range(50))
+
+
+def test_history_skips_torn_line(tmp_path):
+    path = tmp_path / "h.jsonl"; h = HistoryStore(str(path))
+    h.append({"i": 0})
+    with open(path, "ab") as f: f.write(b'{"i": 1, "men')   # 上次写到一半崩了
+    h.append({"i": 2})
+    assert [x["i"] for x in h.latest(5)] == [2, 0] and [x["i"] for x in h] == [0, 2]
+
+
+def test_history_migrates_legacy_once(tmp_path):
+    legacy = tmp_path / "menu_history.json"
+    legacy.write_text(json.dumps([{"i": 2}, {"i": 1}, {"i": 0}]), encoding="utf-8")   # 旧版最新在前
+    h = HistoryStore(str(tmp_path / "h.jsonl"), legacy_path=str(legacy))
+    assert [x["i"] for x in h] == [0, 1, 2] and h.latest(1) == [{"i": 2}]
+    assert not legacy.exists() and (tmp_path / "menu_history.json.bak").exists()
+    assert h.migrate_legacy(str(legacy)) == 0
+
+
+def _migrate(path, legacy, barrier):
+    barrier.wait(); HistoryStore(path, legacy_path=legacy)
+
+
+def test_history_migration_race_between_processes(tmp_path):
+    import multiprocessing
+    legacy = tmp_path / "menu_history.json"; path = str(tmp_path / "h.jsonl")
+    legacy.write_text(json.dumps([{"i": i} for i in range(200)]), encoding="utf-8")
+    ctx = multiprocessing.get_context("fork"); barrier = ctx.Barrier(4)
+    procs = [ctx.Process(target=_migrate, args=(path, str(legacy), barrier)) for _ in range(4)]
+    for p in procs: p.start()
+    for p in procs: p.join()
+    assert [p.exitcode for p in procs] == [0] * 4
+    assert [x["i"] for x in HistoryStore(path)] == list(range(199, -1, -1))
+    assert sorted(f.name for f in tmp_path.iterdir()) == ["h.jsonl", "menu_history.json.bak"]
+
+
+def test_history_migration_lost_rename(tmp_path, monkeypatch):
+    # 没有 fcntl 的平台：读完旧文件后，另一个进程抢先迁移完并改了名
+    monkeypatch.setattr(history, "fcntl", None)
+    legacy = tmp_path / "menu_history.json"; legacy.write_text(json.dumps([{"i": 1}, {"i": 0}]), encoding="utf-8")
+    load = json.load
+
+    def racing_load(f):
+        items = load(f); legacy.rename(str(legacy) + ".bak"); return items
+    monkeypatch.setattr(history.json, "load", racing_load)
+    h = HistoryStore(str(tmp_path / "h.jsonl"), legacy_path=str(legacy))
+    assert [x["i"] for x in h] == [0, 1]
@@ -0,0 +1,51 @@
+# tests/test_telemetry.py
+# 按会话打开的埋点只作用于本线程的这次 rerun，不会把整个进程一起打开
+
+import threading
+
+import pytest
+
+import telemetry
+from telemetry import core
+
+
+@pytest.fixture(autouse=True)
+def _clean():
+    was = core._enabled
+    telemetry.enable(False); telemetry.reset()
+    yield
+    telemetry.enable(was); telemetry.reset()
+
+
+def test_disabled_by_default_records_nothing():
+    assert telemetry.begin_rerun() is None
+    with telemetry.span("x"): pass
+    telemetry.count("c")
+    assert telemetry.end_rerun() is None
+    assert telemetry.snapshot()["spans"] == {} and telemetry.snapshot()["counters"] == {}
+
+
+def test_scoped_rerun_only_affects_its_thread():
+    seen = {}
+
+    def other():
+        seen["enabled"] = telemetry.enabled()
+        with telemetry.span("other"): pass
+
+    telemetry.begin_rerun(scoped=True)
+    with telemetry.span("mine"): pass
+    telemetry.count("c", 2)
+    t = threading.Thread(target=other); t.start(); t.join()
+    run = telemetry.end_rerun()
+    assert seen["enabled"] is False
+    assert set(run["spans"]) == {"mine"} and run["counters"] == {"c": 2}
+    assert "other" not in telemetry.snapshot()["spans"]
+    assert not telemetry.enabled() and core._scoped == 0
+
+
+def test_interrupted_scoped_rerun_is_reset_by_next_rerun():
+    telemetry.begin_rerun(scoped=True)   # 没有 end_rerun (如 st.stop / 重跑打断)
+    telemetry.begin_rerun()
+    assert not telemetry.enabled() and core._scoped == 0
+    with telemetry.span("x"): pass
+    assert telemetry.snapshot()["spans"] == {}
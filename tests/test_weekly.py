@@ -0,0 +1,46 @@
+# tests/test_weekly.py
+# 周计划的硬约束：过敏原、同日不重复、N 天不重复；菜池太小时应逐级放宽而不是留空
+
+import random
+
+import pytest
+
+from planner.engine import build_index
+from planner.rules import MENU_SLOTS
+from planner.weekly import WeeklyPlanner
+from recipe_data import RECIPES_DB
+
+PROFILE = {"fridge_items": ["鸡蛋", "土豆"], "allergens": [], "likes": [], "dislikes": []}
+
+
+def _names(plan, slots):
+    return [[m[s]['name'] for s in slots if m[s]] for m in plan['days']]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_constraints_hold(seed):
+    profile = dict(PROFILE, allergens=["鸡蛋"])
+    planner = WeeklyPlanner(RECIPES_DB, profile, rng=random.Random(seed))
+    plan = planner.plan_week()
+    index = planner.index
+    unsafe = index.allergen_mask(["鸡蛋"])
+    for day in plan['days']:
+        names = [day[s]['name'] for s in MENU_SLOTS if day[s]]
+        assert len(names) == len(set(names))
+        for s in MENU_SLOTS:
+            assert day[s] is not None
+            assert not unsafe >> index.dishes.index(day[s]) & 1
+    days = _names(plan, MENU_SLOTS)
+    for d in range(len(days)):
+        for dd in range(d + 1, min(d + planner.no_repeat_days, len(days))):
+            assert not set(days[d]) & set(days[dd])
+
+
+def test_small_pool_relaxes_instead_of_leaving_gaps():
+    # 只有 4 道汤、每天要 2 道：3 天不重复做不到，应退到"同一天不重复"，而不是留空
+    db = dict(RECIPES_DB, soup=RECIPES_DB['soup'][:4])
+    planner = WeeklyPlanner(db, PROFILE, index=build_index(db), rng=random.Random(0))
+    plan = planner.plan_week()
+    for lunch, dinner in _names(plan, ["lunch_soup", "dinner_soup"]):
+        assert lunch != dinner
+    assert all(m['lunch_soup'] and m['dinner_soup'] for m in plan['days'])